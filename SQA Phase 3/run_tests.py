@@ -0,0 +1,187 @@
+"""
+run_tests.py  —  In-process golden-output test runner
+==================================================
+Python replacement for run_tests.sh + validate_terminals.sh +
+validate_transactions.sh. Every case in inputs/ is run through
+bankingapp.BankingApp inside a pool of worker processes (one interpreter
+per worker, not per case). The terminal output and the .atf records are
+captured in memory and compared with expected/<case>.eout and
+expected/<case>.etf.
+
+Command-line usage:
+
+    python run_tests.py [--cases DIR] [--app DIR] [--accounts FILE] [--workers N]
+                        [--repeat N] [--quiet]
+
+    --cases   folder holding inputs/ and expected/   (default: this folder)
+    --app     folder holding bankingapp.py            (default: this folder)
+              of any phase, e.g. "../SQA Phase 6"
+    --accounts accounts file                          (default: <app>/currentaccounts.txt)
+    --workers worker processes                        (default: CPU count)
+    --repeat  run every case N times (load testing)   (default: 1)
+    --quiet   only list failing cases
+
+Exit status is 0 when every case passes, 1 otherwise.
+"""
+
+import argparse
+import difflib
+import inspect
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# set in every worker by _init_worker()
+_app_class = None
+_accounts_file = None
+
+
+def _init_worker(app_dir: str, accounts_file: str, scratch_dir: str) -> None:
+    """Import the app under test once per worker process."""
+    global _app_class, _accounts_file
+    sys.path.insert(0, app_dir)
+    import bankingapp
+
+    # Phase 3 takes (accounts_file, trans_file); later phases take
+    # (accounts_file, source=None, history_dir=None, ...) and create the
+    # history directory, so they get a scratch one that nothing is written to.
+    parameters = inspect.signature(bankingapp.BankingApp.__init__).parameters
+    if "trans_file" in parameters:
+        app_args = {"trans_file": os.devnull}
+    else:
+        app_args = {"history_dir": scratch_dir}
+
+    class CapturingApp(bankingapp.BankingApp):
+        """BankingApp that keeps the .atf records in memory and logs no history."""
+
+        def __init__(self, accounts_file: str) -> None:
+            super().__init__(accounts_file, **app_args)
+            self.atf: list[str] = []
+
+        def write_trans(self, transaction) -> None:
+            self.atf.append(transaction.format() + "\n")
+
+        def log_history(self, line: str) -> None:
+            pass
+
+    _app_class = CapturingApp
+    _accounts_file = accounts_file
+
+
+def _run_case(case: tuple[str, str]) -> tuple[str, str, str, float]:
+    """Run one case. Returns (name, terminal output, atf output, seconds)."""
+    name, keystrokes = case
+    stdin, stdout = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = io.StringIO(keystrokes), io.StringIO()
+    start = time.perf_counter()
+    try:
+        app = _app_class(_accounts_file)
+        app.run()
+        atf = "".join(app.atf)
+    except Exception as e:
+        atf = f"<crashed: {e!r}>\n"
+    finally:
+        elapsed = time.perf_counter() - start
+        terminal = sys.stdout.getvalue()
+        sys.stdin, sys.stdout = stdin, stdout
+    return name, terminal, atf, elapsed
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _diff(expected: str, actual: str, label: str) -> list[str]:
+    return list(difflib.unified_diff(
+        expected.splitlines(keepends=True), actual.splitlines(keepends=True),
+        fromfile=f"expected/{label}", tofile=f"actual/{label}",
+    ))
+
+
+def load_cases(cases_dir: str) -> list[tuple[str, str, str | None, str | None]]:
+    """Return (name, keystrokes, expected terminal, expected atf) per case."""
+    inputs_dir = os.path.join(cases_dir, "inputs")
+    expected_dir = os.path.join(cases_dir, "expected")
+    cases = []
+    for name in sorted(os.listdir(inputs_dir)):
+        keystrokes = _read(os.path.join(inputs_dir, name))
+        cases.append((
+            name,
+            keystrokes,
+            _read(os.path.join(expected_dir, name + ".eout")),
+            _read(os.path.join(expected_dir, name + ".etf")),
+        ))
+    return cases
+
+
+def check(name: str, terminal: str, atf: str,
+          expected_terminal: str | None, expected_atf: str | None) -> list[str]:
+    """Return the diff lines for one case (empty when it passes)."""
+    problems: list[str] = []
+    if expected_terminal is None:
+        problems.append(f"missing expected/{name}.eout\n")
+    else:
+        problems += _diff(expected_terminal, terminal, name + ".eout")
+
+    if expected_atf is not None:
+        problems += _diff(expected_atf, atf, name + ".etf")
+    elif atf:
+        problems.append(f"unexpected transactions (no expected/{name}.etf):\n")
+        problems += ["+" + line for line in atf.splitlines(keepends=True)]
+    return problems
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Run golden-output ATM test cases in-process.")
+    parser.add_argument("--cases", default=HERE)
+    parser.add_argument("--app", default=HERE)
+    parser.add_argument("--accounts", default=None,
+                        help="accounts file (default: <app>/currentaccounts.txt)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--quiet", action="store_true")
+    options = parser.parse_args(argv[1:])
+
+    app_dir = os.path.abspath(options.app)
+    accounts_file = os.path.abspath(options.accounts or os.path.join(app_dir, "currentaccounts.txt"))
+    cases = load_cases(options.cases) * options.repeat
+    expected = {name: (eout, etf) for name, _, eout, etf in cases}
+
+    start = time.perf_counter()
+    jobs = [(name, keystrokes) for name, keystrokes, _, _ in cases]
+    chunksize = max(1, len(jobs) // (options.workers * 8))
+    with tempfile.TemporaryDirectory(prefix="run_tests-") as scratch_dir, \
+            multiprocessing.Pool(options.workers, _init_worker, (app_dir, accounts_file, scratch_dir)) as pool:
+        results = pool.map(_run_case, jobs, chunksize)
+    wall = time.perf_counter() - start
+
+    failed = 0
+    busy = 0.0
+    for name, terminal, atf, elapsed in results:
+        busy += elapsed
+        problems = check(name, terminal, atf, *expected[name])
+        if problems:
+            failed += 1
+            print(f"FAIL  {name:<40} {elapsed * 1000:8.2f} ms")
+            sys.stdout.writelines("      " + line if line.endswith("\n") else "      " + line + "\n"
+                                  for line in problems)
+        elif not options.quiet:
+            print(f"PASS  {name:<40} {elapsed * 1000:8.2f} ms")
+
+    print()
+    print(f"{len(results) - failed} passed, {failed} failed, {len(results)} cases "
+          f"in {wall:.2f}s wall ({busy:.2f}s in cases, {options.workers} workers)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
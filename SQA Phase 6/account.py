@@ -13,16 +13,29 @@ UML Methods:
     + validate_pin()
     + get_balance()
     + update_balance()
+
+Accounts use __slots__ (no per-instance __dict__). PINs are interned:
+there are only 10,000 of them, so a large accounts file shares them.
+Account numbers are unique per account and are shared by reference with
+the transactions that name them, so they are not interned here.
+
+refresh() replaces the name, PIN and balance in place, so a reloaded
+accounts file updates the objects already handed out instead of
+replacing them.
 """
 
+import sys
+
 
 class Account:
     """A single bank account with number, PIN and balance."""
 
+    __slots__ = ("_account_number", "_name", "_pin", "_balance")
+
     def __init__(self, account_number: str, name: str, pin: str, balance: float) -> None:
         self._account_number: str   = account_number
         self._name:           str   = name
-        self._pin:            str   = pin
+        self._pin:            str   = sys.intern(pin)
         self._balance:        float = float(balance)
 
     # ------------------------------------------------------------------ #
@@ -52,3 +65,9 @@ class Account:
     def update_balance(self, delta: float) -> None:
         """Add delta to the balance (positive = deposit, negative = withdraw)."""
         self._balance += float(delta)
+
+    def refresh(self, name: str, pin: str, balance: float) -> None:
+        """Take over the name, PIN and balance of a newer record of this account."""
+        self._name    = name
+        self._pin     = sys.intern(pin)
+        self._balance = float(balance)
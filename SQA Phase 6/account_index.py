@@ -0,0 +1,203 @@
+"""
+Account Index
+-------------
+Looks up single records in a fixed-width accounts file without loading
+the whole file.
+
+Every record is exactly 45 characters plus a newline, so record N starts
+at byte N * 46 (57 and 58 for the wider v2 format, see read.py; the
+format is detected from the first record). The index memory-maps the file and binary searches it by
+account number. A file that is known to be sorted by account number is
+searched directly; otherwise a small sorted sidecar (<accounts_file>.idx)
+mapping account numbers to record positions is searched instead. The
+sidecar is (re)built by the first index opened after the accounts file
+changes, so every later open is constant time.
+
+Recently used records are kept in a bounded LRU cache. Name lookups
+(transfer targets) use a map of upper-cased names to account numbers
+that is built by one scan on the first lookup, so later ones cost a dict
+lookup instead of a scan.
+
+Run with:
+    python account_index.py <accounts_file>     (writes the sidecar index)
+"""
+
+import mmap
+import os
+import sys
+from collections import OrderedDict
+
+from read import PARSERS, RECORD_LENGTH, RECORD_LENGTHS, line_format
+
+RECORD_WIDTH = RECORD_LENGTH + 1          # record plus newline
+KEY_WIDTH = 5                             # zero-padded account number
+INDEX_ENTRY_WIDTH = KEY_WIDTH + 1 + 9 + 1  # "NNNNN RRRRRRRRR\n"
+KEY_WIDTHS = {1: KEY_WIDTH, 2: 10}
+
+
+def _map_file(file):
+    """Return a read-only mmap of *file*, or None when it is empty."""
+    if os.fstat(file.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _entry_count(data, width):
+    """Number of fixed-width entries, allowing a missing final newline."""
+    if data is None:
+        return 0
+    return (len(data) + 1) // width
+
+
+def _file_format(file):
+    """Record format of an open accounts file, from its first line."""
+    first = file.readline().decode(errors="replace")
+    file.seek(0)
+    return line_format(first)
+
+
+def _search(data, count, width, key, key_width=KEY_WIDTH):
+    """Binary search fixed-width entries whose first key_width bytes are sorted."""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = mid * width
+        probe = data[start:start + key_width]
+        if probe < key:
+            lo = mid + 1
+        elif probe > key:
+            hi = mid
+        else:
+            return mid
+    return None
+
+
+def build_index(file_path):
+    """
+    Writes the sorted sidecar index for an (unsorted) accounts file and
+    returns its path.
+    """
+    entries = []
+    with open(file_path, 'rb') as file:
+        key_width = KEY_WIDTHS[_file_format(file)]
+        for record_num, line in enumerate(file):
+            entries.append((line[:key_width], record_num))
+    entries.sort()
+
+    index_path = file_path + ".idx"
+    # several ATMs may race to rebuild the sidecar; each writes its own
+    # temp file and the last rename wins with identical content.
+    temp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as index:
+        index.write(b"".join(b"%s %09d\n" % (key, record_num) for key, record_num in entries))
+    os.replace(temp_path, index_path)
+    return index_path
+
+
+class AccountIndex:
+    """
+    Random access to the records of one accounts file.
+
+    lookup() returns the same account dict read_bank_accounts() would
+    produce for that record, or None when the account does not exist or
+    its record is invalid.
+    """
+
+    def __init__(self, file_path, cache_size=128, is_sorted=False):
+        self.file_path = file_path
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._names = None                # upper-cased name -> account number, on first use
+
+        self._file = open(file_path, 'rb')
+        version = _file_format(self._file)
+        self._record_length = RECORD_LENGTHS[version]
+        self._record_width = self._record_length + 1
+        self._key_width = KEY_WIDTHS[version]
+        self._parse = PARSERS[version]
+        self._data = _map_file(self._file)
+        self._count = _entry_count(self._data, self._record_width)
+
+        self._index_file = None
+        self._index = None
+        if not is_sorted:
+            index_path = file_path + ".idx"
+            try:
+                fresh = os.stat(index_path).st_mtime_ns >= os.fstat(self._file.fileno()).st_mtime_ns
+            except FileNotFoundError:
+                fresh = False
+            if not fresh:
+                build_index(file_path)
+            self._index_file = open(index_path, 'rb')
+            self._index = _map_file(self._index_file)
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for handle in (self._data, self._file, self._index, self._index_file):
+            if handle is not None:
+                handle.close()
+
+    def _record_number(self, key):
+        if self._index_file is not None:
+            entry_width = self._key_width + 1 + 9 + 1
+            pos = _search(self._index, _entry_count(self._index, entry_width), entry_width, key, self._key_width)
+            if pos is None:
+                return None
+            start = pos * entry_width + self._key_width + 1
+            return int(self._index[start:start + 9])
+        return _search(self._data, self._count, self._record_width, key, self._key_width)
+
+    def _read_record(self, record_num):
+        start = record_num * self._record_width
+        line = self._data[start:start + self._record_length].decode()
+        account, _ = self._parse(line, record_num + 1)
+        return account
+
+    def lookup(self, account_number):
+        """Return a fresh copy of the account record, or None."""
+        account_number = account_number.lstrip('0') or '0'
+        if account_number in self._cache:
+            self._cache.move_to_end(account_number)
+            return dict(self._cache[account_number])
+
+        if len(account_number) > self._key_width or not account_number.isdigit():
+            return None
+        record_num = self._record_number(account_number.zfill(self._key_width).encode())
+        if record_num is None:
+            return None
+        account = self._read_record(record_num)
+        if account is None:
+            return None
+
+        self._cache[account_number] = account
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return dict(account)
+
+    def find_by_name(self, name):
+        """Number of the last account whose upper-cased name equals *name*, or None."""
+        if self._names is None:
+            self._names = {acc["name"].upper(): acc["account_number"] for acc in self.iter_accounts()}
+        return self._names.get(name)
+
+    def iter_accounts(self):
+        """Yield every valid record in file order (a full scan)."""
+        for record_num in range(self._count):
+            account = self._read_record(record_num)
+            if account is not None:
+                yield account
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python account_index.py <accounts_file>")
+        sys.exit(1)
+    print(build_index(sys.argv[1]))
@@ -0,0 +1,253 @@
+"""
+Account Service
+---------------
+A local daemon that loads the accounts file once and answers account
+queries for any number of ATM processes over a Unix socket, so an ATM
+no longer parses the whole file to log one customer in.
+
+Protocol: one request line, one reply line (UTF-8):
+
+    L <account>          -> the account record, or "-"
+    N <name>             -> number of the last account with that name, or "-"
+    V <account> <pin>    -> "1" when the PIN matches, else "0"
+    B <account>          -> balance as "NNNNN.NN" (more digits for v2), or "-"
+    I                    -> every record, one per line, then "."
+
+Records are sent in the format of the accounts file (45 characters for
+v1, 57 for v2; see read.py), and the client tells them apart by length.
+
+Connections are served on their own threads, but L/N/V/B requests are
+handed to a single dispatcher thread. It takes every request waiting at
+that moment as one batch, answers each distinct query once, and wakes
+the waiting connections. Before each batch the accounts file is checked
+(one stat) and reloaded when it has changed, e.g. after the backend ran.
+
+AccountServiceClient has the same lookup() / iter_accounts() methods as
+AccountIndex, plus find_by_name(), so BankingApp can use it as its
+account source.
+
+Run with:
+    python account_service.py <accounts_file> [socket_path]
+    (default socket: <accounts_file>.sock)
+"""
+
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+
+from read import PARSERS, line_format, read_bank_accounts, record_format
+from write import FORMATTERS
+
+BATCH_LIMIT = 512
+
+
+class _Request:
+    __slots__ = ("query", "reply", "done")
+
+    def __init__(self, query):
+        self.query = query
+        self.reply = None
+        self.done = threading.Event()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        for raw in self.rfile:
+            query = raw.decode("utf-8").rstrip("\n")
+            if query == "I":
+                for line in service.records():
+                    self.wfile.write(line.encode("utf-8"))
+                self.wfile.write(b".\n")
+            else:
+                self.wfile.write(service.submit(query).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class AccountService:
+    """Serves one accounts file on a Unix socket."""
+
+    def __init__(self, accounts_file, socket_path=None):
+        self.accounts_file = accounts_file
+        self.socket_path = socket_path or accounts_file + ".sock"
+        self.batches = 0
+        self.requests = 0
+        self._pending = queue.Queue()
+        self._stamp = None
+        self._reload()
+        self._server = None
+
+    def _reload(self):
+        """(Re)loads the accounts file when it changed since the last load."""
+        info = os.stat(self.accounts_file)
+        stamp = (info.st_mtime_ns, info.st_size, info.st_ino)
+        if stamp == self._stamp:
+            return
+        format_record = FORMATTERS[record_format(self.accounts_file)]
+        by_number, by_name = {}, {}
+        for acc in read_bank_accounts(self.accounts_file):
+            by_number.setdefault(acc["account_number"], (format_record(acc), acc))
+            by_name[acc["name"].upper()] = acc["account_number"]
+        self._by_number, self._by_name, self._stamp = by_number, by_name, stamp
+
+    def records(self):
+        return [line for line, _ in self._by_number.values()]
+
+    def submit(self, query):
+        """Queues one query for the dispatcher and waits for its reply."""
+        request = _Request(query)
+        self._pending.put(request)
+        request.done.wait()
+        return request.reply
+
+    def _answer(self, query):
+        code, _, argument = query.partition(" ")
+        if code == "N":
+            return self._by_name.get(argument, "-")
+        if code == "V":
+            number, _, pin = argument.partition(" ")
+            entry = self._by_number.get(number.lstrip('0') or '0')
+            return "1" if entry is not None and entry[1]["pin"] == pin else "0"
+        entry = self._by_number.get(argument.lstrip('0') or '0')
+        if code == "L":
+            return "-" if entry is None else entry[0].rstrip("\n")
+        if code == "B":
+            return "-" if entry is None else f"{entry[1]['balance']:08.2f}"
+        return "?"
+
+    def dispatch_pending(self, block=True):
+        """Answers every waiting request as one batch. Returns the batch size."""
+        try:
+            batch = [self._pending.get(block)]
+        except queue.Empty:
+            return 0
+        while len(batch) < BATCH_LIMIT:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        batch = [request for request in batch if request is not None]   # None: shutdown
+        if not batch:
+            return 0
+
+        try:
+            self._reload()
+        except OSError:
+            pass                                # keep serving the last good copy
+        answers = {}
+        for request in batch:
+            if request.query not in answers:
+                answers[request.query] = self._answer(request.query)
+            request.reply = answers[request.query]
+            request.done.set()
+        self.batches += 1
+        self.requests += len(batch)
+        return len(batch)
+
+    def _dispatch_forever(self):
+        while self._server is not None:
+            self.dispatch_pending()
+
+    def start(self):
+        """Starts serving on background threads."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)         # left behind by a previous run
+        self._server = _Server(self.socket_path, _Handler)
+        self._server.service = self
+        threading.Thread(target=self._dispatch_forever, name="account-dispatcher", daemon=True).start()
+        threading.Thread(target=self._server.serve_forever, name="account-service", daemon=True).start()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self._pending.put(None)
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+
+class AccountServiceClient:
+    """Connection to an AccountService; usable as a BankingApp source."""
+
+    def __init__(self, socket_path):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.connect(socket_path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile("rwb")
+
+    def _ask(self, query):
+        self._file.write(query.encode("utf-8") + b"\n")
+        self._file.flush()
+        return self._file.readline().decode("utf-8").rstrip("\n")
+
+    def lookup(self, account_number):
+        """Return the account record as a dict, or None."""
+        line = self._ask(f"L {account_number}")
+        if line == "-":
+            return None
+        account, _ = PARSERS[line_format(line)](line, 0)
+        return account
+
+    def find_by_name(self, name):
+        """Number of the last account whose upper-cased name equals *name*, or None."""
+        number = self._ask(f"N {name}")
+        return None if number == "-" else number
+
+    def validate(self, account_number, pin):
+        return self._ask(f"V {account_number} {pin}") == "1"
+
+    def balance(self, account_number):
+        reply = self._ask(f"B {account_number}")
+        return None if reply == "-" else float(reply)
+
+    def iter_accounts(self):
+        self._file.write(b"I\n")
+        self._file.flush()
+        lines = []
+        for raw in self._file:
+            line = raw.decode("utf-8").rstrip("\n")
+            if line == ".":
+                break
+            lines.append(line)
+        for line_num, line in enumerate(lines, 1):
+            account, _ = PARSERS[line_format(line)](line, line_num)
+            if account is not None:
+                yield account
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python account_service.py <accounts_file> [socket_path]")
+        sys.exit(1)
+    service = AccountService(sys.argv[1], sys.argv[2] if len(sys.argv) == 3 else None)
+    service.start()
+    print(f"Serving {len(service.records())} accounts on {service.socket_path}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
@@ -0,0 +1,119 @@
+"""
+Segmented Append Log
+--------------------
+One shared transaction log for all ATM sessions, in place of a small
+session_N.txt file per session.
+
+    Transactions/segments/
+        manifest.json           {"version": 1, "segments": ["segment_000001.log", ...]}
+        segment_000001.log      full segments, in order
+        segment_000002.log      the last one listed is being appended to
+        .lock
+
+Any number of BankingApp processes may append at once. Every append is a
+single write() of whole records to a file opened with O_APPEND, made
+while holding an exclusive flock on .lock. The lock also covers segment
+rotation: once the active segment would grow past max_segment_bytes, a
+new segment is started and the manifest is replaced atomically. Where
+fcntl is not available (Windows) appends are made without the lock and
+rely on O_APPEND alone.
+
+The backend accepts a segment directory as its transaction file and
+reads the segments in manifest order.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:                       # Windows: O_APPEND only
+    fcntl = None
+
+MANIFEST = "manifest.json"
+MAX_SEGMENT_BYTES = 64 << 20
+
+
+def segment_paths(directory):
+    """Paths of the segments of the log in *directory*, oldest first."""
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r') as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in manifest["segments"]]
+
+
+def transaction_files(path):
+    """The files holding a day's records: *path* itself, or its segments when it is a log directory."""
+    return segment_paths(path) if os.path.isdir(path) else [path]
+
+
+class SegmentedLog:
+    """Shared, size-rotated append log in one directory."""
+
+    def __init__(self, directory, max_segment_bytes=MAX_SEGMENT_BYTES):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def segments(self):
+        return segment_paths(self.directory)
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(os.path.join(self.directory, ".lock"), os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)                  # releases the lock
+
+    def _write_manifest(self, names):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".manifest-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump({"version": 1, "segments": names}, file)
+            os.replace(temp_path, os.path.join(self.directory, MANIFEST))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def append(self, text):
+        """Appends one or more complete records (a newline is added if missing)."""
+        data = text.encode("utf-8")
+        if not data.endswith(b"\n"):
+            data += b"\n"
+
+        with self._locked():
+            names = [os.path.basename(path) for path in self.segments()]
+            size = 0
+            if names:
+                try:
+                    size = os.path.getsize(os.path.join(self.directory, names[-1]))
+                except FileNotFoundError:
+                    pass
+            if not names or (size and size + len(data) > self.max_segment_bytes):
+                names.append(f"segment_{len(names) + 1:06d}.log")
+                open(os.path.join(self.directory, names[-1]), 'ab').close()
+                self._write_manifest(names)
+
+            fd = os.open(os.path.join(self.directory, names[-1]), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+
+    def read_lines(self):
+        """Yields every line of every segment, in order, without newlines."""
+        for path in self.segments():
+            with open(path, 'r', encoding="utf-8") as file:
+                for line in file:
+                    yield line.rstrip("\n")
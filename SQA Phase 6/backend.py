@@ -10,36 +10,125 @@ Input Files:
 Output Files:
     masteraccounts.txt
 
+Either accounts path may be a shard directory (see shards.py). When both
+are, only the shards holding accounts named by the day's transactions
+are read and rewritten.
+
+With --dry-run nothing is written: the day is applied to copy-on-write
+copies of the accounts it touches, and the changed balances are printed
+after the usual violation messages.
+
+The transaction file may also be a segmented append log directory (see
+append_log.py); its segments are read in order.
+
+With --snapshots DIR every saved master file is also recorded as the
+next day in a snapshots.SnapshotStore (a delta, or periodically a full
+base), so earlier days can be rebuilt. Snapshots and the shared table
+keep the record format of the master file; the store and shard
+directories hold v1 records only.
+
+With --shared-table the saved accounts are also republished as the
+shared memory table that ATMs attach to (see shared_table.py), pointed
+to by <current_accounts_file>.shm.
+
+With --store DB the accounts are kept in an sqlite_store.AccountStore
+instead of the accounts files: the changed balances and the applied
+records are saved in one database transaction. The accounts file
+arguments are then not used.
+
+With --parallel-load a large master accounts file is validated and
+parsed on one process per CPU (see parallel_read.py).
+
 Run with:
     python backend.py [dailytransout.atf] [currentaccounts.txt] [masteraccounts.txt]
+                      [--fees fee_table.txt] [--flag-violations] [--fsync]
+                      [--memprofile report.json] [--pipelined] [--dry-run]
+                      [--snapshots snapshot_dir] [--shared-table] [--store accounts.db]
+                      [--parallel-load]
 """
 
+import os
 import sys
-from read import read_bank_accounts
-from write import write_new_accounts
+import threading
+from read import read_bank_accounts, record_format
+from write import MAX_BALANCE, MAX_BALANCES, write_new_accounts
 from print_error import log_constraint_error
+from fees import compute_fees, load_fee_table
+from memprofile import NULL_PROFILER
+from append_log import transaction_files
+from pipeline import pipelined_records
+
+
+def parse_transaction(transaction):
+    """
+    Decodes one transaction record as written by the front end:
+
+        DEP <account> <amount>
+        WDR <account> <amount>
+        PAY <account> <amount>
+        TRN <account> <amount> <target_account>
+        END
+
+    Returns (code, account_number, amount, target_account) with leading
+    zeros stripped from account numbers, target_account None unless the
+    record is a transfer. Returns None for a blank or malformed record.
+    Codes and account numbers are interned: a day's records repeat them.
+    """
+    parts = transaction.split()
+    if not parts:
+        return None
+    code = sys.intern(parts[0])
+    if code == "END":
+        return (code, None, 0.0, None)
+
+    expected = 4 if code == "TRN" else 3
+    if len(parts) != expected:
+        return None
+    try:
+        amount = float(parts[2])
+    except ValueError:
+        return None
+    target = sys.intern(parts[3].lstrip('0')) if code == "TRN" else None
+    return (code, sys.intern(parts[1].lstrip('0')), amount, target)
 
 
 class AccountManager:
     """
     Handles all account related operations.
+
+    Every balance is rounded to cents after each change, the same way
+    ConstraintChecker works the day out, so a record the checker accepted
+    can never leave a balance it would have rejected.
     """
 
-    def __init__(self, accounts):
+    def __init__(self, accounts, index=None):
         self.accounts = accounts
+        self.index = index
+        # account number -> account dict; the first record wins on duplicates,
+        # matching the old front-to-back scan.
+        self._by_number = {}
+        for acc in accounts:
+            self._by_number.setdefault(acc["account_number"], acc)
 
     def find_account(self, account_number):
-        for acc in self.accounts:
-            print(f"{account_number}   {acc["account_number"]}")
-            if acc["account_number"] == account_number:
-                return acc
-        return None
+        acc = self._by_number.get(account_number)
+        if acc is None and self.index is not None:
+            acc = self._fetch(account_number)
+        return acc
+
+    def _fetch(self, account_number):
+        """Pull a record that is not loaded yet from the on-disk index."""
+        acc = self.index.lookup(account_number)
+        if acc is not None:
+            self.accounts.append(acc)
+            self._by_number[acc["account_number"]] = acc
+        return acc
 
     def deposit(self, account_number, amount):
         acc = self.find_account(account_number)
 
         if acc:
-            acc["balance"] += amount
+            acc["balance"] = round(acc["balance"] + amount, 2)
         else:
             log_constraint_error("Account not found", "DEPOSIT")
 
@@ -47,7 +136,7 @@ class AccountManager:
         acc = self.find_account(account_number)
 
         if acc:
-            acc["balance"] -= amount
+            acc["balance"] = round(acc["balance"] - amount, 2)
         else:
             log_constraint_error("Account not found", "WITHDRAW")
 
@@ -56,8 +145,8 @@ class AccountManager:
         acc2 = self.find_account(to_account)
 
         if acc1 and acc2:
-            acc1["balance"] -= amount
-            acc2["balance"] += amount
+            acc1["balance"] = round(acc1["balance"] - amount, 2)
+            acc2["balance"] = round(acc2["balance"] + amount, 2)
         else:
             log_constraint_error("Transfer account missing", "TRANSFER")
 
@@ -65,10 +154,102 @@ class AccountManager:
         acc = self.find_account(account_number)
 
         if acc:
-            acc["balance"] -= amount
+            acc["balance"] = round(acc["balance"] - amount, 2)
         else:
             log_constraint_error("Account not found", "PAYBILL")
 
+    def charge_fee(self, account_number, fee):
+        acc = self.find_account(account_number)
+
+        if acc:
+            acc["balance"] = round(acc["balance"] - fee, 2)
+        else:
+            log_constraint_error("Account not found", "FEE")
+
+
+class DryRunAccountManager(AccountManager):
+    """
+    AccountManager for what-if runs that never modifies the loaded
+    accounts. The first access to an account copies it into an overlay
+    and all changes land in the copy, so the extra memory grows with the
+    accounts a day touches rather than with all accounts loaded.
+    """
+
+    def __init__(self, accounts, index=None):
+        super().__init__(accounts, index)
+        self.overlay = {}
+
+    def find_account(self, account_number):
+        acc = self.overlay.get(account_number)
+        if acc is None:
+            original = super().find_account(account_number)
+            if original is None:
+                return None
+            acc = self.overlay[account_number] = dict(original)
+        return acc
+
+    def diff(self):
+        """Returns (account_number, old_balance, new_balance) per changed account, by number."""
+        changes = []
+        for account_number, acc in self.overlay.items():
+            old = self._by_number[account_number]["balance"]
+            new = round(acc["balance"], 2)
+            if new != round(old, 2):
+                changes.append((account_number, old, new))
+        changes.sort(key=lambda change: int(change[0]))
+        return changes
+
+
+class ConcurrentAccountManager(AccountManager):
+    """
+    AccountManager that may be shared between threads.
+
+    Every account hashes to one of a fixed number of striped locks. Single
+    account operations hold their stripe; a transfer takes both stripes in
+    ascending index order so two opposing transfers can never deadlock.
+    The plain AccountManager stays lock-free for single-threaded callers.
+    """
+
+    def __init__(self, accounts, stripes=64, index=None):
+        super().__init__(accounts, index)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._fetch_lock = threading.Lock()
+
+    def _stripe(self, account_number):
+        return hash(account_number) % len(self._locks)
+
+    def _fetch(self, account_number):
+        with self._fetch_lock:
+            acc = self._by_number.get(account_number)
+            if acc is None:
+                acc = super()._fetch(account_number)
+            return acc
+
+    def deposit(self, account_number, amount):
+        with self._locks[self._stripe(account_number)]:
+            super().deposit(account_number, amount)
+
+    def withdraw(self, account_number, amount):
+        with self._locks[self._stripe(account_number)]:
+            super().withdraw(account_number, amount)
+
+    def transfer(self, from_account, to_account, amount):
+        first, second = sorted((self._stripe(from_account), self._stripe(to_account)))
+        with self._locks[first]:
+            if first == second:
+                super().transfer(from_account, to_account, amount)
+            else:
+                with self._locks[second]:
+                    super().transfer(from_account, to_account, amount)
+
+    def pay_bill(self, account_number, amount):
+        with self._locks[self._stripe(account_number)]:
+            super().pay_bill(account_number, amount)
+
+    def charge_fee(self, account_number, fee):
+        with self._locks[self._stripe(account_number)]:
+            super().charge_fee(account_number, fee)
+
 
 class TransactionProcessor:
     """
@@ -79,61 +260,343 @@ class TransactionProcessor:
         self.account_manager = account_manager
 
     def read_transactions(self, file_path):
-        with open(file_path) as f:
-            return [line.strip() for line in f]
+        lines = []
+        for path in transaction_files(file_path):
+            with open(path) as f:
+                lines += [line.strip() for line in f]
+        return lines
+
+    def read_records(self, file_path):
+        """
+        Parses the transaction file up to the first END record.
+        Malformed records are reported and skipped.
+        """
+        records = []
+        for line_num, transaction in enumerate(self.read_transactions(file_path), 1):
+            record = parse_transaction(transaction)
+            if record is None:
+                if transaction:
+                    log_constraint_error(f"Malformed transaction on line {line_num}", "PARSE")
+                continue
+            if record[0] == "END":
+                break
+            records.append(record)
+        return records
 
     def execute_transaction(self, transaction):
-        parts = transaction.split()
-        code = parts[0]
+        record = parse_transaction(transaction)
+        if record is None:
+            log_constraint_error("Malformed transaction", "PARSE")
+            return True
+        return self.apply_record(record)
+
+    def apply_record(self, record):
+        code, account_number, amount, target = record
 
         if code == "DEP":  # deposit
-            self.account_manager.deposit(parts[1].lstrip('0'), float(parts[2]))
+            self.account_manager.deposit(account_number, amount)
         elif code == "WDR":  # withdraw
-            self.account_manager.withdraw(parts[1].lstrip('0'), float(parts[2]))
+            self.account_manager.withdraw(account_number, amount)
         elif code == "TRN":  # transfer
-            self.account_manager.transfer(parts[1].lstrip('0'), parts[2].lstrip('0'), float(parts[3]))
+            self.account_manager.transfer(account_number, target, amount)
         elif code == "PAY":  # paybill
-            self.account_manager.pay_bill(parts[1].lstrip('0'), float(parts[2]))
+            self.account_manager.pay_bill(account_number, amount)
         elif code == "END":  # end of session
             return False
         return True
 
 
+class ConstraintChecker:
+    """
+    Validates a day's records against the account balance constraints
+    before anything is applied or written.
+
+    One pass over the records tracks each touched account's running
+    balance. A record that would take a balance below zero or above
+    max_balance (MAX_BALANCE for v1 accounts files), or that names an unknown account, is a violation. In
+    reject mode violating records are dropped (and do not affect later
+    running balances); in flag mode they are kept and only reported.
+    The changes of one record apply on top of each other, so a transfer
+    to the same account leaves its balance as it was. A record with a
+    code other than DEP, WDR, PAY or TRN is a violation and changes no
+    balance, as apply_record() ignores it.
+
+    After check():
+        violations  : list of (record_number, record, reason)
+        running_min : {account_number: lowest balance reached, including
+                       the opening balance}
+        final       : {account_number: balance after the accepted records}
+    """
+
+    def __init__(self, accounts, reject=True, max_balance=MAX_BALANCE):
+        self.balances = {acc["account_number"]: acc["balance"] for acc in accounts}
+        self.reject = reject
+        self.max_balance = max_balance
+        self.violations = []
+        self.running_min = {}
+        self.final = {}
+
+    def _balance(self, account_number):
+        if account_number in self.final:
+            return self.final[account_number]
+        return self.balances.get(account_number)
+
+    def check(self, records):
+        """Returns the records that may be applied."""
+        accepted = []
+        final = self.final
+        running_min = self.running_min
+
+        for record_number, record in enumerate(records, 1):
+            code, account_number, amount, target = record
+
+            reason = None
+            if code == "TRN":
+                changes = ((account_number, -amount), (target, amount))
+            elif code == "DEP":
+                changes = ((account_number, amount),)
+            elif code in ("WDR", "PAY"):
+                changes = ((account_number, -amount),)
+            else:
+                changes = ()
+                reason = f"Unknown transaction code {code}"
+
+            updated = {}
+            for number, delta in changes:
+                balance = updated[number] if number in updated else self._balance(number)
+                if balance is None:
+                    reason = f"Account {number} not found"
+                    break
+                balance = round(balance + delta, 2)
+                if balance < 0:
+                    reason = f"Balance of account {number} would be negative ({balance:.2f})"
+                    break
+                if balance > self.max_balance:
+                    reason = f"Balance of account {number} would exceed ${self.max_balance:.2f} ({balance:.2f})"
+                    break
+                updated[number] = balance
+
+            if reason is not None:
+                self.violations.append((record_number, record, reason))
+                if self.reject:
+                    continue
+                updated = {}
+                for number, delta in changes:
+                    balance = updated[number] if number in updated else self._balance(number)
+                    if balance is not None:
+                        updated[number] = round(balance + delta, 2)
+
+            for number, balance in updated.items():
+                final[number] = balance
+                if balance < running_min.get(number, self.balances[number]):
+                    running_min[number] = balance
+                else:
+                    running_min.setdefault(number, self.balances[number])
+            accepted.append(record)
+
+        return accepted
+
+
 class BankingBackend:
     """
     Main backend controller.
     """
 
-    def __init__(self, trans_file, current_accounts_file, master_accounts_file):
+    def __init__(self, trans_file, current_accounts_file, master_accounts_file, fee_table=None,
+                 reject_violations=True, fsync=False, profiler=None, pipelined=False,
+                 dry_run=False, snapshots=None, shared_table=None, store=None, load_workers=None):
         self.trans_file = trans_file
         self.current_accounts_file = current_accounts_file
         self.master_accounts_file = master_accounts_file
+        self.fee_table = fee_table or {}                # fees are opt-in (--fees)
+        self.reject_violations = reject_violations
+        self.fsync = fsync
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.pipelined = pipelined
+        self.dry_run = dry_run
+        self.snapshots = snapshots
+        self.shared_table = shared_table
+        self.store = store
+        self.load_workers = load_workers
+        self.partial = False
         self.accounts = []
+        self.records = []
+        self._opening = {}
+        self.violations = []
+        self.changes = []
 
     def load_accounts(self):
-        self.accounts = read_bank_accounts(self.master_accounts_file)
+        if self.store is not None:
+            # reading every account from the store is cheaper than the extra
+            # pass over the day that referenced_accounts() would need
+            self.accounts = self.store.read_accounts()
+            self._opening = {acc["account_number"]: acc["balance"] for acc in self.accounts}
+            return
+        account_numbers = None
+        if os.path.isdir(self.master_accounts_file) and os.path.isdir(self.current_accounts_file):
+            account_numbers = self.referenced_accounts()
+        self.partial = account_numbers is not None
+        self.accounts = read_bank_accounts(self.master_accounts_file, account_numbers, self.load_workers)
+
+    def record_format(self):
+        """Record format (1 or 2) of the accounts being processed; the store keeps v1 records."""
+        return 1 if self.store is not None else record_format(self.master_accounts_file)
+
+    def referenced_accounts(self):
+        """Account numbers named by the day's records (up to END)."""
+        numbers = set()
+        for path in transaction_files(self.trans_file):
+            with open(path) as file:
+                for line in file:
+                    record = parse_transaction(line)
+                    if record is None:
+                        continue
+                    if record[0] == "END":
+                        return numbers
+                    numbers.add(record[1])
+                    if record[3] is not None:
+                        numbers.add(record[3])
+        return numbers
 
     def process_transactions(self):
-        manager = AccountManager(self.accounts)
+        manager = DryRunAccountManager(self.accounts) if self.dry_run else AccountManager(self.accounts)
         processor = TransactionProcessor(manager)
-        transactions = processor.read_transactions(self.trans_file)
-        for t in transactions:
-            if not processor.execute_transaction(t):
-                break
+        # pipelined: records are read and parsed on background threads
+        # while the constraint stage consumes them
+        with self.profiler.stage("read_transactions"):
+            if self.pipelined:
+                records = pipelined_records(self.trans_file, parse_transaction)
+            else:
+                records = processor.read_records(self.trans_file)
+
+        # constraint stage: drop (or flag) records that break the balance
+        # rules before anything is applied
+        with self.profiler.stage("check_constraints"):
+            checker = ConstraintChecker(self.accounts, reject=self.reject_violations,
+                                        max_balance=MAX_BALANCES[self.record_format()])
+            records = checker.check(records)
+        self.violations = checker.violations
+        if self.store is not None:
+            self.records = records
+        for record_number, record, reason in checker.violations:
+            log_constraint_error(f"Record {record_number} {'rejected' if self.reject_violations else 'flagged'}: {reason}",
+                                 record[0])
+
+        # fee stage: one grouped pass over the whole day, charged after the
+        # balance deltas of the records themselves. A fee never takes an
+        # account below zero; anything beyond the balance is waived.
+        fees = {}
+        if self.fee_table:
+            with self.profiler.stage("compute_fees"):
+                plans = {acc["account_number"]: acc["plan"] for acc in self.accounts}
+                fees = compute_fees(records, plans, self.fee_table)
+
+        with self.profiler.stage("apply_records"):
+            for record in records:
+                processor.apply_record(record)
+            for account_number, fee in fees.items():
+                balance = checker.final.get(account_number, 0)
+                fee = min(fee, max(balance, 0))
+                if fee:
+                    manager.charge_fee(account_number, fee)
+
+        if self.dry_run:
+            self.changes = manager.diff()
 
     def save_accounts(self):
-        write_new_accounts(self.accounts, self.current_accounts_file)
-        write_new_accounts(self.accounts, self.master_accounts_file)
+        if self.store is not None:
+            changed = [acc for acc in self.accounts
+                       if round(acc["balance"], 2) != round(self._opening[acc["account_number"]], 2)]
+            self.store.save_day(changed, self.records)
+        else:
+            write_new_accounts(self.accounts, self.current_accounts_file, self.fsync)
+            write_new_accounts(self.accounts, self.master_accounts_file, self.fsync)
+        version = self.record_format()
+        if self.snapshots is not None:
+            if self.partial and not self.snapshots.days():
+                # the first day is the base, which needs the untouched shards too
+                self.snapshots.record(read_bank_accounts(self.master_accounts_file), version=version)
+            else:
+                self.snapshots.record(self.accounts, complete=not self.partial, version=version)
+        if self.shared_table is not None:
+            from shared_table import publish
+            accounts = read_bank_accounts(self.current_accounts_file) if self.partial else self.accounts
+            publish(accounts, self.shared_table, version)
+
+    def dry_run_report(self):
+        """Lines describing the balances a dry run would change."""
+        lines = [f"DRY RUN: {len(self.changes)} account(s) would change, "
+                 f"{len(self.violations)} violation(s), nothing written"]
+        for account_number, old, new in self.changes:
+            lines.append(f"{account_number.zfill(5)} {old:9.2f} -> {new:9.2f} ({new - old:+.2f})")
+        return lines
 
     def run(self):
-        self.load_accounts()
+        """
+        Returns False without writing anything when violations were only
+        flagged, since the resulting balances cannot be written. A dry run
+        never writes; it returns False when the day has any violation.
+        """
+        with self.profiler.stage("load_accounts"):
+            self.load_accounts()
         self.process_transactions()
-        self.save_accounts()
+        if self.dry_run:
+            return not self.violations
+        if self.violations and not self.reject_violations:
+            log_constraint_error("Violations flagged, accounts files not written", "CONSTRAINT")
+            return False
+        with self.profiler.stage("save_accounts"):
+            self.save_accounts()
+        return True
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python backend.py <daily_transactions_file> <current_accounts_file> <master_accounts_file>")
+    args = sys.argv[1:]
+    flags = {"--flag-violations": False, "--fsync": False, "--pipelined": False, "--dry-run": False,
+             "--shared-table": False, "--parallel-load": False}
+    values = {"--fees": None, "--memprofile": None, "--snapshots": None, "--store": None}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg in flags:
+            flags[arg] = True
+        elif arg in values and args:
+            values[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+    if len(positional) != 3:
+        print("Usage: python backend.py <daily_transactions_file> <current_accounts_file> <master_accounts_file> "
+              "[--fees <fee_table_file>] [--flag-violations] [--fsync] [--memprofile <report.json>] "
+              "[--pipelined] [--dry-run] [--snapshots <snapshot_dir>] [--shared-table] "
+              "[--store <accounts.db>] [--parallel-load]")
         sys.exit(1)
-    backend = BankingBackend(sys.argv[1], sys.argv[2], sys.argv[3])
-    backend.run()
+
+    fee_table = load_fee_table(values["--fees"]) if values["--fees"] else None
+    profiler = None
+    if values["--memprofile"]:
+        from memprofile import MemoryProfiler
+        profiler = MemoryProfiler()
+    snapshots = None
+    if values["--snapshots"]:
+        from snapshots import SnapshotStore
+        snapshots = SnapshotStore(values["--snapshots"])
+    store = None
+    if values["--store"]:
+        from sqlite_store import AccountStore
+        store = AccountStore(values["--store"])
+    backend = BankingBackend(positional[0], positional[1], positional[2], fee_table,
+                             reject_violations=not flags["--flag-violations"],
+                             fsync=flags["--fsync"],
+                             profiler=profiler,
+                             pipelined=flags["--pipelined"],
+                             dry_run=flags["--dry-run"],
+                             snapshots=snapshots,
+                             shared_table=positional[1] + ".shm" if flags["--shared-table"] else None,
+                             store=store,
+                             load_workers=os.cpu_count() if flags["--parallel-load"] else None)
+    ok = backend.run()
+    if backend.dry_run:
+        print("\n".join(backend.dry_run_report()))
+    if profiler is not None:
+        profiler.write(values["--memprofile"])
+    sys.exit(0 if ok else 2)
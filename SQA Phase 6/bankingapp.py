@@ -9,15 +9,26 @@ stdin  → user keystrokes (or redirected test input file)
 stdout → terminal log (what the user sees on screen)
 <trans_file> → daily transaction file  (appended to, never overwritten)
                defaults to  daily_transactions.txt  if not given
+
+Startup is kept to the minimum needed to show the first prompt: only
+small local modules are imported, the accounts file is parsed on the
+first login, and the Transactions/ directory is scanned for the session
+file name only when the first record is written.
+
+A long-running ATM picks up a new accounts file between sessions: each
+login (and each replayed stream) first checks the file's mtime, size and
+inode, and only when they changed are the changed lines parsed and
+their accounts updated in place. A session in progress is never touched.
+Lines are told apart by a checksum per line (and the account number it
+holds), not by a copy of the file.
 """
 
 import sys
 import os
-from pathlib import Path
+from array import array
 
 from account import Account
 from transaction import Transaction
-from read import read_bank_accounts
 
 # Required for encoding some characters
 if sys.platform.startswith("win"):
@@ -41,55 +52,148 @@ def _box_row(txt: str, align: str = "left") -> str:
     else: padded = txt.ljust(_W)
     return "║" + padded + "║"
 
+# Everything the ATM shows goes through _screen, which hands it to stdout in
+# one write per prompt instead of one print() per line. The fixed parts of
+# the UI are rendered once and reused.
+
+class _Screen:
+    """Buffered terminal writer, flushed at every prompt and on exit."""
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+
+    def flush(self) -> None:
+        if self._parts:
+            sys.stdout.write("".join(self._parts))
+            self._parts.clear()
+        sys.stdout.flush()
+
+_screen = _Screen()
+
+def _print(line: str = "") -> None:
+    _screen.write(line + "\n")
+
+_BANNER = "\n".join([
+    _box_top(),
+    _box_row("  Banking App Terminal", "left"),
+    _box_row("  Phase 6", "left"),
+    _box_div(),
+    _box_row("  Welcome to the Banking System", "left"),
+    _box_bot(),
+]) + "\n"
+
+_MENU_BODY = "\n".join([
+    _box_div(),
+    _box_row("  Main Menu:", "left"),
+    _box_row("", "left"),
+    _box_row("    1.  View Balance", "left"),
+    _box_row("    2.  Deposit", "left"),
+    _box_row("    3.  Withdraw", "left"),
+    _box_row("    4.  Transfer", "left"),
+    _box_row("    5.  Logout", "left"),
+    _box_row("    6.  Exit", "left"),
+    _box_bot(),
+]) + "\n"
+
+_SECTION_END = "└" + "─" * _W + "┘\n"
+
+_BAR_MAX = 30
+_BARS = ["█" * filled + "░" * (_BAR_MAX - filled) for filled in range(_BAR_MAX + 1)]
+
+_menu_frames: dict[str, str] = {}   # account number → rendered menu box
+_section_frames: dict[str, str] = {}
+
 def _banner() -> None:
-    print(_box_top())
-    print(_box_row("  Banking App Terminal", "left"))
-    print(_box_row("  Phase 6", "left"))
-    print(_box_div())
-    print(_box_row("  Welcome to the Banking System", "left"))
-    print(_box_bot())
+    _screen.write(_BANNER)
 
 def _menu_box(account_number: str) -> None:
-    print(_box_top())
-    print(_box_row(f"  Account: {account_number}", "left"))
-    print(_box_div())
-    print(_box_row("  Main Menu:", "left"))
-    print(_box_row("", "left"))
-    print(_box_row("    1.  View Balance", "left"))
-    print(_box_row("    2.  Deposit", "left"))
-    print(_box_row("    3.  Withdraw", "left"))
-    print(_box_row("    4.  Transfer", "left"))
-    print(_box_row("    5.  Logout", "left"))
-    print(_box_row("    6.  Exit", "left"))
-    print(_box_bot())
+    frame = _menu_frames.get(account_number)
+    if frame is None:
+        if len(_menu_frames) >= 256:
+            _menu_frames.clear()
+        frame = _box_top() + "\n" + _box_row(f"  Account: {account_number}", "left") + "\n" + _MENU_BODY
+        _menu_frames[account_number] = frame
+    _screen.write(frame)
 
 def _section(title: str) -> None:
-    print("┌─ " + title + " " + "─" * max(0, _W - len(title) - 3) + "┐")
+    frame = _section_frames.get(title)
+    if frame is None:
+        frame = "┌─ " + title + " " + "─" * max(0, _W - len(title) - 3) + "┐\n"
+        _section_frames[title] = frame
+    _screen.write(frame)
 
 def _section_end() -> None:
-    print("└" + "─" * _W + "┘")
+    _screen.write(_SECTION_END)
 
-def _ok(msg: str)   -> None: print(f"  ✔  {msg}")
-def _err(msg: str)  -> None: print(f"  ✖  {msg}")
-def _info(msg: str) -> None: print(f"  ℹ  {msg}")
+def _ok(msg: str)   -> None: _screen.write(f"  ✔  {msg}\n")
+def _err(msg: str)  -> None: _screen.write(f"  ✖  {msg}\n")
+def _info(msg: str) -> None: _screen.write(f"  ℹ  {msg}\n")
 
 def _bal(amount: int) -> None:
-    bar_max  = 30
     fraction = min(amount / 5000, 1.0) if amount > 0 else 0
-    filled   = int(fraction * bar_max)
-    bar      = "█" * filled + "░" * (bar_max - filled)
-    print(f"  Balance  │{bar}│  ${amount:,}")
+    filled   = int(fraction * _BAR_MAX)
+    _screen.write(f"  Balance  │{_BARS[filled]}│  ${amount:,}\n")
 
 
 def _prompt(label: str) -> str:
     """Styled input prompt. Returns empty string on EOF (automated test runs)."""
     try:
-        print(f"  ▶  {label}: ")
+        _screen.write(f"  ▶  {label}: \n")
+        _screen.flush()
         return input().strip()
     except EOFError:
         return ""
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# Status codes  (compact per-step results reported by headless replay)
+# ══════════════════════════════════════════════════════════════════════════════
+
+STATUS_OK         = "OK"     # step succeeded
+STATUS_BAD_AMOUNT = "AMT"    # amount not a number or not positive
+STATUS_NO_FUNDS   = "NSF"    # amount exceeds the balance
+STATUS_NO_TARGET  = "TGT"    # transfer target name not found
+STATUS_BAD_LOGIN  = "CRED"   # invalid account number / PIN
+STATUS_BAD_OPTION = "OPT"    # menu number out of range
+STATUS_BAD_FORMAT = "FMT"    # menu input not a number
+
+
+def _account_fields(line: str) -> tuple[str, str, str, float] | None:
+    """(number, name, pin, balance) of an accounts file line, or None when malformed."""
+    parts = line.split()
+    if len(parts) != 7:
+        return None
+    try:
+        balance = float(parts[4])
+    except ValueError:
+        return None
+    return parts[0].lstrip('0'), f"{parts[1]} {parts[2]}", parts[5], balance
+
+
+def _block_checksums(data: bytes, block: int) -> tuple[array, array, array]:
+    """
+    A checksum of every *block* bytes of *data*, with the index and the
+    offset of the line holding the first byte of each block.
+    """
+    checksums, indexes, offsets = array("q"), array("q"), array("q")
+    index = 0
+    for start in range(0, len(data), block):
+        if start:
+            index += data.count(b"\n", start - block, start)
+        checksums.append(hash(data[start:start + block]))
+        indexes.append(index)
+        offsets.append(data.rfind(b"\n", 0, start) + 1)
+    return checksums, indexes, offsets
+
+
+def _file_stamp(info: os.stat_result) -> tuple[int, int, int]:
+    """Changes whenever the file is rewritten (mtime, size) or replaced (inode)."""
+    return info.st_mtime_ns, info.st_size, info.st_ino
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # BankingApp  
 # ══════════════════════════════════════════════════════════════════════════════
@@ -105,48 +209,212 @@ class BankingApp:
     - accounts      : dict[str, Account]   ← aggregates many Account objects
     - current_user  : Account | None
     - history_dir   : str                   ← directory where session histories are kept
-    - history_file  : str                   ← current run's history log file
+                                              (default: Transactions/ next to this file)
+    - history_file  : str | None            ← current run's history log file
+                                              (named on the first write)
+    - source        : AccountIndex | None   ← optional per-account lookup layer
+                      | AccountServiceClient  (index file or account daemon);
+                                              when set, accounts are fetched on
+                                              demand instead of loaded up front
+    - history_index : HistoryIndex | None   ← optional; updated after every
+                                              write to the history log
+    - append_log    : SegmentedLog | None   ← optional shared log; when set,
+                                              records go there instead of
+                                              a session_N.txt file
     """
 
+    RELOAD_BLOCK = 65536     # bytes per checksummed block of the accounts file
+
     # ── __init__ ──────────────────────────────────────────────────────── #
-    def __init__(self, accounts_file: str) -> None:
+    def __init__(self, accounts_file: str, source=None, history_dir: str | None = None,
+                 history_index=None, append_log=None) -> None:
         self.accounts_file: str                = accounts_file
         self.accounts:      dict[str, Account] = {}
         self.current_user:  Account | None     = None
+        self.source                            = source
+        self.history_index                     = history_index
+        self.append_log                        = append_log
 
         # prepare history logging
         # history files are stored inside a "Transactions" subfolder of
         # the application directory (phase 3 folder). we create the
         # directory if it doesn't exist and open a fresh log for each run.
-        self.history_dir: str = os.path.join(os.path.dirname(__file__), "Transactions")
+        if history_dir is None:
+            history_dir = os.path.join(os.path.dirname(__file__), "Transactions")
+        self.history_dir: str = history_dir
         os.makedirs(self.history_dir, exist_ok=True)
-        
-        base_dir = Path(__file__).parent
-        transactions_dir = base_dir / "Transactions"
-        file_count = sum(1 for f in transactions_dir.iterdir() if f.is_file())
-
-        self.history_file: str = os.path.join(self.history_dir, f"session_{file_count + 1}.txt")
-
-        # load the accounts after history is ready.
-        self.load_accounts()
+        self.history_file: str | None = None
+
+        # accounts are loaded on the first login (or looked up one at a
+        # time through the source); only fail fast on a missing file here.
+        self._loaded: bool = False
+        self._checksums: array = array("q")
+        self._numbers:   list[str | None] = []
+        self._blocks:    tuple[array, array, array] = (array("q"), array("q"), array("q"))
+        self._size:      int = 0
+        self._stamp:     tuple[int, int, int] | None = None
+        if self.source is None:
+            os.stat(self.accounts_file)
 
     # ── load_accounts ─────────────────────────────────────────────────── #
     def load_accounts(self) -> None:
         """Read <accounts_file> and populate self.accounts dict."""
-        with open(self.accounts_file, "r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) != 7:
-                    continue          # skip malformed lines silently
-                acc_num, name, pin, bal = parts[0].lstrip('0'), f"{parts[1]} {parts[2]}", parts[5], parts[4]
-                try:
-                    balance = float(bal)
-                except ValueError:
-                    continue
-                self.accounts[acc_num] = Account(acc_num, name, pin, balance)
+        with open(self.accounts_file, "rb") as f:
+            info = os.fstat(f.fileno())
+            data = f.read()
+        lines = data.decode("utf-8").split("\n")
+        numbers: list[str | None] = []
+        for line in lines:
+            fields = _account_fields(line)
+            if fields is not None:
+                self.accounts[fields[0]] = Account(*fields)
+            numbers.append(None if fields is None else fields[0])
+        # kept for reload_accounts(): a checksum of every line and the
+        # account it holds, of every block, and how to tell whether the
+        # file has been replaced or rewritten since
+        self._checksums = array("q", map(hash, lines))
+        self._numbers = numbers
+        self._blocks = _block_checksums(data, self.RELOAD_BLOCK)
+        self._size = len(data)
+        self._stamp = _file_stamp(info)
+        self._loaded = True
+
+    # ── reload_accounts ───────────────────────────────────────────────── #
+    def reload_accounts(self) -> int:
+        """
+        Bring the loaded accounts up to date with <accounts_file>.
+
+        Returns at once, after a single stat(), while the file's mtime,
+        size and inode are those of the loaded file. Otherwise only the
+        lines whose checksum is not one of the loaded file's are parsed:
+        their accounts are refreshed in place (or added), and accounts
+        whose line is gone are dropped. A file of the same size (balances
+        updated in place) is compared block by block, and only the lines
+        of differing blocks are checksummed. Accounts whose line did not
+        change keep their in-memory balance. Returns the number of
+        accounts changed.
+        """
+        if self.source is not None or not self._loaded:
+            return 0
+        try:
+            if _file_stamp(os.stat(self.accounts_file)) == self._stamp:
+                return 0
+            with open(self.accounts_file, "rb") as f:
+                info = os.fstat(f.fileno())
+                data = f.read()
+        except OSError:
+            return 0                  # keep serving the loaded accounts
+        old = self._checksums
+        same_lines = self._changed_lines(data) if len(data) == self._size else None
+        if same_lines is not None:    # the same lines, some rewritten in place
+            lines, self._blocks = same_lines
+            new = array("q", old)
+            for i, line in lines.items():
+                new[i] = hash(line)
+            positions = [i for i in lines if old[i] != new[i]]
+        else:
+            lines = data.decode("utf-8", errors="replace").split("\n")
+            new = array("q", map(hash, lines))
+            positions = [i for i in range(len(new)) if old[i] != new[i]] if len(old) == len(new) else None
+            self._blocks = _block_checksums(data, self.RELOAD_BLOCK)
+        self._size = len(data)
+        self._stamp = _file_stamp(info)
+        if not positions and positions is not None:
+            return 0                  # rewritten with the same content
+
+        if positions is not None:
+            old_positions = new_positions = positions
+            numbers = list(self._numbers)
+        else:
+            old_positions, new_positions = range(len(old)), range(len(new))
+            numbers = [None] * len(new)
+        old_numbers = {old[i]: self._numbers[i] for i in old_positions}
+        changed: set[str] = set()
+        for i in new_positions:
+            if new[i] in old_numbers:   # the same line as before, moved
+                numbers[i] = old_numbers[new[i]]
+                continue
+            fields = _account_fields(lines[i])
+            numbers[i] = None if fields is None else fields[0]
+            if fields is None:
+                continue
+            acc = self.accounts.get(fields[0])
+            if acc is None:
+                self.accounts[fields[0]] = Account(*fields)
+            else:
+                acc.refresh(*fields[1:])
+            changed.add(fields[0])
+        new_checksums = {new[i] for i in new_positions}
+        for i in old_positions:
+            number = self._numbers[i]
+            if number is not None and old[i] not in new_checksums and number not in changed:
+                if self.accounts.pop(number, None) is not None:
+                    changed.add(number)
+        self._checksums = new
+        self._numbers = numbers
+        return len(changed)
+
+    def _changed_lines(self, data: bytes) -> tuple[dict[int, str], tuple[array, array, array]] | None:
+        """
+        The lines (by index) of the blocks of *data*, a file of the loaded
+        size, that differ from the loaded file, and the block checksums of
+        *data*; None when its lines no longer start where they did.
+        """
+        old_checksums, indexes, old_offsets = self._blocks
+        checksums, offsets = array("q", old_checksums), array("q", old_offsets)
+        block = self.RELOAD_BLOCK
+        lines: dict[int, str] = {}
+        for number, start in enumerate(range(0, len(data), block)):
+            checksum = hash(data[start:start + block])
+            if checksum == old_checksums[number]:
+                continue
+            checksums[number] = checksum
+            first = old_offsets[number]
+            if first and data[first - 1] != 10:
+                return None
+            if number + 1 < len(checksums):
+                last = indexes[number + 1]      # the line running into the next block
+                end = data.find(b"\n", start + block)
+                end = len(data) if end < 0 else end
+                offsets[number + 1] = data.rfind(b"\n", 0, start + block) + 1
+            else:
+                last, end = len(self._checksums) - 1, len(data)
+            region = data[first:end].decode("utf-8", errors="replace").split("\n")
+            if len(region) != last - indexes[number] + 1:
+                return None
+            lines.update(zip(range(indexes[number], last + 1), region))
+        return lines, (checksums, indexes, offsets)
+
+    # ── find_account ──────────────────────────────────────────────────── #
+    def find_account(self, account_number: str) -> Account | None:
+        """Return the loaded Account, fetching it from the source if needed."""
+        if self.source is None and not self._loaded:
+            self.load_accounts()
+        acc = self.accounts.get(account_number)
+        if acc is None and self.source is not None:
+            rec = self.source.lookup(account_number)
+            if rec is not None:
+                acc = Account(rec["account_number"], rec["name"], rec["pin"], rec["balance"])
+                self.accounts[acc.account_number] = acc
+        return acc
+
+    # ── find_account_by_name ──────────────────────────────────────────── #
+    def find_account_by_name(self, name: str) -> str | None:
+        """Return the number of the (last) account whose name matches."""
+        if hasattr(self.source, "find_by_name"):
+            return self.source.find_by_name(name)
+        if self.source is not None:
+            records = ((rec["name"], rec["account_number"]) for rec in self.source.iter_accounts())
+        else:
+            if not self._loaded:
+                self.load_accounts()
+            records = ((acc.get_name(), acc.account_number) for acc in self.accounts.values())
+
+        target_account_number = None
+        for acc_name, acc_num in records:
+            if acc_name.upper() == name:
+                target_account_number = acc_num
+        return target_account_number
 
     # ── write_trans ───────────────────────────────────────────────────── #
     def write_trans(self, transaction: Transaction) -> None:
@@ -169,16 +437,77 @@ class BankingApp:
         ATM running even if disk issues occur.
         """
         try:
+            if self.append_log is not None:
+                self.append_log.append(str(line))
+                return
+            if self.history_file is None:
+                self.history_file = self._next_history_file()
             with open(self.history_file, "a", encoding="utf-8") as f:
                 f.write(str(line) + "\n")
+            if self.history_index is not None:
+                self.history_index.ingest_file(self.history_file)
         except Exception:
             pass
 
+    def _next_history_file(self) -> str:
+        """Name this session's log after the files already in history_dir."""
+        with os.scandir(self.history_dir) as entries:
+            file_count = sum(1 for entry in entries if entry.is_file())
+        return os.path.join(self.history_dir, f"session_{file_count + 1}.txt")
+
+    # ── authenticate / apply_* ────────────────────────────────────────── #
+    # Validation and balance updates shared by the interactive methods
+    # below and by replay(). The apply_* methods return a status code and
+    # the Transaction to record (None unless the status is STATUS_OK).
+
+    def authenticate(self, account_number: str, pin: str) -> Account | None:
+        """Return the matching Account, or None for invalid credentials."""
+        acc = self.find_account(account_number)
+        if acc is None or not acc.validate_credentials(account_number, pin):
+            return None
+        return acc
+
+    def _parse_amount(self, raw: str) -> float | None:
+        try:
+            amount = float(raw)
+        except ValueError:
+            return None
+        return amount if amount > 0 else None
+
+    def apply_deposit(self, raw: str) -> tuple[str, Transaction | None]:
+        amount = self._parse_amount(raw)
+        if amount is None:
+            return STATUS_BAD_AMOUNT, None
+        self.current_user.update_balance(amount)
+        return STATUS_OK, Transaction("DEP", self.current_user.account_number, amount)
+
+    def apply_withdraw(self, raw: str) -> tuple[str, Transaction | None]:
+        amount = self._parse_amount(raw)
+        if amount is None:
+            return STATUS_BAD_AMOUNT, None
+        if amount > self.current_user.get_balance():
+            return STATUS_NO_FUNDS, None
+        self.current_user.update_balance(-amount)
+        return STATUS_OK, Transaction("WDR", self.current_user.account_number, amount)
+
+    def apply_transfer(self, raw: str, target_user: str) -> tuple[str, Transaction | None]:
+        amount = self._parse_amount(raw)
+        if amount is None:
+            return STATUS_BAD_AMOUNT, None
+        if amount > self.current_user.get_balance():
+            return STATUS_NO_FUNDS, None
+        target_account_number = self.find_account_by_name(target_user)
+        if not target_account_number:
+            return STATUS_NO_TARGET, None
+        self.current_user.update_balance(-amount)
+        return STATUS_OK, Transaction("TRN", self.current_user.account_number, amount,
+                                      account_target = target_account_number)
+
     # ── login ─────────────────────────────────────────────────────────── #
     def login(self) -> bool:
         """Prompt for credentials. Returns True on success, False on failure."""
         _banner()
-        print()
+        _print()
         _section("Login")
         account_number = _prompt("Account number")
         if not account_number:
@@ -187,14 +516,15 @@ class BankingApp:
         pin = _prompt("PIN          ")
         _section_end()
 
-        acc = self.accounts.get(account_number)
-        if acc is None or not acc.validate_credentials(account_number, pin):
+        self.reload_accounts()        # between sessions: pick up a new accounts file
+        acc = self.authenticate(account_number, pin)
+        if acc is None:
             _err("Invalid credentials")
             return False
 
         self.current_user = acc
         _ok("Login successful")
-        print()
+        _print()
         return True
 
     # ── logout ────────────────────────────────────────────────────────── #
@@ -202,7 +532,7 @@ class BankingApp:
         """End the current session."""
         self.current_user = None
         _ok("Logout successful")
-        print()
+        _print()
 
     # ── view_balance ──────────────────────────────────────────────────── #
     def view_balance(self) -> None:
@@ -212,7 +542,7 @@ class BankingApp:
         _section("Balance")
         _bal(int(self.current_user.get_balance()))
         _section_end()
-        print()
+        _print()
 
     # ── deposit ───────────────────────────────────────────────────────── #
     def deposit(self) -> None:
@@ -226,23 +556,16 @@ class BankingApp:
         raw = _prompt("Amount ($)  ")
         _section_end()
 
-        try:
-            amount = float(raw)
-        except ValueError:
-            _err("Invalid deposit amount")
-            print()
-            return
-
-        if amount <= 0:
+        status, transaction = self.apply_deposit(raw)
+        if status != STATUS_OK:
             _err("Invalid deposit amount")
-            print()
+            _print()
             return
 
-        self.current_user.update_balance(amount)
-        self.write_trans(Transaction("DEP", self.current_user.account_number, amount))
-        _ok(f"Deposit successful  (+${amount:,.2f})")
+        self.write_trans(transaction)
+        _ok(f"Deposit successful  (+${transaction.amount:,.2f})")
         _bal(int(self.current_user.get_balance()))
-        print()
+        _print()
 
     # ── withdraw ──────────────────────────────────────────────────────── #
     def withdraw(self) -> None:
@@ -256,28 +579,21 @@ class BankingApp:
         raw = _prompt("Amount ($)  ")
         _section_end()
 
-        try:
-            amount = float(raw)
-        except ValueError:
+        status, transaction = self.apply_withdraw(raw)
+        if status == STATUS_BAD_AMOUNT:
             _err("Invalid withdrawal amount")
-            print()
+            _print()
             return
 
-        if amount <= 0:
-            _err("Invalid withdrawal amount")
-            print()
-            return
-
-        if amount > self.current_user.get_balance():
+        if status == STATUS_NO_FUNDS:
             _err("Insufficient funds")
-            print()
+            _print()
             return
 
-        self.current_user.update_balance(-amount)
-        self.write_trans(Transaction("WDR", self.current_user.account_number, amount))
-        _ok(f"Withdrawal successful  (-${amount:,.2f})")
+        self.write_trans(transaction)
+        _ok(f"Withdrawal successful  (-${transaction.amount:,.2f})")
         _bal(int(self.current_user.get_balance()))
-        print()
+        _print()
     
     # ── transfer ──────────────────────────────────────────────────────── #
     def transfer(self) -> None:
@@ -288,38 +604,26 @@ class BankingApp:
         target_user = _prompt("Send To  ").strip().upper()
         _section_end()
 
-        try:
-            amount = float(raw)
-        except ValueError:
-            _err("Invalid transfer amount")
-            print()
-            return
-
-        if amount <= 0:
+        status, transaction = self.apply_transfer(raw, target_user)
+        if status == STATUS_BAD_AMOUNT:
             _err("Invalid transfer amount")
-            print()
+            _print()
             return
 
-        if amount > self.current_user.get_balance():
+        if status == STATUS_NO_FUNDS:
             _err("Insufficient funds")
-            print()
+            _print()
             return
-        
-        target_account_number = None
-        for account in self.accounts.values():
-            if account.get_name().upper() == target_user:
-                target_account_number = account.account_number
 
-        if not target_account_number:
+        if status == STATUS_NO_TARGET:
             _err("Target not found")
-            print()
+            _print()
             return 
 
-        self.current_user.update_balance(-amount)
-        self.write_trans(Transaction("TRN", self.current_user.account_number, amount, account_target = target_account_number))
-        _ok(f"Transfer successful  (-${amount:,.2f})")
+        self.write_trans(transaction)
+        _ok(f"Transfer successful  (-${transaction.amount:,.2f})")
         _bal(int(self.current_user.get_balance()))
-        print()
+        _print()
 
     # ── process_menu ──────────────────────────────────────────────────── #
     def process_menu(self, choice: str) -> str:
@@ -351,8 +655,123 @@ class BankingApp:
             6: "exit",
         }.get(n, "invalid_option")
 
+    # ── replay ────────────────────────────────────────────────────────── #
+    def replay(self, keystrokes: str, status: list[str] | None = None,
+               isolated: bool = False) -> list[str]:
+        """
+        Headless mode: run the login / menu / transaction logic of run()
+        over a complete keystroke stream without rendering anything.
+
+        Input is consumed exactly as the interactive loop consumes it, so
+        the same stream produces the same transaction records. They are
+        written to the session log in one go and returned. When *status*
+        is a list, one compact line per step ("LOGIN OK", "WDR NSF",
+        "BAL 700.00", ...) is appended to it. With isolated=True the
+        balances of the accounts used are put back afterwards, as if the
+        session had run in its own ATM process.
+        """
+        self.reload_accounts()
+        lines = keystrokes.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()                 # a trailing newline ends the last line
+        keys = iter(lines)
+        records: list[str] = []
+        note = status.append if status is not None else (lambda line: None)
+        originals: dict[str, Account] = {}
+        if isolated:
+            import copy                 # headless only; keeps ATM startup lean
+
+        def key() -> str:               # like _prompt(): "" once input runs out
+            return next(keys, "").strip()
+
+        def record(code: str, result: tuple[str, Transaction | None]) -> None:
+            note(f"{code} {result[0]}")
+            if result[1] is not None:
+                records.append(result[1].format())
+
+        running = True
+        while running:
+            account_number = key()
+            if not account_number:
+                break
+            self.current_user = self.authenticate(account_number, key())
+            if self.current_user is None:
+                note(f"LOGIN {STATUS_BAD_LOGIN}")
+                break
+            note(f"LOGIN {STATUS_OK}")
+            if isolated and self.current_user.account_number not in originals:
+                originals[self.current_user.account_number] = copy.copy(self.current_user)
+
+            while True:
+                choice = next(keys, None)
+                if choice is None:
+                    running = False
+                    break
+                action = self.process_menu(choice.strip())
+
+                if action == "balance":
+                    note(f"BAL {self.current_user.get_balance():.2f}")
+                elif action == "deposit":
+                    record("DEP", self.apply_deposit(key()))
+                elif action == "withdraw":
+                    record("WDR", self.apply_withdraw(key()))
+                elif action == "transfer":
+                    raw = key()
+                    record("TRN", self.apply_transfer(raw, key().upper()))
+                elif action == "logout":
+                    self.current_user = None
+                    note(f"LOGOUT {STATUS_OK}")
+                    break
+                elif action == "exit":
+                    note(f"EXIT {STATUS_OK}")
+                    running = False
+                    break
+                elif action == "invalid_format":
+                    note(f"MENU {STATUS_BAD_FORMAT}")
+                    running = False
+                    break
+                else:
+                    note(f"MENU {STATUS_BAD_OPTION}")
+
+        if records:
+            self.log_history("\n".join(records))
+        if originals:
+            self.accounts.update(originals)
+            self.current_user = None
+        return records
+
+    def replay_sessions(self, sessions, status: list[str] | None = None) -> int:
+        """
+        Replay many keystroke streams (one per ATM session) in this process.
+
+        Every session starts from the same account balances and gets its
+        own session_N.txt, numbered as if each had been run by a separate
+        `python bankingapp.py` launch. A blank status line separates the
+        sessions. Returns the number of sessions replayed.
+        """
+        with os.scandir(self.history_dir) as entries:
+            file_count = sum(1 for entry in entries if entry.is_file())
+
+        replayed = 0
+        for keystrokes in sessions:
+            self.history_file = os.path.join(self.history_dir, f"session_{file_count + 1}.txt")
+            if self.replay(keystrokes, status, isolated=True):
+                file_count += 1
+            if status is not None:
+                status.append("")
+            replayed += 1
+        self.history_file = None
+        return replayed
+
     # ── run ───────────────────────────────────────────────────────────── #
     def run(self) -> None:
+        """Run the main event loop, flushing any buffered output at the end."""
+        try:
+            self._event_loop()
+        finally:
+            _screen.flush()
+
+    def _event_loop(self) -> None:
         """
         Main event loop.
 
@@ -375,7 +794,8 @@ class BankingApp:
                 _menu_box(self.current_user.account_number)
 
                 try:
-                    print("  ▶  Select (1-6): ")
+                    _screen.write("  ▶  Select (1-6): \n")
+                    _screen.flush()
                     choice = input().strip()
                 except EOFError:
                     return          # clean exit when input file is exhausted
@@ -400,19 +820,19 @@ class BankingApp:
 
                 elif action == "exit":
                     _info("Thank you for using the Banking System")
-                    print()
-                    print("  Goodbye")
+                    _print()
+                    _print("  Goodbye")
                     return
 
                 elif action == "invalid_format":
                     _err("Invalid input format")
-                    print()
-                    print("  Goodbye")
+                    _print()
+                    _print("  Goodbye")
                     return
 
                 else:               # invalid_option
                     _err("Invalid menu option")
-                    print()
+                    _print()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -420,27 +840,121 @@ class BankingApp:
 # ══════════════════════════════════════════════════════════════════════════════
 
 DEFAULT_ACCOUNTS = "currentaccounts.txt"
+_FLAGS = ("--index", "--headless", "--status", "--history-index", "--append-log", "--service", "--shared", "--sqlite")
 
 def main(argv: list[str]) -> int:
     """
     Usage (all forms accepted):
         python bankingapp.py                                    → defaults
         python bankingapp.py currentaccounts.txt                → custom accounts
+        python bankingapp.py currentaccounts.txt --index        → per-account lookups
+        python bankingapp.py currentaccounts.txt --headless     → replay stdin without UI
+        python bankingapp.py currentaccounts.txt --headless --status
+                                                                → ... and print status codes
+        python bankingapp.py currentaccounts.txt --headless t01.txt t02.txt ...
+                                                                → replay many sessions
+        python bankingapp.py currentaccounts.txt --memprofile report.json ...
+                                                                → write a memory profile
+        python bankingapp.py currentaccounts.txt --history-dir logs
+                                                                → keep session logs in logs/
+        python bankingapp.py currentaccounts.txt --history-index
+                                                                → index session logs as written
+        python bankingapp.py currentaccounts.txt --append-log   → shared log in Transactions/segments
+        python bankingapp.py currentaccounts.txt --service      → use account_service.py
+                                                                  (socket <accounts_file>.sock),
+                                                                  or the file when it is not running
+        python bankingapp.py currentaccounts.txt --shared       → attach the table published by
+                                                                  shared_table.py (<accounts_file>.shm)
+        python bankingapp.py accounts.db --sqlite               → read accounts from a sqlite_store.py
+                                                                  database
         bank-atm currentaccounts.txt                            → via launcher
     """
-    if len(argv) > 3:
-        print("Usage:  bank-atm [accounts_file]")
+    argv = list(argv)
+    memprofile = None
+    if "--memprofile" in argv[1:-1]:
+        at = argv.index("--memprofile")
+        memprofile = argv.pop(at + 1)
+        del argv[at]
+    history_dir = None
+    if "--history-dir" in argv[1:-1]:
+        at = argv.index("--history-dir")
+        history_dir = argv.pop(at + 1)
+        del argv[at]
+
+    flags = [a for a in argv[1:] if a.startswith("--")]
+    args  = [a for a in argv[1:] if not a.startswith("--")]
+
+    headless = "--headless" in flags
+    if (len(args) > 2 and not headless) or any(f not in _FLAGS for f in flags):
+        print("Usage:  bank-atm [accounts_file] [--index] [--headless [--status] [session_file ...]] "
+              "[--memprofile report.json] [--history-dir dir] [--history-index] [--append-log] "
+              "[--service] [--shared] [--sqlite]")
         print(f"       bank-atm {DEFAULT_ACCOUNTS}")
         return 1
 
-    accounts_file = argv[1] if len(argv) > 1 else DEFAULT_ACCOUNTS
+    accounts_file = args[0] if args else DEFAULT_ACCOUNTS
 
     try:
-        app = BankingApp(accounts_file)
-    except FileNotFoundError as e:
+        source = None
+        if "--index" in flags:
+            from account_index import AccountIndex
+            source = AccountIndex(accounts_file)
+        elif "--service" in flags:
+            from account_service import AccountServiceClient
+            try:
+                source = AccountServiceClient(accounts_file + ".sock")
+            except OSError:
+                # no service running: read the file in this process instead
+                sys.stderr.write(f"Account service not running; reading {accounts_file}\n")
+        elif "--shared" in flags:
+            from shared_table import SharedAccountTable
+            source = SharedAccountTable(accounts_file + ".shm")
+        elif "--sqlite" in flags:
+            from sqlite_store import AccountStore
+            source = AccountStore(accounts_file)
+        app = BankingApp(accounts_file, source, history_dir)
+        if "--history-index" in flags:
+            from history_index import HistoryIndex
+            app.history_index = HistoryIndex(app.history_dir)
+        if "--append-log" in flags:
+            from append_log import SegmentedLog
+            app.append_log = SegmentedLog(os.path.join(app.history_dir, "segments"))
+    except (FileNotFoundError, ConnectionError) as e:
         print(f"Error: {e}")
         return 1
 
+    if memprofile is None:
+        return _drive(app, flags, args, headless)
+
+    # profiling is opt-in: memprofile (and tracemalloc) are only imported here
+    from memprofile import MemoryProfiler
+    profiler = MemoryProfiler()
+    try:
+        if source is None:
+            with profiler.stage("load_accounts"):
+                app.load_accounts()
+        with profiler.stage("headless" if headless else "session"):
+            return _drive(app, flags, args, headless)
+    finally:
+        profiler.write(memprofile)
+        profiler.stop()
+
+
+def _drive(app: BankingApp, flags: list[str], args: list[str], headless: bool) -> int:
+    if headless:
+        status: list[str] | None = [] if "--status" in flags else None
+        if len(args) > 1:
+            def sessions():
+                for session_file in args[1:]:
+                    with open(session_file, "r", encoding="utf-8") as f:
+                        yield f.read()
+            app.replay_sessions(sessions(), status)
+        else:
+            app.replay(sys.stdin.read(), status)
+        if status:
+            sys.stdout.write("\n".join(status) + "\n")
+        return 0
+
     app.run()
     return 0
 
@@ -0,0 +1,60 @@
+"""
+ATM start-up plus one login: parsing the accounts file in the process
+versus asking a running account service.
+
+Run with:
+    python benchmarks/bench_account_service.py [account_counts...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from account_service import AccountService, AccountServiceClient
+from bankingapp import BankingApp
+
+
+def login_direct(accounts_file, account):
+    app = BankingApp(accounts_file)
+    app.load_accounts()
+    return app.authenticate(account, "1234")
+
+
+def login_service(socket_path, account):
+    with AccountServiceClient(socket_path) as client:
+        return client.validate(account, "1234")
+
+
+def timed(label, fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000 / repeat:10.3f} ms per login")
+
+
+def main(argv):
+    counts = [int(arg) for arg in argv[1:]] or [1000, 10000, 99999]
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            accounts_file = os.path.join(directory, "accounts.txt")
+            with open(accounts_file, "w") as f:
+                for n in range(1, count + 1):
+                    f.write(f"{n:05d} {f'Customer {n}':<20} A 01000.00 1234 NP\n")
+            account = str(count // 2 or 1)
+
+            service = AccountService(accounts_file, os.path.join(directory, "accounts.sock"))
+            service.start()
+            try:
+                print(f"{count} accounts")
+                timed("  parse file in the ATM", lambda: login_direct(accounts_file, account))
+                timed("  account service", lambda: login_service(service.socket_path, account))
+            finally:
+                service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,52 @@
+"""
+Writing ATM session records: one session_N.txt per session (plus the
+daily concatenation) versus the shared segmented append log.
+
+Run with:
+    python benchmarks/bench_append_log.py [sessions] [records_per_session]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from append_log import SegmentedLog
+
+
+def per_session_files(directory, sessions, records):
+    for n in range(1, sessions + 1):
+        with open(os.path.join(directory, f"session_{n}.txt"), "a") as f:
+            for r in range(records):
+                f.write(f"DEP {n} {r}.00\n")
+    with open(os.path.join(directory, "dailytransout.atf"), "w") as out:
+        for n in range(1, sessions + 1):
+            with open(os.path.join(directory, f"session_{n}.txt")) as f:
+                out.write(f.read())
+
+
+def shared_log(directory, sessions, records):
+    log = SegmentedLog(os.path.join(directory, "segments"))
+    for n in range(1, sessions + 1):
+        for r in range(records):
+            log.append(f"DEP {n} {r}.00")
+
+
+def main(argv):
+    sessions = int(argv[1]) if len(argv) > 1 else 5000
+    records = int(argv[2]) if len(argv) > 2 else 4
+
+    for label, write in (("per-session files", per_session_files), ("segmented log", shared_log)):
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            write(directory, sessions, records)
+            elapsed = time.perf_counter() - start
+            files = sum(len(names) for _, _, names in os.walk(directory))
+        print(f"{label:<18} {elapsed * 1000:9.1f} ms  {files:6d} files")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
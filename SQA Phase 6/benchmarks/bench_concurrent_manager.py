@@ -0,0 +1,74 @@
+"""
+Throughput of AccountManager (lock-free) versus ConcurrentAccountManager.
+
+Run with:
+    python benchmarks/bench_concurrent_manager.py [accounts] [operations] [threads]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import AccountManager, ConcurrentAccountManager
+
+
+def make_accounts(count):
+    return [
+        {"account_number": str(i), "name": f"Holder {i}", "status": "A",
+         "balance": 1000.00, "pin": "0000", "plan": "NP"}
+        for i in range(1, count + 1)
+    ]
+
+
+def make_workload(numbers, operations, seed):
+    rng = random.Random(seed)
+    return [(*rng.sample(numbers, 2), rng.randint(1, 50)) for _ in range(operations)]
+
+
+def drive(manager, workload):
+    for src, dst, amount in workload:
+        manager.transfer(src, dst, amount)
+
+
+def timed(label, fn, operations):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s  {operations / elapsed:12,.0f} ops/s")
+
+
+def main(argv):
+    accounts = int(argv[1]) if len(argv) > 1 else 10000
+    operations = int(argv[2]) if len(argv) > 2 else 400000
+    threads = int(argv[3]) if len(argv) > 3 else 8
+
+    numbers = [str(i) for i in range(1, accounts + 1)]
+    per_thread = operations // threads
+    workloads = [make_workload(numbers, per_thread, seed) for seed in range(threads)]
+    flat = [op for w in workloads for op in w]
+
+    single = AccountManager(make_accounts(accounts))
+    timed("AccountManager, 1 thread", lambda: drive(single, flat), len(flat))
+
+    locked = ConcurrentAccountManager(make_accounts(accounts))
+    timed("ConcurrentAccountManager, 1 thread", lambda: drive(locked, flat), len(flat))
+
+    shared = ConcurrentAccountManager(make_accounts(accounts))
+
+    def run_threads():
+        pool = [threading.Thread(target=drive, args=(shared, w)) for w in workloads]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+
+    timed(f"ConcurrentAccountManager, {threads} threads", run_threads, len(flat))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,55 @@
+"""
+Grouped fee stage (fees.compute_fees) versus a naive per-record loop.
+
+Run with:
+    python benchmarks/bench_fees.py [accounts] [records]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fees import DEFAULT_FEE_TABLE, compute_fees
+
+
+def naive_fees(records, plans, fee_table):
+    fees = {}
+    for code, account_number, _, _ in records:
+        plan = plans.get(account_number)
+        if plan is not None:
+            fee = fee_table.get(plan, {}).get(code, 0)
+            if fee:
+                fees[account_number] = round(fees.get(account_number, 0) + fee, 2)
+    return fees
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s  {count / elapsed:12,.0f} records/s")
+    return result
+
+
+def main(argv):
+    accounts = int(argv[1]) if len(argv) > 1 else 10000
+    count = int(argv[2]) if len(argv) > 2 else 1000000
+
+    rng = random.Random(1)
+    plans = {str(i): rng.choice(("SP", "NP")) for i in range(1, accounts + 1)}
+    numbers = list(plans)
+    codes = ("DEP", "WDR", "TRN", "PAY")
+    records = [(rng.choice(codes), rng.choice(numbers), 10.0, None) for _ in range(count)]
+
+    grouped = timed("grouped (compute_fees)", lambda: compute_fees(records, plans, DEFAULT_FEE_TABLE), count)
+    naive = timed("naive per-record", lambda: naive_fees(records, plans, DEFAULT_FEE_TABLE), count)
+    assert grouped.keys() == naive.keys()
+    assert all(abs(grouped[k] - naive[k]) < 0.005 for k in grouped)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,147 @@
+"""
+Headless replay versus the interactive ATM.
+
+1. Per step: BankingApp.replay() versus BankingApp.run() on one long
+   keystroke stream, both in-process with stdout redirected.
+2. Per session: one `python bankingapp.py` launch per session file (how
+   daily.sh replays tests/day_*) versus a single
+   `python bankingapp.py --headless <files...>` launch.
+
+Both compare the resulting session logs.
+
+Run with:
+    python benchmarks/bench_headless.py [menu_steps] [sessions]
+"""
+
+import glob
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+PHASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PHASE_DIR)
+
+from bankingapp import BankingApp
+
+ACCOUNTS = (
+    "83413 Jerry Mickelson      A 07055.00 5190 NP\n"
+    "02345 Sarah Smith          A 01240.00 5687 SP\n"
+)
+
+
+def make_session(steps, seed=1):
+    rng = random.Random(seed)
+    keys = ["83413", "5190"]
+    for _ in range(steps):
+        choice = rng.choice("12349")
+        keys.append(choice)
+        if choice in "23":
+            keys.append(f"{rng.randint(1, 100)}.00")
+        elif choice == "4":
+            keys += [f"{rng.randint(1, 100)}.00", "Sarah Smith"]
+    keys.append("6")
+    return "\n".join(keys) + "\n"
+
+
+def per_step(steps, directory, accounts_file):
+    session = make_session(steps)
+
+    interactive_dir = os.path.join(directory, "interactive")
+    app = BankingApp(accounts_file, history_dir=interactive_dir)
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(session)
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+            start = time.perf_counter()
+            app.run()
+            interactive = time.perf_counter() - start
+    finally:
+        sys.stdin = stdin
+
+    headless_dir = os.path.join(directory, "headless")
+    app = BankingApp(accounts_file, history_dir=headless_dir)
+    start = time.perf_counter()
+    app.replay(session, [])
+    headless = time.perf_counter() - start
+
+    same = read_logs(interactive_dir) == read_logs(headless_dir)
+    print(f"per step, {steps:,} steps in one session")
+    print(f"  interactive run()   {interactive:8.3f}s  {steps / interactive:12,.0f} steps/s")
+    print(f"  headless replay()   {headless:8.3f}s  {steps / headless:12,.0f} steps/s")
+    print(f"  speed-up {interactive / headless:.0f}x, identical session logs: {same}")
+
+
+def per_session(count, directory):
+    # the bundled day inputs, cycled up to *count* session files
+    inputs = sorted(glob.glob(os.path.join(PHASE_DIR, "tests", "day_*", "*.txt")))
+    session_dir = os.path.join(directory, "sessions")
+    os.makedirs(session_dir)
+    files = []
+    for i in range(count):
+        with open(inputs[i % len(inputs)], "rb") as src:
+            data = src.read()
+        files.append(os.path.join(session_dir, f"s{i:06d}.txt"))
+        with open(files[-1], "wb") as dst:
+            dst.write(data)
+    accounts_file = os.path.join(PHASE_DIR, "currentaccounts.txt")
+
+    # both modes log to the real Transactions/ folder; run each in a scratch
+    # copy of the app so the folder stays clean
+    logs = {}
+    timings = {}
+    for mode in ("interactive", "headless"):
+        app_dir = os.path.join(directory, mode + "_app")
+        os.makedirs(os.path.join(app_dir, "Transactions"))
+        for name in ("bankingapp.py", "account.py", "transaction.py"):
+            with open(os.path.join(PHASE_DIR, name), "rb") as src, \
+                    open(os.path.join(app_dir, name), "wb") as dst:
+                dst.write(src.read())
+        app = os.path.join(app_dir, "bankingapp.py")
+
+        start = time.perf_counter()
+        if mode == "interactive":
+            for path in files:
+                with open(path, "rb") as stdin:
+                    subprocess.run([sys.executable, app, accounts_file], stdin=stdin,
+                                   stdout=subprocess.DEVNULL, check=True)
+        else:
+            subprocess.run([sys.executable, app, accounts_file, "--headless", *files],
+                           stdout=subprocess.DEVNULL, check=True)
+        timings[mode] = time.perf_counter() - start
+        logs[mode] = read_logs(os.path.join(app_dir, "Transactions"))
+
+    print(f"per session, {count:,} session files")
+    for mode, elapsed in timings.items():
+        print(f"  {mode:<19} {elapsed:8.3f}s  {count / elapsed:12,.0f} sessions/s")
+    print(f"  speed-up {timings['interactive'] / timings['headless']:.0f}x, "
+          f"identical session logs: {logs['interactive'] == logs['headless']}")
+
+
+def read_logs(directory):
+    logs = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name)) as f:
+            logs[name] = f.read()
+    return logs
+
+
+def main(argv):
+    steps = int(argv[1]) if len(argv) > 1 else 50000
+    sessions = int(argv[2]) if len(argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as directory:
+        accounts_file = os.path.join(directory, "currentaccounts.txt")
+        with open(accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        per_step(steps, directory, accounts_file)
+        per_session(sessions, directory)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
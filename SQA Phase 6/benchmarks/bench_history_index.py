@@ -0,0 +1,56 @@
+"""
+Looking up one account's transactions: history index query versus a scan
+of every session log.
+
+Run with:
+    python benchmarks/bench_history_index.py [session_logs] [lines_per_log] [accounts]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from history_index import HistoryIndex
+
+
+def scan(log_dir, account):
+    found = []
+    for name in sorted(os.listdir(log_dir)):
+        if name.startswith("session_"):
+            with open(os.path.join(log_dir, name)) as f:
+                found += [line for line in f if account in line.split()[1::2]]
+    return found
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<20} {(time.perf_counter() - start) * 1000:10.2f} ms  {len(result)} results")
+
+
+def main(argv):
+    logs = int(argv[1]) if len(argv) > 1 else 5000
+    lines = int(argv[2]) if len(argv) > 2 else 20
+    accounts = int(argv[3]) if len(argv) > 3 else 99999
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as log_dir:
+        for n in range(1, logs + 1):
+            with open(os.path.join(log_dir, f"session_{n}.txt"), "w") as f:
+                for _ in range(lines):
+                    f.write(f"{rng.choice(('DEP', 'WDR', 'PAY'))} {rng.randint(1, accounts)} 10.00\n")
+
+        index = HistoryIndex(log_dir)
+        timed("ingest (all logs)", lambda: [None] * index.ingest())
+        account = str(rng.randint(1, accounts))
+        timed("index query", lambda: index.history(account))
+        timed("scan every log", lambda: scan(log_dir, account))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
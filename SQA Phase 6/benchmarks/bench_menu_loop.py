@@ -0,0 +1,49 @@
+"""
+Menu-loop throughput of the interactive ATM with stdout redirected to a
+file.
+
+Run with:
+    python benchmarks/bench_menu_loop.py [iterations]
+
+Iterations alternate between viewing the balance and an invalid menu
+option, so the frames, the balance bar and the prompt flushes are all
+exercised without writing session records.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+APP = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "bankingapp.py"))
+ACCOUNTS = "83413 Jerry Mickelson      A 07055.00 5190 NP\n"
+
+
+def main(argv):
+    iterations = int(argv[1]) if len(argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as directory:
+        accounts_file = os.path.join(directory, "currentaccounts.txt")
+        input_file = os.path.join(directory, "session.txt")
+        output_file = os.path.join(directory, "terminal.out")
+        with open(accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        with open(input_file, "w", newline="\n") as f:
+            f.write("83413\n5190\n" + "1\n9\n" * (iterations // 2) + "6\n")
+
+        env = dict(os.environ, PYTHONUNBUFFERED="")
+        with open(input_file, "rb") as stdin, open(output_file, "wb") as stdout:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, APP, accounts_file], stdin=stdin, stdout=stdout,
+                           env=env, check=True)
+            elapsed = time.perf_counter() - start
+
+        size = os.path.getsize(output_file)
+        print(f"{iterations:,} menu iterations in {elapsed:.3f}s "
+              f"({iterations / elapsed:,.0f} iterations/s, {size / elapsed / 1e6:.1f} MB/s of terminal output)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
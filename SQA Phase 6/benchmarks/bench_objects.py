@@ -0,0 +1,94 @@
+"""
+Memory of loaded accounts and ATM transactions: the slotted, interned
+Account / Transaction classes versus plain __dict__-based equivalents.
+
+Run with:
+    python benchmarks/bench_objects.py [accounts] [transactions]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bankingapp
+from account import Account
+from transaction import Transaction
+
+
+class DictAccount:
+    def __init__(self, account_number, name, pin, balance):
+        self._account_number = account_number
+        self._name = name
+        self._pin = pin
+        self._balance = float(balance)
+
+    @property
+    def account_number(self):
+        return self._account_number
+
+
+class DictTransaction:
+    def __init__(self, trans_code, account_number, amount, account_target=None):
+        self.trans_code = trans_code
+        self.account_number = account_number
+        self.amount = float(amount)
+        self.account_target = account_target
+
+
+def write_accounts(path, count, rng):
+    with open(path, "w", newline="\n") as f:
+        for number in range(1, count + 1):
+            f.write(f"{number:05d} {'First' + str(number):<10} {'Last':<9} A "
+                    f"{rng.uniform(0, 99999):08.2f} {rng.randint(0, 9999):04d} "
+                    f"{rng.choice(('SP', 'NP'))}\n")
+
+
+def measure(account_class, transaction_class, accounts_file, count, seed):
+    rng = random.Random(seed)
+    bankingapp.Account = account_class
+    tracemalloc.start()
+    try:
+        app = bankingapp.BankingApp(accounts_file, history_dir=tempfile.gettempdir())
+        app.load_accounts()
+        loaded, _ = tracemalloc.get_traced_memory()
+
+        users = list(app.accounts.values())
+        codes = ("DEP", "WDR", "TRN")
+        transactions = []
+        for _ in range(count):
+            user = rng.choice(users)
+            code = rng.choice(codes)
+            amount = float(f"{rng.uniform(1, 500):.2f}")   # as typed at the prompt
+            target = rng.choice(users).account_number if code == "TRN" else None
+            transactions.append(transaction_class(code, user.account_number, amount, target))
+        total, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        bankingapp.Account = Account
+    return loaded, total - loaded
+
+
+def main(argv):
+    accounts = int(argv[1]) if len(argv) > 1 else 99999
+    count = int(argv[2]) if len(argv) > 2 else 1000000
+
+    with tempfile.TemporaryDirectory() as directory:
+        accounts_file = os.path.join(directory, "accounts.txt")
+        write_accounts(accounts_file, accounts, random.Random(1))
+        before = measure(DictAccount, DictTransaction, accounts_file, count, 2)
+        after = measure(Account, Transaction, accounts_file, count, 2)
+
+    for label, old, new in (("accounts loaded", before[0], after[0]),
+                            ("transactions", before[1], after[1]),
+                            ("total", sum(before), sum(after))):
+        print(f"{label:<16} {old / 2**20:9.1f} MiB -> {new / 2**20:9.1f} MiB  "
+              f"({1 - new / old:6.1%} less)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,65 @@
+"""
+Loading a large accounts file sequentially versus in fixed-width chunks
+on a process pool, for a growing number of workers.
+
+Run with:
+    python benchmarks/bench_parallel_read.py [records] [max_workers] [accounts_file]
+    (the request's full size: 10000000 records)
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from parallel_read import read_accounts_parallel
+from read import read_bank_accounts
+
+
+def write_accounts(path, records):
+    with open(path, "w", newline="\n") as f:
+        for start in range(0, records, 100000):
+            f.write("".join(f"{n % 99999 + 1:05d} {f'Holder {n}'[:20]:<20} A 01000.00 0000 NP\n"
+                            for n in range(start, min(start + 100000, records))))
+
+
+def timed(label, fn, baseline=None):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        accounts = fn()
+    elapsed = time.perf_counter() - start
+    speedup = f"  x{baseline / elapsed:.2f}" if baseline else ""
+    print(f"{label:<24} {elapsed:8.2f} s  {len(accounts)} accounts{speedup}")
+    return elapsed
+
+
+def main(argv):
+    records = int(argv[1]) if len(argv) > 1 else 2000000
+    max_workers = int(argv[2]) if len(argv) > 2 else os.cpu_count() or 1
+
+    directory = None
+    if len(argv) > 3:
+        path = argv[3]
+    else:
+        directory = tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(directory.name, "accounts.txt")
+        write_accounts(path, records)
+    try:
+        print(f"{os.path.getsize(path) / 2**20:.0f} MiB, {os.cpu_count()} CPUs")
+        baseline = timed("sequential", lambda: read_bank_accounts(path))
+        workers = 2
+        while workers <= max(max_workers, 2):
+            timed(f"{workers} workers", lambda: read_accounts_parallel(path, workers), baseline)
+            workers *= 2
+    finally:
+        if directory is not None:
+            directory.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
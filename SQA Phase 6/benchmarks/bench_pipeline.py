@@ -0,0 +1,94 @@
+"""
+Sequential read_records() versus the pipelined reader/parser threads,
+each feeding the backend's constraint stage, on a large transaction file.
+
+The file's pages are dropped from the page cache before every cold run
+(posix_fadvise DONTNEED, no root needed), so cold runs read from disk.
+
+Run with:
+    python benchmarks/bench_pipeline.py [megabytes] [accounts] [transaction_file]
+"""
+
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import AccountManager, ConstraintChecker, TransactionProcessor, parse_transaction
+from pipeline import pipelined_records
+
+
+def write_day(path, megabytes, accounts):
+    rng = random.Random(1)
+    codes = ("DEP", "WDR", "PAY")
+    target = megabytes << 20
+    with open(path, "w", newline="\n") as f:
+        written = 0
+        while written < target:
+            block = "".join(f"{rng.choice(codes)} {rng.randint(1, accounts):05d} {rng.uniform(1, 20):.2f}\n"
+                            for _ in range(10000))
+            f.write(block)
+            written += len(block)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def drop_cache(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def run(path, account_list, pipelined):
+    checker = ConstraintChecker(account_list)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        if pipelined:
+            records = pipelined_records(path, parse_transaction)
+        else:
+            records = TransactionProcessor(AccountManager(account_list)).read_records(path)
+        accepted = checker.check(records)
+    return time.perf_counter() - start, len(accepted)
+
+
+def main(argv):
+    megabytes = int(argv[1]) if len(argv) > 1 else 64
+    accounts = int(argv[2]) if len(argv) > 2 else 99999
+    account_list = [{"account_number": str(i), "name": f"Holder {i}", "status": "A",
+                     "balance": 50000.0, "pin": "0000", "plan": "NP"}
+                    for i in range(1, accounts + 1)]
+
+    directory = None
+    if len(argv) > 3:
+        path = argv[3]
+    else:
+        directory = tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(directory.name, "day.atf")
+        write_day(path, megabytes, accounts)
+    size = os.path.getsize(path) / 2**20
+
+    try:
+        for cache in ("cold", "warm"):
+            for label, pipelined in (("sequential", False), ("pipelined", True)):
+                if cache == "cold":
+                    drop_cache(path)
+                else:
+                    run(path, account_list, pipelined)       # warm the cache
+                elapsed, count = run(path, account_list, pipelined)
+                print(f"{cache} {label:<11} {elapsed:8.2f}s  {size / elapsed:8.1f} MiB/s  "
+                      f"{count:,} records")
+    finally:
+        if directory is not None:
+            directory.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
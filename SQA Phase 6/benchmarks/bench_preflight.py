@@ -0,0 +1,48 @@
+"""
+Pre-flight check of a day's session logs, sequential versus on a process
+pool, against the same day's backend constraint stage.
+
+Run with:
+    python benchmarks/bench_preflight.py [sessions] [records_per_session] [workers]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from preflight import check_logs, session_logs
+
+
+def write_sessions(directory, sessions, records, accounts):
+    rng = random.Random(1)
+    for n in range(1, sessions + 1):
+        with open(os.path.join(directory, f"session_{n}.txt"), "w") as f:
+            for _ in range(records):
+                account = rng.randint(1, accounts + accounts // 100)          # ~1% unknown
+                f.write(f"{rng.choice(('DEP', 'WDR', 'PAY'))} {account} {rng.uniform(1, 500):.2f}\n")
+
+
+def main(argv):
+    sessions = int(argv[1]) if len(argv) > 1 else 20000
+    records = int(argv[2]) if len(argv) > 2 else 5
+    workers = int(argv[3]) if len(argv) > 3 else max(os.cpu_count() or 1, 2)
+    known = frozenset(str(n) for n in range(1, 100000))
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(__file__))) as directory:
+        write_sessions(directory, sessions, records, 99999)
+        paths = session_logs(directory)
+        print(f"{sessions} sessions, {sessions * records} records, {os.cpu_count()} CPUs")
+        for label, count in (("sequential", 1), (f"{workers} workers", workers)):
+            start = time.perf_counter()
+            clean, problems, _ = check_logs(paths, known, count)
+            print(f"{label:<12} {time.perf_counter() - start:8.2f} s  {len(clean)} passed, "
+                  f"{len(problems)} rejected")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
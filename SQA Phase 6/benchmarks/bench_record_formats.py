@@ -0,0 +1,51 @@
+"""
+Read and write throughput of the v1 and v2 account record formats, and
+the streaming v1 -> v2 conversion.
+
+Run with:
+    python benchmarks/bench_record_formats.py [records]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from convert_accounts import convert_accounts
+from read import read_bank_accounts
+from write import write_new_accounts
+
+
+def timed(label, fn, records):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<18} {best:8.3f} s  {records / best / 1e6:6.2f} M records/s")
+
+
+def main(argv):
+    records = int(argv[1]) if len(argv) > 1 else 500000
+    accounts = [{"account_number": str(n % 99999 + 1), "name": f"Holder {n}"[:20], "status": "A",
+                 "balance": 1000.0, "pin": "0000", "plan": "NP"} for n in range(records)]
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(__file__))) as directory:
+        paths = {version: os.path.join(directory, f"v{version}.txt") for version in (1, 2)}
+        for version, path in paths.items():
+            timed(f"write v{version}", lambda: write_new_accounts(accounts, path, version=version), records)
+        for version, path in paths.items():
+            timed(f"read v{version}", lambda: read_bank_accounts(path), records)
+        converted = os.path.join(directory, "converted.txt")
+        timed("convert v1 -> v2", lambda: convert_accounts(paths[1], converted), records)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
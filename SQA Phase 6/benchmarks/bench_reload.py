@@ -0,0 +1,69 @@
+"""
+Picking up a new accounts file in a running ATM: BankingApp.reload_accounts()
+versus loading the whole file again, for a growing number of changed
+accounts out of 99,999.
+
+Run with:
+    python benchmarks/bench_reload.py [changed_counts...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bankingapp import BankingApp
+
+ACCOUNTS = 99999
+
+
+def accounts_text(changed=0):
+    lines = []
+    for n in range(1, ACCOUNTS + 1):
+        balance = 2000 if n <= changed else 1000
+        lines.append(f"{n:05d} {f'Customer {n}':<20} A {balance:08.2f} 1234 NP\n")
+    return "".join(lines)
+
+
+def publish(accounts_file, text):
+    with open(accounts_file + ".tmp", "w") as f:
+        f.write(text)
+    os.replace(accounts_file + ".tmp", accounts_file)
+
+
+def main(argv):
+    counts = [int(arg) for arg in argv[1:]] or [1, 100, 1000, 10000]
+    with tempfile.TemporaryDirectory() as directory:
+        accounts_file = os.path.join(directory, "accounts.txt")
+        history_dir = os.path.join(directory, "history")
+        original = accounts_text()
+        publish(accounts_file, original)
+        app = BankingApp(accounts_file, history_dir=history_dir)
+        app.load_accounts()
+
+        start = time.perf_counter()
+        for _ in range(10000):
+            app.reload_accounts()
+        print(f"{ACCOUNTS} accounts; unchanged file check {(time.perf_counter() - start) * 1e6 / 10000:.1f} us")
+        print(f"  {'changed':>8} {'full load':>12} {'reload':>12}")
+        for count in counts:
+            publish(accounts_file, accounts_text(count))
+            start = time.perf_counter()
+            BankingApp(accounts_file, history_dir=history_dir).load_accounts()
+            full = time.perf_counter() - start
+
+            start = time.perf_counter()
+            changed = app.reload_accounts()
+            reload = time.perf_counter() - start
+            assert changed == count and app.accounts["1"].get_balance() == 2000
+            print(f"  {count:>8} {full * 1000:9.1f} ms {reload * 1000:9.1f} ms")
+
+            publish(accounts_file, original)
+            app.reload_accounts()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
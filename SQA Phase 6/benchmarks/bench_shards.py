@@ -0,0 +1,69 @@
+"""
+Backend run over a single accounts file versus a shard directory, for a
+day that touches only a few accounts.
+
+Run with:
+    python benchmarks/bench_shards.py [accounts] [records] [prefix_digits]
+"""
+
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import BankingBackend
+from shards import split_accounts
+
+
+def write_accounts(path, count):
+    with open(path, "w", newline="\n") as f:
+        for number in range(1, count + 1):
+            f.write(f"{number:05d} {'Holder ' + str(number):<20} A 01000.00 1234 NP\n")
+
+
+def timed_run(trans, current, master):
+    backend = BankingBackend(trans, current, master)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        backend.run()
+    return time.perf_counter() - start, len(backend.accounts)
+
+
+def main(argv):
+    accounts = int(argv[1]) if len(argv) > 1 else 99999
+    records = int(argv[2]) if len(argv) > 2 else 50
+    digits = int(argv[3]) if len(argv) > 3 else 3
+
+    directory = tempfile.mkdtemp()
+    try:
+        single = os.path.join(directory, "master.txt")
+        write_accounts(single, accounts)
+        shutil.copy(single, os.path.join(directory, "current.txt"))
+        split_accounts(single, os.path.join(directory, "master"), digits)
+        split_accounts(single, os.path.join(directory, "current"), digits)
+
+        rng = random.Random(1)
+        trans = os.path.join(directory, "day.atf")
+        with open(trans, "w") as f:
+            for _ in range(records):
+                f.write(f"DEP {rng.randint(1, accounts):05d} 10.00\n")
+
+        for label, current, master in (
+                ("single file", "current.txt", "master.txt"),
+                ("sharded", "current", "master")):
+            elapsed, loaded = timed_run(trans, os.path.join(directory, current),
+                                        os.path.join(directory, master))
+            print(f"{label:<12} {elapsed * 1000:9.1f} ms  {loaded:6d} accounts loaded")
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,64 @@
+"""
+Attaching to the shared account table and looking one account up, versus
+parsing the accounts file in the ATM process.
+
+Run with:
+    python benchmarks/bench_shared_table.py [account_counts...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bankingapp import BankingApp
+from shared_table import SharedAccountTable, publish_file, unpublish
+
+
+def parse_and_find(accounts_file, account):
+    app = BankingApp(accounts_file)
+    app.load_accounts()
+    return app.accounts[account]
+
+
+def attach_and_lookup(pointer, account):
+    with SharedAccountTable(pointer) as table:
+        return table.lookup(account)
+
+
+def timed(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f"  {label:<26} {(time.perf_counter() - start) * 1e6 / repeat:12.1f} us")
+
+
+def main(argv):
+    counts = [int(arg) for arg in argv[1:]] or [1000, 10000, 99999]
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            accounts_file = os.path.join(directory, "accounts.txt")
+            with open(accounts_file, "w") as f:
+                for n in range(1, count + 1):
+                    f.write(f"{n:05d} {f'Customer {n}':<20} A 01000.00 1234 NP\n")
+            pointer = accounts_file + ".shm"
+            start = time.perf_counter()
+            publish_file(accounts_file)
+            published = time.perf_counter() - start
+            account = str(count // 2 or 1)
+            try:
+                with SharedAccountTable(pointer) as table:
+                    size = table._segment.size
+                print(f"{count} accounts (publish {published * 1000:.1f} ms, segment {size / 1024:.0f} KiB "
+                      f"shared by every ATM)")
+                timed("parse file in the ATM", lambda: parse_and_find(accounts_file, account), 5)
+                timed("attach + lookup", lambda: attach_and_lookup(pointer, account), 1000)
+            finally:
+                unpublish(pointer)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,55 @@
+"""
+Disk used by delta snapshots versus a full copy of the master file per
+day, and the time to rebuild a day for an audit query.
+
+Run with:
+    python benchmarks/bench_snapshots.py [accounts] [days] [changes_per_day] [base_every]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from snapshots import SnapshotStore
+from write import format_account
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 99999
+    days = int(argv[2]) if len(argv) > 2 else 30
+    changes = int(argv[3]) if len(argv) > 3 else 500
+    base_every = int(argv[4]) if len(argv) > 4 else 7
+
+    rng = random.Random(1)
+    accounts = [{"account_number": str(i), "name": f"Holder {i}", "status": "A",
+                 "balance": 1000.0, "pin": "0000", "plan": "NP"} for i in range(1, count + 1)]
+    full_size = len("".join(format_account(acc) for acc in accounts))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory, base_every)
+        start = time.perf_counter()
+        for _ in range(days):
+            for acc in rng.sample(accounts, changes):
+                acc["balance"] = round(acc["balance"] + rng.uniform(-50, 50), 2)
+            store.record(accounts)
+        record_time = (time.perf_counter() - start) / days
+        used = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        worst = max(day for day in store.days() if (day - 1) % base_every == base_every - 1)
+        start = time.perf_counter()
+        store.rebuild(worst, os.path.join(directory, "rebuilt.txt"))
+        rebuild_time = time.perf_counter() - start
+
+    print(f"full copies : {full_size * days / 2**20:9.2f} MiB for {days} days")
+    print(f"snapshots   : {used / 2**20:9.2f} MiB (base every {base_every} days, {changes} changes/day)")
+    print(f"record      : {record_time * 1000:9.1f} ms per day")
+    print(f"rebuild     : {rebuild_time * 1000:9.1f} ms for day {worst} (base + {base_every - 1} deltas)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,76 @@
+"""
+One backend day on the flat accounts files versus the SQLite account
+store, plus the point queries the flat files can only answer by scanning.
+
+Run with:
+    python benchmarks/bench_sqlite_store.py [accounts] [records]
+    (the request's full size: 99999 10000000)
+"""
+
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import BankingBackend
+from read import read_bank_accounts
+from sqlite_store import AccountStore
+
+
+def write_inputs(directory, accounts, records):
+    accounts_file = os.path.join(directory, "current.txt")
+    with open(accounts_file, "w") as f:
+        for n in range(1, accounts + 1):
+            f.write(f"{n:05d} {f'Holder {n}':<20} A 50000.00 0000 NP\n")
+    rng = random.Random(1)
+    trans_file = os.path.join(directory, "day.atf")
+    with open(trans_file, "w") as f:
+        for _ in range(0, records, 10000):
+            f.write("".join(f"{rng.choice(('DEP', 'WDR', 'PAY'))} {rng.randint(1, accounts)} "
+                            f"{rng.uniform(1, 20):.2f}\n" for _ in range(min(10000, records))))
+        f.write("END\n")
+    return accounts_file, trans_file
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = fn()
+    print(f"{label:<34} {(time.perf_counter() - start) * 1000:12.2f} ms")
+    return result
+
+
+def main(argv):
+    accounts = int(argv[1]) if len(argv) > 1 else 99999
+    records = int(argv[2]) if len(argv) > 2 else 1000000
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(__file__))) as directory:
+        accounts_file, trans_file = write_inputs(directory, accounts, records)
+        master = os.path.join(directory, "master.txt")
+        shutil.copy(accounts_file, master)
+        print(f"{accounts} accounts, {records} records")
+
+        timed("flat files: backend day", lambda: BankingBackend(trans_file, accounts_file, master).run())
+        store = AccountStore(os.path.join(directory, "accounts.db"), create=True)
+        timed("sqlite: import accounts", lambda: store.import_accounts(accounts_file))
+        timed("sqlite: backend day", lambda: BankingBackend(trans_file, accounts_file, master, store=store).run())
+
+        account = str(accounts // 2)
+        timed("flat files: one account", lambda: [acc for acc in read_bank_accounts(master)
+                                                   if acc["account_number"] == account])
+        timed("sqlite: one account", lambda: store.lookup(account))
+        timed("flat files: one account's history", lambda: [line for line in open(trans_file)
+                                                             if line.split()[1:2] == [account]])
+        timed("sqlite: one account's history", lambda: store.history(account))
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
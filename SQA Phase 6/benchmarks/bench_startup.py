@@ -0,0 +1,58 @@
+"""
+ATM startup benchmark: wall clock to the first prompt and the import
+profile reported by `python -X importtime`.
+
+Run with:
+    python benchmarks/bench_startup.py [launches] [accounts ...]
+
+Launching with `python -m bankingapp` instead of `python bankingapp.py`
+additionally reuses the cached bytecode of the main module.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from startup import APP, time_to_first_prompt, write_accounts
+
+
+def import_profile(top=10):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import bankingapp"],
+        cwd=os.path.dirname(APP), capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    print(f"{'module':<40} {'self us':>10} {'cumulative us':>14}")
+    for cumulative_us, self_us, name in rows[:top]:
+        print(f"{name:<40} {self_us:>10} {cumulative_us:>14}")
+
+
+def main(argv):
+    launches = int(argv[1]) if len(argv) > 1 else 20
+    sizes = [int(a) for a in argv[2:]] or [10, 99999]
+
+    import_profile()
+    print()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            path = os.path.join(directory, f"accounts_{count}.txt")
+            write_accounts(path, count)
+            times = [time_to_first_prompt(path) for _ in range(launches)]
+            print(f"{count:>6} accounts: first prompt median {statistics.median(times) * 1000:7.1f} ms, "
+                  f"max {max(times) * 1000:7.1f} ms over {launches} launches")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,51 @@
+"""
+Atomic buffered write_new_accounts versus the old line-by-line writer.
+
+Run with:
+    python benchmarks/bench_write.py [accounts] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from write import format_account, validate_account, write_new_accounts
+
+
+def write_line_by_line(accounts, file_path):
+    with open(file_path, 'w') as file:
+        for acc in accounts:
+            validate_account(acc)
+            file.write(format_account(acc))
+
+
+def timed(label, fn, repeats, count):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<32} {elapsed * 1000:9.2f} ms  {count / elapsed:12,.0f} records/s")
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 99999
+    repeats = int(argv[2]) if len(argv) > 2 else 5
+
+    accounts = [
+        {"account_number": str(i), "name": f"Holder {i}", "status": "A",
+         "balance": float(i % 99999), "pin": "0000", "plan": "NP"}
+        for i in range(1, count + 1)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "masteraccounts.txt")
+        timed("line by line, in place", lambda: write_line_by_line(accounts, path), repeats, count)
+        timed("buffered, atomic", lambda: write_new_accounts(accounts, path), repeats, count)
+        timed("buffered, atomic, fsync", lambda: write_new_accounts(accounts, path, fsync=True), repeats, count)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
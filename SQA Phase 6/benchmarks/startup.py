@@ -0,0 +1,45 @@
+"""
+Time from launching bankingapp.py to its first prompt.
+
+Shared by benchmarks/bench_startup.py and test_startup.py.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+APP = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "bankingapp.py"))
+FIRST_PROMPT = "Account number".encode()
+
+
+def time_to_first_prompt(accounts_file, extra_args=(), python_args=()):
+    """
+    Launch one ATM process and return the seconds until the login prompt
+    is on its stdout. input() flushes stdout before it blocks, so the
+    prompt arrives as soon as the app is ready for the first keystroke.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, *python_args, APP, accounts_file, *extra_args],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        seen = b""
+        while FIRST_PROMPT not in seen:
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError("bankingapp.py exited before the first prompt")
+            seen += chunk
+        return time.perf_counter() - start
+    finally:
+        proc.stdin.close()
+        proc.stdout.close()
+        proc.wait()
+
+
+def write_accounts(file_path, count):
+    """Write a valid accounts file with *count* records."""
+    with open(file_path, "w", newline="\n") as f:
+        for i in range(1, count + 1):
+            f.write(f"{i:05d} {('Holder ' + str(i)):<20} A 01000.00 0000 NP\n")
@@ -0,0 +1,85 @@
+"""
+Account File Converter
+----------------------
+Converts an accounts file between the v1 (45 character) and v2 (57
+character) record formats described in read.py.
+
+The source is streamed one record at a time and written in blocks to a
+temp file next to the destination, which then replaces the destination
+atomically, so memory use does not depend on the file size. Every
+record is validated on the way. The first invalid record (or one that
+does not fit the target format, when converting back to v1) stops the
+conversion with a ValueError and leaves the destination untouched, since
+dropping an account is never an acceptable conversion result.
+
+Source and destination may be the same file.
+
+Run with:
+    python convert_accounts.py <source> <destination> [--to 1|2]    (default: v2)
+"""
+
+import os
+import sys
+import tempfile
+from itertools import chain
+
+from read import PARSERS, line_format
+from write import FORMATTERS, _file_mode, validate_account
+
+BLOCK_RECORDS = 10000
+
+
+def convert_accounts(source, destination, version=2):
+    """Writes *source* in record format *version* to *destination*. Returns the record count."""
+    format_record = FORMATTERS[version]
+    directory = os.path.dirname(os.path.abspath(destination))
+    mode = _file_mode(destination if os.path.exists(destination) else source)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".convert-", suffix=".tmp")
+    count = 0
+    try:
+        with open(source, 'r') as infile, os.fdopen(fd, 'w', newline="\n") as outfile:
+            first = infile.readline()
+            parse = PARSERS[line_format(first)]
+            block = []
+            for line_num, line in enumerate(chain((first,), infile) if first else (), 1):
+                block.append(_convert(parse, format_record, version, line, line_num))
+                if len(block) == BLOCK_RECORDS:
+                    outfile.writelines(block)
+                    count += len(block)
+                    block = []
+            outfile.writelines(block)
+            count += len(block)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, destination)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return count
+
+
+def _convert(parse, format_record, version, line, line_num):
+    account, error = parse(line.rstrip('\n'), line_num)
+    if error:
+        raise ValueError(error)
+    try:
+        validate_account(account, version)
+    except ValueError as e:
+        raise ValueError(f"Line {line_num}: {e}") from None
+    return format_record(account)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    version = 2
+    if "--to" in args[:-1]:
+        at = args.index("--to")
+        version = int(args.pop(at + 1))
+        del args[at]
+    if len(args) != 2 or version not in FORMATTERS:
+        print("Usage: python convert_accounts.py <source> <destination> [--to 1|2]")
+        sys.exit(1)
+    try:
+        print(f"{convert_accounts(args[0], args[1], version)} records written as v{version}")
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
@@ -9,8 +9,9 @@ done
 
 cd ../../Transactions
 
-# Combine session outputs into single file
-cat session_*.txt > ../dailytransout.atf
+# Validate every session output and combine the records that pass into
+# a single file; rejected records are listed in preflight_report.txt
+python ../preflight.py . --accounts ../currentaccounts.txt --out ../dailytransout.atf --report ../preflight_report.txt
 
 # Run backend
 python ../backend.py ../dailytransout.atf ../currentaccounts.txt ../masteraccounts.txt
\ No newline at end of file
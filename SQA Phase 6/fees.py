@@ -0,0 +1,68 @@
+"""
+Transaction Fees
+----------------
+Per-transaction fees keyed by account plan (SP/NP) and transaction code.
+
+Fee table file format, one entry per line (blank lines and lines starting
+with # are ignored):
+    PLAN CODE FEE        e.g.  NP WDR 0.10
+
+The backend charges no fees unless it is given a table (--fees).
+DEFAULT_FEE_TABLE is an example table for tests and benchmarks.
+"""
+
+from collections import Counter
+
+DEFAULT_FEE_TABLE = {
+    "SP": {"DEP": 0.05, "WDR": 0.05, "TRN": 0.05, "PAY": 0.05},
+    "NP": {"DEP": 0.10, "WDR": 0.10, "TRN": 0.10, "PAY": 0.10},
+}
+
+
+def load_fee_table(file_path):
+    """
+    Reads a fee table file into {plan: {code: fee}}.
+    Raises ValueError for a malformed entry.
+    """
+    table = {}
+    with open(file_path, 'r') as file:
+        for line_num, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            if len(parts) != 3 or parts[0] not in ('SP', 'NP'):
+                raise ValueError(f"Line {line_num}: expected 'PLAN CODE FEE', got {line!r}")
+            try:
+                fee = float(parts[2])
+            except ValueError:
+                raise ValueError(f"Line {line_num}: invalid fee {parts[2]!r}") from None
+            if fee < 0:
+                raise ValueError(f"Line {line_num}: negative fee {fee}")
+            table.setdefault(parts[0], {})[parts[1]] = fee
+    return table
+
+
+def compute_fees(records, plans, fee_table):
+    """
+    Works out the whole day's fees in one grouped pass.
+
+    records   : parsed (code, account_number, amount, target) tuples
+    plans     : {account_number: plan}
+    fee_table : {plan: {code: fee}}
+
+    Records are first counted per (code, account); the plan and fee are
+    then looked up once per group rather than once per record. Returns
+    {account_number: total_fee} for accounts that owe a fee.
+    """
+    counts = Counter((record[0], record[1]) for record in records)
+
+    fees = {}
+    for (code, account_number), count in counts.items():
+        plan = plans.get(account_number)
+        if plan is None:
+            continue
+        fee = fee_table.get(plan, {}).get(code, 0)
+        if fee:
+            fees[account_number] = round(fees.get(account_number, 0) + fee * count, 2)
+    return fees
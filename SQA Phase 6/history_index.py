@@ -0,0 +1,337 @@
+"""
+Transaction History Index
+-------------------------
+Finds every transaction of one account across the session logs in
+Transactions/ without scanning them all.
+
+For every account the index keeps a posting file with one line per
+transaction that names it (as the account or as a transfer target):
+
+    <timestamp> <file_id> <byte_offset>
+
+The timestamp is the log file's modification time when the line was
+indexed. A query reads that account's posting file, sorts it into time
+order and then reads exactly those lines from the logs, so its cost
+depends on the number of results, not on the volume of logs.
+
+Logs are indexed incrementally. A journal of the known logs records how
+far each has been read, so ingest() only reads what was appended since
+the last call. A log that was replaced or truncated gets a new file id,
+and the postings for its old contents are ignored. BankingApp can call
+ingest_file() after each write to keep the index current as sessions
+run.
+
+    <log_dir>/.history_index/
+        files.log               journal of the known logs, one change per line:
+                                    I <next_id>                  (after a compaction)
+                                    N <file_id> <inode> <name>   new log
+                                    O <file_id> <offset>         read up to offset
+                                    D <file_id>                  replaced, truncated or deleted
+        postings/12/12345.post  postings of account 12345
+        .lock
+
+Any number of ATM processes may share one index. Every ingest and query
+holds an exclusive flock on .lock, first reads what other processes
+appended to the journal since its last call, and then appends its own
+changes, so file ids are never handed out twice. An ingest appends a
+line or two instead of rewriting the state of every log. Once the
+journal is mostly superseded lines it is rewritten with just the live
+logs, and other processes notice the new file and read it from the
+start. Where fcntl is not available (Windows) there is no lock, and one
+process per log directory is assumed.
+
+Run with:
+    python history_index.py ingest <log_dir>
+    python history_index.py query <log_dir> <account> [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:                       # Windows: one process per index
+    fcntl = None
+
+LOG_PREFIXES = ("session_", "history_")
+TRANSACTION_CODES = ("DEP", "WDR", "TRN", "PAY")
+INDEX_DIRNAME = ".history_index"
+JOURNAL = "files.log"
+COMPACT_LINES = 10000                     # journal lines before a compaction is considered
+
+_CODES = {code.encode() for code in TRANSACTION_CODES}
+
+
+def _account_key(account_number):
+    return account_number.lstrip('0') or '0'
+
+
+class HistoryIndex:
+    """Incremental per-account index over the session logs in one directory."""
+
+    def __init__(self, log_dir, index_dir=None):
+        self.log_dir = log_dir
+        self.index_dir = index_dir or os.path.join(log_dir, INDEX_DIRNAME)
+        self._journal_path = os.path.join(self.index_dir, JOURNAL)
+        os.makedirs(os.path.join(self.index_dir, "postings"), exist_ok=True)
+        self._reset(None)
+        with self._locked():
+            self._refresh()
+
+    def _posting_path(self, account):
+        key = account.zfill(5)
+        return os.path.join(self.index_dir, "postings", key[:2], f"{key}.post")
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(os.path.join(self.index_dir, ".lock"), os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)                  # releases the lock
+
+    # ── journal ───────────────────────────────────────────────────────── #
+    def _reset(self, inode):
+        self._files = {}                  # file id -> {"name", "inode", "offset", "dead"}
+        self._live = {}                   # log name -> file id
+        self._next_id = 1
+        self._journal_inode = inode
+        self._journal_pos = 0
+        self._journal_lines = 0
+
+    def _refresh(self):
+        """Applies what was appended to the journal since the last call (lock held)."""
+        try:
+            info = os.stat(self._journal_path)
+        except FileNotFoundError:
+            return
+        if info.st_ino != self._journal_inode:
+            self._reset(info.st_ino)      # compacted by another process
+        if info.st_size == self._journal_pos:
+            return
+        with open(self._journal_path, 'rb') as file:
+            file.seek(self._journal_pos)
+            data = file.read()
+        end = data.rfind(b"\n") + 1      # a writer that died mid-line left the rest
+        for line in data[:end].decode("utf-8").splitlines():
+            self._apply(line)
+        self._journal_pos += end
+        self._journal_lines += data.count(b"\n", 0, end)
+
+    def _apply(self, line):
+        kind, _, rest = line.partition(" ")
+        if kind == "I":
+            self._next_id = max(self._next_id, int(rest))
+        elif kind == "N":
+            file_id, inode, name = rest.split(" ", 2)
+            self._files[file_id] = {"name": name, "inode": int(inode), "offset": 0, "dead": False}
+            self._live[name] = file_id
+            self._next_id = max(self._next_id, int(file_id) + 1)
+        elif kind == "O":
+            file_id, offset = rest.split()
+            self._files[file_id]["offset"] = int(offset)
+        elif kind == "D":
+            entry = self._files[rest]
+            entry["dead"] = True
+            if self._live.get(entry["name"]) == rest:
+                del self._live[entry["name"]]
+
+    def _record(self, changes, line):
+        """Applies one journal line now; _commit() appends it."""
+        self._apply(line)
+        changes.append(line + "\n")
+
+    def _compact(self):
+        """Rewrites the journal with only the live logs (lock held)."""
+        lines = [f"I {self._next_id}\n"]
+        for file_id, entry in self._files.items():
+            if not entry["dead"]:
+                lines.append(f"N {file_id} {entry['inode']} {entry['name']}\n")
+                lines.append(f"O {file_id} {entry['offset']}\n")
+        data = "".join(lines).encode("utf-8")
+        fd, temp_path = tempfile.mkstemp(dir=self.index_dir, prefix=".journal-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, self._journal_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._files = {file_id: entry for file_id, entry in self._files.items() if not entry["dead"]}
+        self._journal_inode = os.stat(self._journal_path).st_ino
+        self._journal_pos = len(data)
+        self._journal_lines = len(lines)
+
+    def ingest(self):
+        """Indexes everything appended to any log since the last call. Returns the new postings."""
+        with self._locked():
+            self._refresh()
+            names = sorted(name for name in os.listdir(self.log_dir)
+                           if name.startswith(LOG_PREFIXES) and name.endswith(".txt"))
+            postings, changes = {}, []
+            for name in self._live.keys() - set(names):
+                self._record(changes, f"D {self._live[name]}")            # log deleted
+            for name in names:
+                self._ingest(name, postings, changes)
+            return self._commit(postings, changes)
+
+    def ingest_file(self, file_path):
+        """Indexes what was appended to one log since it was last indexed."""
+        with self._locked():
+            self._refresh()
+            postings, changes = {}, []
+            self._ingest(os.path.basename(file_path), postings, changes)
+            return self._commit(postings, changes)
+
+    def _commit(self, postings, changes):
+        """
+        Appends the postings (account -> lines) once per account, then the
+        journal changes (lock held). A crash in between repeats postings,
+        which history() ignores, but never loses any.
+        """
+        for account, lines in postings.items():
+            posting_path = self._posting_path(account)
+            try:
+                file = open(posting_path, 'a')
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(posting_path), exist_ok=True)
+                file = open(posting_path, 'a')
+            with file:
+                file.writelines(lines)
+        if changes:
+            data = "".join(changes).encode("utf-8")
+            with open(self._journal_path, 'ab') as file:
+                file.write(data)
+                if self._journal_inode is None:
+                    self._journal_inode = os.fstat(file.fileno()).st_ino
+            self._journal_pos += len(data)
+            self._journal_lines += len(changes)
+            if self._journal_lines > COMPACT_LINES and self._journal_lines > 4 * len(self._live):
+                self._compact()
+        return sum(len(lines) for lines in postings.values())
+
+    def _ingest(self, name, postings, changes):
+        """Collects the postings of the complete lines appended to one log."""
+        path = os.path.join(self.log_dir, name)
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return
+
+        file_id = self._live.get(name)
+        entry = self._files.get(file_id)
+        if entry is not None and (entry["inode"] != info.st_ino or entry["offset"] > info.st_size):
+            self._record(changes, f"D {file_id}")                         # replaced or truncated: start over
+            entry = None
+        if entry is None:
+            file_id = str(self._next_id)
+            self._record(changes, f"N {file_id} {info.st_ino} {name}")
+            entry = self._files[file_id]
+        if entry["offset"] == info.st_size:
+            return
+
+        with open(path, 'rb') as file:
+            file.seek(entry["offset"])
+            data = file.read()
+        end = data.rfind(b"\n") + 1          # only complete lines
+        if end == 0:
+            return
+
+        timestamp = f"{info.st_mtime:.6f}"
+        offset = entry["offset"]
+        for line in data[:end].splitlines(keepends=True):
+            parts = line.split()
+            if len(parts) >= 3 and parts[0] in _CODES:
+                accounts = {_account_key(parts[1].decode(errors="replace"))}
+                if parts[0] == b"TRN" and len(parts) >= 4:
+                    accounts.add(_account_key(parts[3].decode(errors="replace")))
+                for account in accounts:
+                    if account.isdigit():
+                        postings.setdefault(account, []).append(f"{timestamp} {file_id} {offset}\n")
+            offset += len(line)
+        self._record(changes, f"O {file_id} {entry['offset'] + end}")
+
+    def history(self, account_number, since=None, until=None):
+        """
+        Returns [(timestamp, log_file_name, line), ...] for *account_number*
+        in time order, optionally limited to since <= timestamp < until
+        (seconds since the epoch).
+        """
+        with self._locked():
+            self._refresh()
+            try:
+                with open(self._posting_path(_account_key(account_number)), 'r') as file:
+                    postings = [line.split() for line in file]
+            except FileNotFoundError:
+                return []
+            files = {file_id: dict(entry) for file_id, entry in self._files.items()}
+
+        selected = set()                     # a crash mid-ingest can repeat postings
+        for timestamp, file_id, offset in postings:
+            timestamp = float(timestamp)
+            entry = files.get(file_id)
+            if entry is None or entry["dead"]:
+                continue
+            if (since is not None and timestamp < since) or (until is not None and timestamp >= until):
+                continue
+            selected.add((timestamp, int(file_id), int(offset)))
+
+        results = []
+        handles = {}
+        try:
+            for timestamp, file_id, offset in sorted(selected):
+                if file_id not in handles:
+                    try:
+                        handles[file_id] = open(os.path.join(self.log_dir, files[str(file_id)]["name"]), 'rb')
+                    except FileNotFoundError:
+                        handles[file_id] = None          # deleted since the last ingest
+                handle = handles[file_id]
+                if handle is None:
+                    continue
+                handle.seek(offset)
+                line = handle.readline().decode("utf-8", errors="replace").rstrip("\n")
+                results.append((timestamp, files[str(file_id)]["name"], line))
+        finally:
+            for handle in handles.values():
+                if handle is not None:
+                    handle.close()
+        return results
+
+
+def _date(text):
+    return datetime.datetime.strptime(text, "%Y-%m-%d").timestamp()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"--since": None, "--until": None}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg in options and args:
+            options[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+
+    if len(positional) == 2 and positional[0] == "ingest":
+        print(f"{HistoryIndex(positional[1]).ingest()} postings added")
+    elif len(positional) == 3 and positional[0] == "query":
+        index = HistoryIndex(positional[1])
+        index.ingest()
+        since = _date(options["--since"]) if options["--since"] else None
+        until = _date(options["--until"]) if options["--until"] else None
+        for timestamp, name, line in index.history(positional[2], since, until):
+            when = datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{when}  {name:<20} {line}")
+    else:
+        print("Usage: python history_index.py ingest <log_dir>\n"
+              "       python history_index.py query <log_dir> <account> "
+              "[--since YYYY-MM-DD] [--until YYYY-MM-DD]")
+        sys.exit(1)
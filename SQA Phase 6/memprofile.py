@@ -0,0 +1,90 @@
+"""
+Memory Profiler
+---------------
+Opt-in memory profiling for the backend and the ATM front end.
+
+Code marks its stages with `with profiler.stage("name"):`. A
+MemoryProfiler takes tracemalloc snapshots at every stage boundary and
+reports, per stage, the peak traced memory, the memory still held when
+the stage ends (retained) and the source lines that allocated the most.
+NULL_PROFILER is the default everywhere: its stage() does nothing, and
+tracemalloc is never started, so normal runs pay no tracing overhead.
+
+Report (JSON):
+    {"stages": [{"name": ..., "peak_bytes": ..., "retained_bytes": ...,
+                 "top_allocations": [{"site": "file:line", "size_bytes": ...,
+                                      "count": ...}, ...]}, ...],
+     "peak_bytes": ..., "current_bytes": ...}
+"""
+
+import json
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class NullProfiler:
+    """Profiler that records nothing."""
+
+    _context = nullcontext()
+
+    def stage(self, name):
+        return self._context
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class MemoryProfiler:
+    """Records tracemalloc statistics for each stage."""
+
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.frames = frames
+        self.stages = []
+        self._ignore = (tracemalloc.Filter(False, tracemalloc.__file__),
+                        tracemalloc.Filter(False, __file__))
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._ignore)
+
+    @contextmanager
+    def stage(self, name):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        before = self._snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            top = after.compare_to(before, 'lineno')[:self.top]
+            self.stages.append({
+                "name": name,
+                "peak_bytes": peak,
+                "retained_bytes": current - start_current,
+                "top_allocations": [
+                    {
+                        "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "size_bytes": stat.size_diff,
+                        "count": stat.count_diff,
+                    }
+                    for stat in top if stat.size_diff > 0
+                ],
+            })
+
+    def report(self):
+        current, _ = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "stages": self.stages,
+            "peak_bytes": max((s["peak_bytes"] for s in self.stages), default=0),
+            "current_bytes": current,
+        }
+
+    def write(self, file_path):
+        with open(file_path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
+
+    def stop(self):
+        tracemalloc.stop()
@@ -0,0 +1,118 @@
+"""
+Parallel Account Loader
+-----------------------
+Validates and parses a large accounts file on several processes.
+
+Every record is 45 characters plus a newline, so record N starts at byte
+N * 46 (57 and 58 for v2 records, see read.py). The file is cut into chunks of whole records at those offsets
+and each chunk is parsed by a worker process. The workers' accounts are
+joined in file order, and their error messages are printed in file
+order with the same line numbers read_bank_accounts() would print, so
+the result and the output are the same as for a sequential read.
+
+A worker first checks that its chunk really is laid out that way: a
+newline at the end of every record and nowhere else. If any chunk fails
+the check (lines of the wrong length, CRLF line endings, a trailing
+blank line, non-UTF-8 bytes), the whole file is read sequentially
+instead, since line numbers can then no longer be derived from offsets.
+Small files are always read sequentially because starting the pool
+would cost more than it saves.
+
+The accounts still have to be sent back to the calling process, and
+unpickling them costs about half as much as parsing them there. The
+speed-up therefore levels off near 2x however many CPUs there are.
+
+Run with:
+    python parallel_read.py <accounts_file> [workers]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from read import PARSERS, RECORD_LENGTHS, read_bank_accounts, record_format
+
+CHUNK_RECORDS = 250000                   # per task; several tasks per worker even out the load
+
+
+def record_count(file_path, version=1):
+    """
+    Number of records in a file laid out in fixed-width records of
+    format *version* (the last newline may be missing), or None when the
+    size does not fit.
+    """
+    length = RECORD_LENGTHS[version]
+    size = os.path.getsize(file_path)
+    if size % (length + 1) == 0:
+        return size // (length + 1)
+    if size % (length + 1) == length:
+        return size // (length + 1) + 1
+    return None
+
+
+def _parse_chunk(file_path, first, count, version=1):
+    """
+    Parses records first .. first + count - 1. Returns (accounts, error
+    messages), or None when the chunk is not laid out in fixed-width
+    records.
+    """
+    length = RECORD_LENGTHS[version]
+    width = length + 1
+    with open(file_path, 'rb') as file:
+        file.seek(first * width)
+        data = file.read(count * width)
+
+    complete = len(data) // width                 # records that end in a newline
+    if data[length::width] != b"\n" * complete or data.count(b"\n") != complete or b"\r" in data:
+        return None
+    try:
+        lines = data.decode().split("\n")
+    except UnicodeDecodeError:
+        return None
+    if len(data) % width == 0:
+        lines.pop()                               # after the last newline
+
+    parse = PARSERS[version]
+    accounts, errors = [], []
+    for line_num, line in enumerate(lines, first + 1):
+        account, error = parse(line, line_num)
+        if error:
+            errors.append(error)
+            continue
+        accounts.append(account)
+    return accounts, errors
+
+
+def read_accounts_parallel(file_path, workers=None, chunk_records=CHUNK_RECORDS):
+    """
+    Returns the same list of accounts as read_bank_accounts(file_path)
+    and prints the same error messages, using up to *workers* processes
+    (default: one per CPU).
+    """
+    workers = workers or os.cpu_count() or 1
+    version = record_format(file_path)
+    count = record_count(file_path, version)
+    if count is None or workers < 2 or count <= chunk_records:
+        return read_bank_accounts(file_path)
+
+    firsts = list(range(0, count, chunk_records))
+    with ProcessPoolExecutor(max_workers=min(workers, len(firsts))) as pool:
+        results = list(pool.map(_parse_chunk, [file_path] * len(firsts), firsts,
+                                [chunk_records] * len(firsts), [version] * len(firsts)))
+    if any(result is None for result in results):
+        return read_bank_accounts(file_path)
+
+    accounts = []
+    for chunk_accounts, errors in results:
+        for error in errors:
+            print(error)
+        accounts += chunk_accounts
+    return accounts
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python parallel_read.py <accounts_file> [workers]")
+        sys.exit(1)
+    loaded = read_accounts_parallel(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else None)
+    print(f"{len(loaded)} valid accounts")
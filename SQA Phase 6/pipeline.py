@@ -0,0 +1,148 @@
+"""
+Transaction Pipeline
+--------------------
+Reads and parses a transaction file on background threads while the
+caller consumes the records, so disk reads overlap with the backend's
+constraint checking instead of preceding it.
+
+    reader thread  : bulk reads of CHUNK_SIZE characters, split into lines
+                     (of each segment in turn for an append log directory)
+          |  bounded queue of (first_line_number, [line, ...])
+    parser thread  : parse_transaction() on every line of a batch
+          |  bounded queue of ([record, ...], [malformed line number, ...])
+    caller         : iterates the records in file order
+
+Batches travel in file order through single-producer queues, so records
+come out exactly as TransactionProcessor.read_records() returns them,
+stopping at the first END record. Malformed records are reported from
+the caller's thread, in order, as read_records() reports them. Both
+queues hold at most QUEUE_DEPTH batches, which bounds the memory in use
+however large the file is.
+"""
+
+import queue
+import threading
+
+from append_log import transaction_files
+from print_error import log_constraint_error
+
+CHUNK_SIZE = 1 << 20
+QUEUE_DEPTH = 8
+
+_DONE = object()
+
+
+class _Failed:
+    """Carries an exception from a worker thread to the caller."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(channel, item, stop):
+    """Blocking put that gives up once *stop* is set."""
+    while not stop.is_set():
+        try:
+            channel.put(item, timeout=0.05)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_lines(file_path, chunk_size, lines_out, stop):
+    try:
+        line_num = 1
+        for path in transaction_files(file_path):
+            tail = ""
+            with open(path) as file:
+                while not stop.is_set():
+                    chunk = file.read(chunk_size)
+                    if not chunk:
+                        break
+                    lines = (tail + chunk).split("\n")
+                    tail = lines.pop()
+                    if lines and not _put(lines_out, (line_num, lines), stop):
+                        return
+                    line_num += len(lines)
+            if tail:
+                if not _put(lines_out, (line_num, [tail]), stop):
+                    return
+                line_num += 1
+        _put(lines_out, _DONE, stop)
+    except BaseException as e:
+        _put(lines_out, _Failed(e), stop)
+
+
+def _parse_lines(parse, lines_in, records_out, stop):
+    try:
+        while True:
+            try:
+                batch = lines_in.get(timeout=0.05)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if batch is _DONE or isinstance(batch, _Failed):
+                _put(records_out, batch, stop)
+                return
+            line_num, lines = batch
+            records, malformed = [], []
+            for line_num, line in enumerate(lines, line_num):
+                record = parse(line)
+                if record is None:
+                    if line.strip():
+                        malformed.append(line_num)
+                    continue
+                if record[0] == "END":
+                    stop.set()                  # tells the reader to stop early
+                    records_out.put((records, malformed))
+                    records_out.put(_DONE)      # the caller drains until we exit
+                    return
+                records.append(record)
+            if not _put(records_out, (records, malformed), stop):
+                return
+    except BaseException as e:
+        _put(records_out, _Failed(e), stop)
+
+
+def pipelined_records(file_path, parse, chunk_size=CHUNK_SIZE, depth=QUEUE_DEPTH):
+    """
+    Yields parse(line) for every well-formed record of *file_path*, in
+    order, up to the first END record. *parse* is backend.parse_transaction.
+    An error raised while reading or parsing is re-raised here.
+    """
+    stop = threading.Event()
+    lines = queue.Queue(depth)
+    records = queue.Queue(depth)
+    workers = (
+        threading.Thread(target=_read_lines, args=(file_path, chunk_size, lines, stop),
+                         name="transaction-reader", daemon=True),
+        threading.Thread(target=_parse_lines, args=(parse, lines, records, stop),
+                         name="transaction-parser", daemon=True),
+    )
+    for worker in workers:
+        worker.start()
+
+    try:
+        while True:
+            batch = records.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, _Failed):
+                raise batch.error
+            parsed, malformed = batch
+            for line_num in malformed:
+                log_constraint_error(f"Malformed transaction on line {line_num}", "PARSE")
+            yield from parsed
+    finally:
+        # also reached when the caller stops early: unblock and retire the workers
+        stop.set()
+        for worker in workers:
+            while worker.is_alive():
+                for channel in (lines, records):
+                    try:
+                        channel.get_nowait()
+                    except queue.Empty:
+                        pass
+                worker.join(0.05)
@@ -0,0 +1,189 @@
+"""
+Session Log Pre-flight
+----------------------
+Validates every session log of a day before the backend runs, and writes
+the records that pass as the day's transaction file.
+
+Each record (other than END) is checked on its own:
+    - syntax (as parse_transaction reads it) and a known transaction code
+    - the account, and for TRN the target account, exist in the accounts file
+    - the amount is a number above 0.00 and at most 99999.99, in cents
+
+The logs are checked in parallel, one task per group of logs. The
+results are merged in log order (the order `cat session_*.txt` uses), so
+the clean stream holds exactly the records the backend would have read,
+minus the rejected ones. Records after an END are reported too, since
+the backend stops at the first END. Every problem goes into one report,
+with its file, line number and reason, instead of being printed one at a
+time while the day is applied.
+
+Balance limits are not checked here: they depend on the order of all
+records of the day, and the backend's constraint stage already checks
+them in a single pass. The backend reads the clean stream like any
+transaction file, so the apply phase does no extra work.
+
+Run with:
+    python preflight.py <log_dir | session_file ...> --accounts currentaccounts.txt
+                        --out dailytransout.atf [--report report.txt] [--workers N]
+"""
+
+import glob
+import math
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from append_log import segment_paths
+from backend import parse_transaction
+from write import MAX_BALANCE
+
+CODES = ("DEP", "WDR", "TRN", "PAY")
+LOGS_PER_TASK = 64
+
+_known = frozenset()                      # account numbers, set in each worker
+
+
+def _init_worker(known):
+    global _known
+    _known = known
+
+
+def session_logs(directory):
+    """The day's logs in *directory*: its segments when it is an append log, else session_*.txt."""
+    segments = segment_paths(directory)
+    if segments:
+        return segments
+    return sorted(glob.glob(os.path.join(directory, "session_*.txt")))
+
+
+def check_record(line, known):
+    """Returns None when the record may be applied, else the reason it may not."""
+    record = parse_transaction(line)
+    if record is None:
+        return "malformed record"
+    code, account_number, amount, target = record
+    if code == "END":
+        return None
+    if code not in CODES:
+        return f"unknown transaction code {code}"
+    if not math.isfinite(amount) or amount <= 0 or amount > MAX_BALANCE:
+        return f"amount {line.split()[2]} out of range"
+    if round(amount, 2) != amount:
+        return f"amount {line.split()[2]} has fractions of a cent"
+    for number in (account_number, target):
+        if number is not None and number not in known:
+            return f"account {number} not found"
+    return None
+
+
+def check_log(path, known=None):
+    """
+    Checks one log. Returns (records, problems): the (line_num, line) of
+    every record that passed (END included), and (line_num, line, reason)
+    for every one that did not. Blank lines are neither.
+    """
+    known = _known if known is None else known
+    records, problems = [], []
+    with open(path, 'r', encoding="utf-8", errors="replace") as file:
+        for line_num, raw in enumerate(file, 1):
+            line = raw.strip()
+            if not line:
+                continue
+            reason = check_record(line, known)
+            if reason is None:
+                records.append((line_num, line))
+            else:
+                problems.append((line_num, line, reason))
+    return records, problems
+
+
+def _check_logs(paths):
+    return [check_log(path) for path in paths]
+
+
+def check_logs(paths, known, workers=None):
+    """
+    Checks every log, in parallel when *workers* (default: one per CPU)
+    is above one. Returns (clean_lines, problems, record_count), with
+    problems as (log_path, line_num, line, reason) in log order.
+    """
+    workers = workers or os.cpu_count() or 1
+    groups = [paths[start:start + LOGS_PER_TASK] for start in range(0, len(paths), LOGS_PER_TASK)]
+    if workers < 2 or len(groups) < 2:
+        results = [check_log(path, known) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(known,)) as pool:
+            results = [result for group in pool.map(_check_logs, groups) for result in group]
+
+    clean, problems, count = [], [], 0
+    ended = False
+    for path, (records, log_problems) in zip(paths, results):
+        count += len(log_problems)
+        found = {line_num: (line, reason) for line_num, line, reason in log_problems}
+        for line_num, line in records:
+            if line.split()[0] == "END":
+                ended = True
+                continue
+            count += 1
+            if ended:
+                found[line_num] = (line, "after END; the backend stops at the first END")
+            else:
+                clean.append(line)
+        problems += [(path, line_num) + found[line_num] for line_num in sorted(found)]
+    return clean, problems, count
+
+
+def write_stream(lines, out_path):
+    """Writes the clean records, then END, replacing *out_path* atomically."""
+    directory = os.path.dirname(os.path.abspath(out_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".preflight-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', newline="\n") as file:
+            file.write("".join(line + "\n" for line in lines))
+            file.write("END\n")
+        os.replace(temp_path, out_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def report(paths, clean, problems, count):
+    """The consolidated report, as lines."""
+    lines = [f"PREFLIGHT: {len(paths)} log(s), {count} record(s), {len(clean)} passed, "
+             f"{len(problems)} rejected"]
+    for path, line_num, line, reason in problems:
+        lines.append(f"{os.path.basename(path)}:{line_num}: {reason}: {line}")
+    return lines
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    values = {"--accounts": None, "--out": None, "--report": None, "--workers": None}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg in values and args:
+            values[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+    if not positional or values["--accounts"] is None or values["--out"] is None:
+        print("Usage: python preflight.py <log_dir | session_file ...> --accounts <accounts_file> "
+              "--out <transaction_file> [--report <report_file>] [--workers N]")
+        sys.exit(1)
+
+    from read import read_bank_accounts
+    known = frozenset(acc["account_number"] for acc in read_bank_accounts(values["--accounts"]))
+    if len(positional) == 1 and os.path.isdir(positional[0]):
+        paths = session_logs(positional[0])
+    else:
+        paths = positional
+    clean, problems, count = check_logs(paths, known, int(values["--workers"]) if values["--workers"] else None)
+    write_stream(clean, values["--out"])
+
+    lines = report(paths, clean, problems, count)
+    if values["--report"]:
+        with open(values["--report"], 'w') as file:
+            file.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
+    sys.exit(2 if problems else 0)
@@ -1,77 +1,179 @@
-def read_bank_accounts(file_path):
+import os
+from itertools import chain
+
+# Record formats, told apart by their fixed length:
+#   v1  NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP TTTT TT                   45 chars
+#   v2  NNNNNNNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPPPPPP.PP TTTT TT       57 chars
+# v2 widens the account number to 10 digits and the balance to 15
+# characters (up to 999999999999.99).
+RECORD_LENGTH = 45
+RECORD_LENGTH_V2 = 57
+RECORD_LENGTHS = {1: RECORD_LENGTH, 2: RECORD_LENGTH_V2}
+
+
+def parse_account_line(clean_line, line_num):
+    """
+    Parses and validates one account record (without its newline).
+    Returns (account, None) on success, or (None, message) with the fatal
+    error message that read_bank_accounts prints for an invalid record.
+    """
+    # Validate line length
+    if len(clean_line) != RECORD_LENGTH:
+        return None, f"ERROR: Fatal error - Line {line_num}: Invalid length ({len(clean_line)} chars, expected 45)"
+
+    try:
+        # Extract fields with positional validation
+        account_number = clean_line[0:5]
+        name = clean_line[6:25]  # 20 characters
+        status = clean_line[27]
+        balance_str = clean_line[29:37]  # 8 characters
+        pin_str = clean_line[38:42]  # 4 characters
+        plan_type = clean_line[43:45]  # 2 characters (SP/NP)
+
+        # Validate account number
+        if not account_number.isdigit():
+            return None, f"ERROR: Fatal error - Line {line_num}: Account number must be 5 digits"
+
+        # Validate status
+        if status not in ('A', 'D'):
+            return None, f"ERROR: Fatal error - Line {line_num}: Invalid status '{status}'. Must be 'A' or 'D'"
+
+        # Validate balance format with explicit negative check
+        if balance_str[0] == '-':
+            return None, f"ERROR: Fatal error - Line {line_num}: Negative balance detected: {balance_str}"
+
+        if (len(balance_str) != 8 or
+            balance_str[5] != '.' or
+            not balance_str[:5].isdigit() or
+            not balance_str[6:].isdigit()):
+            return None, f"ERROR: Fatal error - Line {line_num}: Invalid balance format. Expected XXXXX.XX, got {balance_str}"
+
+        # Validate pin
+        if not pin_str.isdigit() or len(pin_str) != 4:
+            return None, f"ERROR: Fatal error - Line {line_num}: Transaction count must be 4 digits"
+
+        # Validate plan type
+        if plan_type not in ('SP', 'NP'):
+            return None, f"ERROR: Fatal error - Line {line_num}: Invalid plan type '{plan_type}'. Must be SP or NP"
+
+        # Convert values
+        balance = float(balance_str)
+
+        # Business rule validation
+        if balance < 0:
+            return None, f"ERROR: Fatal error - Line {line_num}: Negative balance detected"
+
+        return {
+            'account_number': account_number.lstrip('0') or '0',
+            'name': name.strip(),
+            'status': status,
+            'balance': balance,
+            'pin': pin_str,
+            'plan': plan_type
+        }, None
+
+    except Exception as e:
+        return None, f"ERROR: Fatal error - Line {line_num}: Unexpected error - {str(e)}"
+
+
+def parse_account_line_v2(clean_line, line_num):
+    """parse_account_line() for a v2 record."""
+    if len(clean_line) != RECORD_LENGTH_V2:
+        return None, f"ERROR: Fatal error - Line {line_num}: Invalid length ({len(clean_line)} chars, expected 57)"
+
+    try:
+        account_number = clean_line[0:10]
+        name = clean_line[11:31]
+        status = clean_line[32]
+        balance_str = clean_line[34:49]  # 15 characters
+        pin_str = clean_line[50:54]
+        plan_type = clean_line[55:57]
+
+        if not account_number.isdigit():
+            return None, f"ERROR: Fatal error - Line {line_num}: Account number must be 10 digits"
+
+        if status not in ('A', 'D'):
+            return None, f"ERROR: Fatal error - Line {line_num}: Invalid status '{status}'. Must be 'A' or 'D'"
+
+        if balance_str[0] == '-':
+            return None, f"ERROR: Fatal error - Line {line_num}: Negative balance detected: {balance_str}"
+
+        if (balance_str[12] != '.' or
+            not balance_str[:12].isdigit() or
+            not balance_str[13:].isdigit()):
+            return None, f"ERROR: Fatal error - Line {line_num}: Invalid balance format. Expected XXXXXXXXXXXX.XX, got {balance_str}"
+
+        if not pin_str.isdigit():
+            return None, f"ERROR: Fatal error - Line {line_num}: Transaction count must be 4 digits"
+
+        if plan_type not in ('SP', 'NP'):
+            return None, f"ERROR: Fatal error - Line {line_num}: Invalid plan type '{plan_type}'. Must be SP or NP"
+
+        return {
+            'account_number': account_number.lstrip('0') or '0',
+            'name': name.strip(),
+            'status': status,
+            'balance': float(balance_str),
+            'pin': pin_str,
+            'plan': plan_type
+        }, None
+
+    except Exception as e:
+        return None, f"ERROR: Fatal error - Line {line_num}: Unexpected error - {str(e)}"
+
+
+PARSERS = {1: parse_account_line, 2: parse_account_line_v2}
+
+
+def line_format(first_line):
+    """The record format (1 or 2) of a file, from its first line."""
+    return 2 if len(first_line.rstrip('\n')) == RECORD_LENGTH_V2 else 1
+
+
+def record_format(file_path):
+    """
+    The record format (1 or 2) of an accounts file. Empty and missing
+    files, and shard directories, are v1.
+    """
+    if os.path.isdir(file_path):
+        return 1
+    try:
+        with open(file_path, 'r') as file:
+            return line_format(file.readline())
+    except FileNotFoundError:
+        return 1
+
+
+def read_bank_accounts(file_path, account_numbers=None, workers=None):
     """
     Reads and validates the bank account file format with plan type (SP/NP)
     Returns list of accounts and prints fatal errors for invalid format
+
+    file_path may also be a shard directory (see shards.py); then only the
+    shards that may hold *account_numbers* are read, or all when None.
+
+    With workers > 1 a large file is parsed in chunks on that many
+    processes (see parallel_read.py), with the same result and output.
+
+    The record format (v1 or v2) is detected from the first line; every
+    line must then have that format's length.
     """
+    if os.path.isdir(file_path):
+        from shards import read_shards
+        return read_shards(file_path, account_numbers)
+    if workers is not None and workers > 1:
+        from parallel_read import read_accounts_parallel
+        return read_accounts_parallel(file_path, workers)
+
     accounts = []
     with open(file_path, 'r') as file:
-        for line_num, line in enumerate(file, 1):
-            clean_line = line.rstrip('\n')
-            # Validate line length
-            if len(clean_line) != 45:
-                print(f"ERROR: Fatal error - Line {line_num}: Invalid length ({len(clean_line)} chars, expected 45)")
-                continue
-
-            try:
-                # Extract fields with positional validation
-                account_number = clean_line[0:5]
-                name = clean_line[6:25]  # 20 characters
-                status = clean_line[27]
-                balance_str = clean_line[29:37]  # 8 characters
-                pin_str = clean_line[38:42]  # 4 characters
-                plan_type = clean_line[43:45]  # 2 characters (SP/NP)
-
-                # Validate account number
-                if not account_number.isdigit():
-                    print(f"ERROR: Fatal error - Line {line_num}: Account number must be 5 digits")
-                    continue
-
-                # Validate status
-                if status not in ('A', 'D'):
-                    print(f"ERROR: Fatal error - Line {line_num}: Invalid status '{status}'. Must be 'A' or 'D'")
-                    continue
-
-                # Validate balance format with explicit negative check
-                if balance_str[0] == '-':
-                    print(f"ERROR: Fatal error - Line {line_num}: Negative balance detected: {balance_str}")
-                    continue
-                
-                if (len(balance_str) != 8 or 
-                    balance_str[5] != '.' or 
-                    not balance_str[:5].isdigit() or 
-                    not balance_str[6:].isdigit()):
-                    print(f"ERROR: Fatal error - Line {line_num}: Invalid balance format. Expected XXXXX.XX, got {balance_str}")
-                    continue
-
-                # Validate pin
-                if not pin_str.isdigit() or len(pin_str) != 4:
-                    print(f"ERROR: Fatal error - Line {line_num}: Transaction count must be 4 digits")
-                    continue
-
-                # Validate plan type
-                if plan_type not in ('SP', 'NP'):
-                    print(f"ERROR: Fatal error - Line {line_num}: Invalid plan type '{plan_type}'. Must be SP or NP")
-                    continue
-
-                # Convert values
-                balance = float(balance_str)
-
-                # Business rule validation
-                if balance < 0:
-                    print(f"ERROR: Fatal error - Line {line_num}: Negative balance detected")
-                    continue
-
-                accounts.append({
-                    'account_number': account_number.lstrip('0') or '0',
-                    'name': name.strip(),
-                    'status': status,
-                    'balance': balance,
-                    'pin': pin_str,
-                    'plan': plan_type
-                })
-
-            except Exception as e:
-                print(f"ERROR: Fatal error - Line {line_num}: Unexpected error - {str(e)}")
+        first = file.readline()
+        parse = PARSERS[line_format(first)]
+        for line_num, line in enumerate(chain((first,), file) if first else (), 1):
+            account, error = parse(line.rstrip('\n'), line_num)
+            if error:
+                print(error)
                 continue
+            accounts.append(account)
 
-    return accounts
\ No newline at end of file
+    return accounts
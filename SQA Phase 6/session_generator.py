@@ -0,0 +1,178 @@
+"""
+Session Generator
+-----------------
+Produces synthetic ATM keystroke streams for load testing bankingapp.py.
+
+Each session is the exact stdin an ATM process would read: a login, a
+number of menu choices with their amounts / transfer targets, and an
+ending (exit, logout or end of input). What happens is drawn from a
+SessionModel; the same accounts, model and seed always give the same
+sessions. Sessions are produced lazily, so millions can be streamed to
+files or straight into BankingApp.replay_sessions().
+
+Run with:
+    python session_generator.py <accounts_file> <output_dir> [--count N]
+                                [--seed S] [--model model.json]
+
+The model file is a JSON object with any of the SessionModel attributes.
+"""
+
+import json
+import os
+import random
+import sys
+
+from read import read_bank_accounts
+
+
+class SessionModel:
+    """
+    Tunable probabilities behind generated sessions.
+
+    login_failure_rate   : share of sessions with a wrong PIN or unknown account
+    menu_mix             : menu choice -> weight; "invalid" is an out-of-range
+                           number, "garbage" a non-numeric entry (ends the session)
+    min_steps, max_steps : menu choices per logged-in session
+    min_amount, max_amount
+                         : range of valid amounts
+    invalid_amount_rate  : share of amounts that are zero, negative or not numbers
+    overdraw_rate        : share of withdrawals / transfers above the balance
+    unknown_target_rate  : share of transfers to a name that does not exist
+    ending_mix           : "exit" / "logout" / "eof" -> weight
+    """
+
+    def __init__(self, **overrides) -> None:
+        self.login_failure_rate: float = 0.05
+        self.menu_mix: dict[str, float] = {
+            "balance": 0.20, "deposit": 0.30, "withdraw": 0.30, "transfer": 0.15,
+            "invalid": 0.04, "garbage": 0.01,
+        }
+        self.min_steps: int = 1
+        self.max_steps: int = 8
+        self.min_amount: float = 1.00
+        self.max_amount: float = 500.00
+        self.invalid_amount_rate: float = 0.03
+        self.overdraw_rate: float = 0.02
+        self.unknown_target_rate: float = 0.05
+        self.ending_mix: dict[str, float] = {"exit": 0.7, "logout": 0.2, "eof": 0.1}
+
+        for name, value in overrides.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Unknown session model setting '{name}'")
+            setattr(self, name, value)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "SessionModel":
+        with open(file_path, "r", encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+
+_MENU_KEYS = {"balance": "1", "deposit": "2", "withdraw": "3", "transfer": "4"}
+_BAD_AMOUNTS = ("0", "-25.00", "abc", "")
+
+
+def generate_sessions(accounts: list[dict], model: SessionModel | None = None,
+                      seed: int = 0, count: int | None = None):
+    """
+    Yield keystroke streams (one str per session) for the given account
+    dicts, as returned by read_bank_accounts(). count=None never stops.
+    """
+    model = model or SessionModel()
+    rng = random.Random(seed)
+    usable = [acc for acc in accounts if acc["status"] == "A"]
+    if not usable:
+        raise ValueError("No active accounts to generate sessions for")
+    names = [acc["name"] for acc in accounts]
+    numbers = {acc["account_number"] for acc in accounts}
+
+    menu_choices, menu_weights = list(model.menu_mix), list(model.menu_mix.values())
+    end_choices, end_weights = list(model.ending_mix), list(model.ending_mix.values())
+
+    def amount(balance: float, may_overdraw: bool) -> str:
+        roll = rng.random()
+        if roll < model.invalid_amount_rate:
+            return rng.choice(_BAD_AMOUNTS)
+        if may_overdraw and roll < model.invalid_amount_rate + model.overdraw_rate:
+            return f"{balance + rng.uniform(0.01, model.max_amount):.2f}"
+        return f"{rng.uniform(model.min_amount, model.max_amount):.2f}"
+
+    produced = 0
+    while count is None or produced < count:
+        produced += 1
+        acc = rng.choice(usable)
+        keys = []
+
+        if rng.random() < model.login_failure_rate:
+            if rng.random() < 0.5:
+                keys += [acc["account_number"], f"{(int(acc['pin']) + rng.randint(1, 9999)) % 10000:04d}"]
+            else:
+                unknown = str(rng.randint(1, 99999))
+                while unknown in numbers:
+                    unknown = str(rng.randint(1, 99999))
+                keys += [unknown, acc["pin"]]
+            yield "\n".join(keys) + "\n"
+            continue
+
+        keys += [acc["account_number"], acc["pin"]]
+        balance = acc["balance"]
+        ended = False
+        for _ in range(rng.randint(model.min_steps, model.max_steps)):
+            choice = rng.choices(menu_choices, menu_weights)[0]
+            if choice == "garbage":
+                keys.append(rng.choice(("x", "one", "1.5", "?")))
+                ended = True
+                break
+            if choice == "invalid":
+                keys.append(str(rng.choice((0, 7, 8, 9, 42))))
+                continue
+
+            keys.append(_MENU_KEYS[choice])
+            if choice == "deposit":
+                keys.append(amount(balance, False))
+            elif choice == "withdraw":
+                keys.append(amount(balance, True))
+            elif choice == "transfer":
+                keys.append(amount(balance, True))
+                if rng.random() < model.unknown_target_rate:
+                    keys.append("Nobody Known")
+                else:
+                    keys.append(rng.choice(names))
+
+        if not ended:
+            ending = rng.choices(end_choices, end_weights)[0]
+            if ending == "exit":
+                keys.append("6")
+            elif ending == "logout":
+                keys.append("5")
+        yield "\n".join(keys) + "\n"
+
+
+def write_sessions(sessions, output_dir: str) -> int:
+    """Write each session to <output_dir>/sNNNNNNN.txt. Returns the count."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    for written, keystrokes in enumerate(sessions, 1):
+        with open(os.path.join(output_dir, f"s{written:07d}.txt"), "w", newline="\n") as f:
+            f.write(keystrokes)
+    return written
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"--count": "1000", "--seed": "0", "--model": None}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg in options and args:
+            options[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+    if len(positional) != 2:
+        print("Usage: python session_generator.py <accounts_file> <output_dir> "
+              "[--count N] [--seed S] [--model model.json]")
+        sys.exit(1)
+
+    model = SessionModel.from_file(options["--model"]) if options["--model"] else SessionModel()
+    sessions = generate_sessions(read_bank_accounts(positional[0]), model,
+                                 int(options["--seed"]), int(options["--count"]))
+    print(f"{write_sessions(sessions, positional[1])} sessions written to {positional[1]}")
@@ -0,0 +1,175 @@
+"""
+Sharded Accounts
+----------------
+Optional layout for large account sets: instead of one accounts file, a
+directory of shard files keyed by account-number prefix.
+
+    accounts/
+        manifest.json       {"version": 1, "prefix_digits": 2,
+                             "shards": {"00": 812, "01": 790, ...}}
+        shard_00.txt        accounts 00000-00999 (with prefix_digits=2)
+        shard_01.txt        accounts 01000-01999
+        ...
+
+Each shard is an ordinary fixed-width accounts file of v1 records, so
+read.py, write.py and account_index.py work on it unchanged; a v2
+accounts file cannot be split. The manifest records
+the prefix length and the number of accounts in every shard; shards not
+listed hold no accounts. read_bank_accounts() and write_new_accounts()
+accept a shard directory wherever they accept a file, and can restrict
+themselves to the shards holding a given set of accounts, so a day that
+touches few accounts reads and rewrites few shards.
+
+Run with:
+    python shards.py split <accounts_file> <shard_dir> [--digits N]
+    python shards.py join <shard_dir> <accounts_file>
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+MANIFEST = "manifest.json"
+DEFAULT_PREFIX_DIGITS = 2
+
+
+def shard_key(account_number, prefix_digits=DEFAULT_PREFIX_DIGITS):
+    """Shard of an account number, with or without its leading zeros."""
+    # shards hold v1 records, whose account numbers are 5 digits
+    return account_number.zfill(5)[:prefix_digits]
+
+
+def shard_file(directory, key):
+    return os.path.join(directory, f"shard_{key}.txt")
+
+
+def read_manifest(directory):
+    """Returns the manifest dict. Raises ValueError when it is missing or invalid."""
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r') as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        raise ValueError(f"{directory} is not a shard directory (no {MANIFEST})") from None
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid shard manifest in {directory}: {e}") from None
+    if manifest.get("version") != 1 or not 1 <= manifest.get("prefix_digits", 0) <= 5:
+        raise ValueError(f"Unsupported shard manifest in {directory}")
+    return manifest
+
+
+def _write_manifest(directory, manifest, fsync=False):
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+            file.write("\n")
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, os.path.join(directory, MANIFEST))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def touched_shards(directory, account_numbers):
+    """Keys of the existing shards that hold any of *account_numbers*."""
+    manifest = read_manifest(directory)
+    digits = manifest["prefix_digits"]
+    return sorted({shard_key(number, digits) for number in account_numbers} & manifest["shards"].keys())
+
+
+def read_shards(directory, account_numbers=None):
+    """
+    Reads the accounts of a shard directory, in shard order. With
+    *account_numbers*, only the shards that may hold those accounts are
+    read. Invalid records are reported as read_bank_accounts does, with
+    the shard file name in front.
+    """
+    from read import parse_account_line
+
+    manifest = read_manifest(directory)
+    if account_numbers is None:
+        keys = sorted(manifest["shards"])
+    else:
+        keys = touched_shards(directory, account_numbers)
+
+    accounts = []
+    for key in keys:
+        path = shard_file(directory, key)
+        with open(path, 'r') as file:
+            for line_num, line in enumerate(file, 1):
+                account, error = parse_account_line(line.rstrip('\n'), line_num)
+                if error:
+                    print(f"{os.path.basename(path)}: {error}")
+                    continue
+                accounts.append(account)
+    return accounts
+
+
+def write_shards(accounts, directory, fsync=False, prefix_digits=None):
+    """
+    Rewrites every shard that holds at least one of *accounts* with
+    exactly those accounts; other shards are left alone. Each shard is
+    replaced atomically (see write.write_new_accounts), then the manifest.
+    A new directory is created with *prefix_digits* (default 2).
+    """
+    from write import validate_account, write_new_accounts
+
+    if os.path.isfile(os.path.join(directory, MANIFEST)):
+        manifest = read_manifest(directory)
+        if prefix_digits not in (None, manifest["prefix_digits"]):
+            raise ValueError(f"{directory} is sharded by {manifest['prefix_digits']} digits, not {prefix_digits}")
+    else:
+        manifest = {"version": 1, "prefix_digits": prefix_digits or DEFAULT_PREFIX_DIGITS, "shards": {}}
+        os.makedirs(directory, exist_ok=True)
+
+    groups = {}
+    for acc in accounts:
+        validate_account(acc)
+        groups.setdefault(shard_key(acc['account_number'], manifest["prefix_digits"]), []).append(acc)
+
+    for key, shard_accounts in sorted(groups.items()):
+        write_new_accounts(shard_accounts, shard_file(directory, key), fsync)
+        manifest["shards"][key] = len(shard_accounts)
+    _write_manifest(directory, manifest, fsync)
+    return sorted(groups)
+
+
+def split_accounts(accounts_file, directory, prefix_digits=DEFAULT_PREFIX_DIGITS):
+    """Converts a single (v1) accounts file into a new shard directory."""
+    from read import read_bank_accounts, record_format
+
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        raise ValueError(f"{directory} is already a shard directory")
+    if record_format(accounts_file) != 1:
+        raise ValueError(f"{accounts_file} holds v{record_format(accounts_file)} records; shards hold v1 records only")
+    return write_shards(read_bank_accounts(accounts_file), directory, prefix_digits=prefix_digits)
+
+
+def join_shards(directory, accounts_file):
+    """Converts a shard directory back into a single accounts file (in shard order)."""
+    from write import write_new_accounts
+
+    accounts = read_shards(directory)
+    write_new_accounts(accounts, accounts_file)
+    return len(accounts)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    digits = DEFAULT_PREFIX_DIGITS
+    if len(args) == 5 and args[0] == "split" and args[3] == "--digits":
+        digits = int(args[4])
+        args = args[:3]
+    if len(args) != 3 or args[0] not in ("split", "join"):
+        print("Usage: python shards.py split <accounts_file> <shard_dir> [--digits N]\n"
+              "       python shards.py join <shard_dir> <accounts_file>")
+        sys.exit(1)
+
+    if args[0] == "split":
+        keys = split_accounts(args[1], args[2], digits)
+        print(f"{len(keys)} shards written to {args[2]}")
+    else:
+        print(f"{join_shards(args[1], args[2])} accounts written to {args[2]}")
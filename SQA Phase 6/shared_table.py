@@ -0,0 +1,281 @@
+"""
+Shared Account Table
+--------------------
+Publishes the parsed accounts file into one shared memory segment that
+every ATM process on the machine attaches to, instead of each process
+parsing the file itself. However many ATMs attach, the table exists once.
+
+Segment layout (all integers native uint32):
+
+    header        magic "ACT1", record count, hash slots, record format
+    records       count * 46 bytes (58 for v2): the accounts file records,
+                  as written in the format of the file they came from
+    number index  slots entries: record number + 1 (0 = empty),
+                  open addressing on the account number
+    name index    slots entries: the same, keyed on the upper-cased name
+                  (the last account with a name wins, as in BankingApp)
+
+A lookup probes the index and parses just the one record it finds, in
+place in the segment.
+
+Every publish creates a new segment and then atomically replaces a small
+pointer file (<accounts_file>.shm by default) that holds the segment's
+name. After that the previous segment is unlinked. Processes that are
+already attached keep their mapping. Processes that attach later read
+the pointer and get the new table, so nobody ever sees a half-written
+table. Segments are not registered with multiprocessing's resource
+tracker. If they were, the tracker would unlink the table when the
+publishing process (the backend) or an ATM exits.
+
+Python cannot map shared memory read-only; SharedAccountTable only ever
+reads from it.
+
+Run with:
+    python shared_table.py publish <accounts_file> [pointer_file]
+    python shared_table.py lookup <pointer_file> <account>
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import _posixshmem
+except ImportError:                       # Windows
+    _posixshmem = None
+
+from read import PARSERS, RECORD_LENGTHS, read_bank_accounts, record_format
+from write import ACCOUNT_DIGITS, FORMATTERS
+
+MAGIC = b"ACT1"
+HEADER = struct.Struct("=4sIII")
+NAME_FIELDS = {1: slice(6, 26), 2: slice(11, 31)}
+
+
+def _slot_count(count):
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    return slots
+
+
+def _number_hash(number, mask):
+    return (number * 2654435761) & mask
+
+
+def _name_hash(name, mask):
+    return zlib.crc32(name) & mask
+
+
+def _open_segment(name=None, size=0):
+    """Creates or attaches a segment that the resource tracker will not unlink."""
+    try:
+        segment = shared_memory.SharedMemory(name, create=name is None, size=size, track=False)
+    except TypeError:                     # Python < 3.13 has no track=
+        segment = shared_memory.SharedMemory(name, create=name is None, size=size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _unlink_segment(name):
+    if _posixshmem is None:               # Windows: freed with its last handle
+        return
+    try:
+        _posixshmem.shm_unlink("/" + name)
+    except FileNotFoundError:
+        pass
+
+
+def _build(accounts, version=1):
+    """Returns the bytes of the table for a list of account dicts, as records of format *version*."""
+    format_record = FORMATTERS[version]
+    records, positions, names = [], {}, {}
+    for acc in accounts:
+        if acc["account_number"] in positions:
+            continue                      # first record wins, like AccountIndex
+        positions[acc["account_number"]] = len(records)
+        names[acc["name"].upper().encode()] = len(records)
+        records.append(format_record(acc))
+
+    slots = _slot_count(len(records))
+    mask = slots - 1
+    number_index = [0] * slots
+    for number, position in positions.items():
+        slot = _number_hash(int(number), mask)
+        while number_index[slot]:
+            slot = (slot + 1) & mask
+        number_index[slot] = position + 1
+    name_index = [0] * slots
+    for name, position in names.items():
+        slot = _name_hash(name, mask)
+        while name_index[slot]:
+            slot = (slot + 1) & mask
+        name_index[slot] = position + 1
+
+    data = "".join(records).encode()
+    data += b"\0" * (-len(data) % 4)      # keep the indexes 4-byte aligned
+    return b"".join((HEADER.pack(MAGIC, len(records), slots, version), data,
+                     struct.pack(f"={slots}I", *number_index),
+                     struct.pack(f"={slots}I", *name_index)))
+
+
+def publish(accounts, pointer_path, version=1):
+    """
+    Publishes *accounts* (dicts as from read_bank_accounts) as a new
+    table of format *version* records, points *pointer_path* at it and
+    unlinks the table it replaced. Returns the new segment name.
+    """
+    data = _build(accounts, version)
+    segment = _open_segment(size=len(data))
+    segment.buf[:len(data)] = data
+    name = segment.name
+    segment.close()
+
+    try:
+        with open(pointer_path, 'r') as file:
+            previous = file.read().strip()
+    except FileNotFoundError:
+        previous = None
+
+    directory = os.path.dirname(os.path.abspath(pointer_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".shm-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as file:
+            file.write(name + "\n")
+        os.replace(temp_path, pointer_path)
+    except BaseException:
+        os.unlink(temp_path)
+        _unlink_segment(name)
+        raise
+
+    if previous and previous != name:
+        _unlink_segment(previous)
+    return name
+
+
+def publish_file(accounts_file, pointer_path=None):
+    """Publishes the accounts in *accounts_file* (default pointer: <accounts_file>.shm)."""
+    return publish(read_bank_accounts(accounts_file), pointer_path or accounts_file + ".shm",
+                   record_format(accounts_file))
+
+
+def unpublish(pointer_path):
+    """Removes the pointer file and unlinks the table it names."""
+    try:
+        with open(pointer_path, 'r') as file:
+            name = file.read().strip()
+    except FileNotFoundError:
+        return
+    os.unlink(pointer_path)
+    _unlink_segment(name)
+
+
+class SharedAccountTable:
+    """
+    An attached table. lookup() / iter_accounts() / find_by_name() match
+    AccountIndex and AccountServiceClient, so BankingApp can use it as
+    its account source.
+    """
+
+    def __init__(self, pointer_path, attempts=5):
+        for attempt in range(attempts):
+            with open(pointer_path, 'r') as file:
+                name = file.read().strip()
+            try:
+                self._segment = _open_segment(name)
+                break
+            except FileNotFoundError:     # republished between the read and the attach
+                if attempt == attempts - 1:
+                    raise
+        self.name = name
+        # no memoryviews are kept on the segment, so it can be closed (or
+        # collected at exit) at any time
+        self._buf = self._segment.buf
+        magic, self._count, self._slots, version = HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version not in (0, *RECORD_LENGTHS):
+            self.close()
+            raise ValueError(f"{name} is not an account table")
+        version = version or 1
+        self._record_length = RECORD_LENGTHS[version]
+        self._record_width = self._record_length + 1
+        self._key_digits = ACCOUNT_DIGITS[version]
+        self._name_field = NAME_FIELDS[version]
+        self._parse = PARSERS[version]
+        self._numbers = HEADER.size + self._count * self._record_width
+        self._numbers += -self._numbers % 4
+        self._names = self._numbers + 4 * self._slots
+        self._entry = struct.Struct("=I").unpack_from
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._buf = None
+        self._segment.close()
+
+    def _record(self, position):
+        start = HEADER.size + position * self._record_width
+        return self._buf[start:start + self._record_length].tobytes()
+
+    def _probe(self, index, slot, matches):
+        """Follows the probe sequence from *slot*; returns the matching record or None."""
+        mask = self._slots - 1
+        while True:
+            entry, = self._entry(self._buf, index + 4 * slot)
+            if not entry:
+                return None
+            record = self._record(entry - 1)
+            if matches(record):
+                return record
+            slot = (slot + 1) & mask
+
+    def lookup(self, account_number):
+        """Return the account record as a dict, or None."""
+        account_number = account_number.lstrip('0') or '0'
+        digits = self._key_digits
+        if len(account_number) > digits or not account_number.isdigit():
+            return None
+        key = account_number.zfill(digits).encode()
+        record = self._probe(self._numbers, _number_hash(int(account_number), self._slots - 1),
+                             lambda record: record[:digits] == key)
+        if record is None:
+            return None
+        account, _ = self._parse(record.decode(), 0)
+        return account
+
+    def find_by_name(self, name):
+        """Number of the last account whose upper-cased name equals *name*, or None."""
+        key = name.encode()
+        record = self._probe(self._names, _name_hash(key, self._slots - 1),
+                             lambda record: record[self._name_field].rstrip().upper() == key)
+        if record is None:
+            return None
+        return record[:self._key_digits].decode().lstrip('0') or '0'
+
+    def iter_accounts(self):
+        """Yield every record in table order."""
+        for position in range(self._count):
+            account, _ = self._parse(self._record(position).decode(), position + 1)
+            if account is not None:
+                yield account
+
+
+if __name__ == "__main__":
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "publish":
+        print(publish_file(*sys.argv[2:]))
+    elif len(sys.argv) == 4 and sys.argv[1] == "lookup":
+        with SharedAccountTable(sys.argv[2]) as table:
+            print(table.lookup(sys.argv[3]))
+    else:
+        print("Usage: python shared_table.py publish <accounts_file> [pointer_file]\n"
+              "       python shared_table.py lookup <pointer_file> <account>")
+        sys.exit(1)
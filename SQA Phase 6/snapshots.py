@@ -0,0 +1,192 @@
+"""
+Master Account Snapshots
+------------------------
+Keeps the history of the master accounts file as periodic full base
+snapshots plus a small delta per day in between.
+
+    snapshots/
+        day_000001.base     every record, as in the accounts file
+        day_000002.delta    only the records that changed since day 1
+        day_000003.delta    ... since day 2
+        ...
+        day_000008.base     a new base every BASE_EVERY days
+
+A delta holds the full record of every account that was added or
+changed that day, and "-NNNNN" for an account that was removed. Records
+are kept in the record format (v1 or v2, see read.py) they were recorded
+in, so a history may span a conversion; a rebuilt file takes the widest
+format of its records.
+The master file as of any recorded day is rebuilt from the nearest base
+at or before it plus the deltas after that base, so disk use grows with
+the daily churn and a rebuild reads at most one base and BASE_EVERY - 1
+deltas. Every file is written to a temp file and renamed into place.
+
+Run with:
+    python snapshots.py record <snapshot_dir> <accounts_file> [--base-every N]
+    python snapshots.py rebuild <snapshot_dir> <day> <output_file>
+    python snapshots.py list <snapshot_dir>
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+from read import PARSERS, line_format
+from write import ACCOUNT_DIGITS, FORMATTERS, validate_account, write_new_accounts
+
+BASE_EVERY = 7
+
+_FILE_PATTERN = re.compile(r"day_(\d{6})\.(base|delta)$")
+
+
+def _key(account_number):
+    """State key of an account: its number without the zero padding of either format."""
+    return account_number.lstrip('0') or '0'
+
+
+class SnapshotStore:
+    """Per-day delta snapshots of the master accounts in one directory."""
+
+    def __init__(self, directory, base_every=BASE_EVERY):
+        if base_every < 1:
+            raise ValueError("base_every must be at least 1")
+        self.directory = directory
+        self.base_every = base_every
+        os.makedirs(directory, exist_ok=True)
+        self._latest = None           # (day, state) of the last record() call
+
+    def days(self):
+        """Returns {day: "base" | "delta"} for every recorded day."""
+        found = {}
+        for name in os.listdir(self.directory):
+            match = _FILE_PATTERN.match(name)
+            if match:
+                found[int(match.group(1))] = match.group(2)
+        return dict(sorted(found.items()))
+
+    def _path(self, day, kind):
+        return os.path.join(self.directory, f"day_{day:06d}.{kind}")
+
+    def state(self, day):
+        """
+        Returns {account number: record line} as of *day*, in file order.
+        Raises ValueError for a day that was not recorded.
+        """
+        days = self.days()
+        if day not in days:
+            raise ValueError(f"No snapshot for day {day}")
+        base_day = max(d for d, kind in days.items() if kind == "base" and d <= day)
+
+        state = {}
+        with open(self._path(base_day, "base"), 'r') as file:
+            for line in file:
+                state[_key(line.split(" ", 1)[0])] = line
+        for delta_day in (d for d in days if base_day < d <= day):
+            with open(self._path(delta_day, "delta"), 'r') as file:
+                for line in file:
+                    if line.startswith("-"):
+                        state.pop(_key(line[1:].strip()), None)
+                    else:
+                        state[_key(line.split(" ", 1)[0])] = line
+        return state
+
+    def accounts(self, day):
+        """Account dicts of the master file as of *day*."""
+        accounts = []
+        for line_num, line in enumerate(self.state(day).values(), 1):
+            account, error = PARSERS[line_format(line)](line.rstrip('\n'), line_num)
+            if error:
+                raise ValueError(f"Day {day} snapshot: {error}")
+            accounts.append(account)
+        return accounts
+
+    def rebuild(self, day, file_path):
+        """Writes the master accounts file as of *day* to *file_path*."""
+        version = max(map(line_format, self.state(day).values()), default=1)
+        write_new_accounts(self.accounts(day), file_path, version=version)
+
+    def record(self, accounts, day=None, complete=True, version=1):
+        """
+        Records the accounts as the state of *day* (default: the day after
+        the last one recorded). With complete=False the accounts are only
+        part of the master file (e.g. the shards a day touched): accounts
+        missing from them are kept, not recorded as removed. The first
+        day is a base, so it must be complete. The records are written in
+        record format *version*. Returns the kind of file written, "base"
+        or "delta".
+        """
+        days = self.days()
+        last_day = max(days, default=None)
+        if last_day is None and not complete:
+            raise ValueError("The first recorded day needs every account (complete=True)")
+        if day is None:
+            day = 1 if last_day is None else last_day + 1
+        elif last_day is not None and day <= last_day:
+            raise ValueError(f"Day {day} is not after the last recorded day {last_day}")
+
+        format_record = FORMATTERS[version]
+        lines = {}
+        for acc in accounts:
+            validate_account(acc, version)
+            lines[_key(acc['account_number'])] = format_record(acc)
+
+        if last_day is None:
+            previous = {}
+        elif self._latest is not None and self._latest[0] == last_day:
+            previous = self._latest[1]
+        else:
+            previous = self.state(last_day)
+
+        changed = [line for key, line in lines.items() if previous.get(key) != line]
+        removed = [key for key in previous if key not in lines] if complete else []
+        state = dict(previous)
+        state.update(lines)
+        for key in removed:
+            del state[key]
+
+        last_base = max((d for d, kind in days.items() if kind == "base"), default=None)
+        if last_base is None or day - last_base >= self.base_every:
+            kind, data = "base", "".join(state.values())
+        else:
+            digits = ACCOUNT_DIGITS[version]
+            kind, data = "delta", "".join(changed) + "".join(f"-{key.zfill(digits)}\n" for key in removed)
+        self._write(self._path(day, kind), data)
+        self._latest = (day, state)
+        return kind
+
+    def _write(self, file_path, data):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".snapshot-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', newline='\n') as file:
+                file.write(data)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    base_every = BASE_EVERY
+    if "--base-every" in args[:-1]:
+        at = args.index("--base-every")
+        base_every = int(args.pop(at + 1))
+        del args[at]
+
+    if len(args) == 3 and args[0] == "record":
+        from read import read_bank_accounts, record_format
+        store = SnapshotStore(args[1], base_every)
+        kind = store.record(read_bank_accounts(args[2]), version=record_format(args[2]))
+        print(f"Day {max(store.days())} recorded ({kind})")
+    elif len(args) == 4 and args[0] == "rebuild":
+        SnapshotStore(args[1]).rebuild(int(args[2]), args[3])
+        print(f"Day {args[2]} written to {args[3]}")
+    elif len(args) == 2 and args[0] == "list":
+        for day, kind in SnapshotStore(args[1]).days().items():
+            print(f"{day:6d} {kind}")
+    else:
+        print("Usage: python snapshots.py record <snapshot_dir> <accounts_file> [--base-every N]\n"
+              "       python snapshots.py rebuild <snapshot_dir> <day> <output_file>\n"
+              "       python snapshots.py list <snapshot_dir>")
+        sys.exit(1)
@@ -0,0 +1,243 @@
+"""
+SQLite Account Store
+--------------------
+An optional storage backend for the accounts and the applied
+transactions, on the standard library's sqlite3, in place of the
+fixed-width text files:
+
+    accounts      number (primary key), name, status, balance, pin, plan
+                  indexed on upper(name) for name lookups
+    transactions  id, day, code, account, amount, target
+                  indexed on account and (transfers only) on target
+    days          day, first_id, last_id: the transactions of each day
+
+The database runs in WAL mode, so ATMs reading accounts are never
+blocked by the backend writing a day. The backend saves a day with
+save_day(): the changed balances and the day's records are written by
+two prepared executemany() statements inside one transaction.
+
+Most of a day's cost is keeping the account index of the transactions
+table up to date, so the connection gets a 64 MiB page cache and the day
+is recorded in the small days table rather than in an index on day.
+
+AccountStore has lookup() / iter_accounts() / find_by_name(), so
+BankingApp can use it as its account source. It holds v1 accounts (5
+digit numbers, balances up to 99999.99); a v2 accounts file cannot be
+imported.
+
+Run with:
+    python sqlite_store.py import-accounts <db> <accounts_file>
+    python sqlite_store.py export-accounts <db> <accounts_file>
+    python sqlite_store.py import-transactions <db> <transaction_file>
+    python sqlite_store.py export-transactions <db> <transaction_file> [day]
+"""
+
+import os
+import sqlite3
+import sys
+
+from read import read_bank_accounts, record_format
+from write import validate_account, write_new_accounts
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    number  INTEGER PRIMARY KEY,
+    name    TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    balance REAL NOT NULL,
+    pin     TEXT NOT NULL,
+    plan    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS accounts_name ON accounts (upper(name));
+CREATE TABLE IF NOT EXISTS transactions (
+    id      INTEGER PRIMARY KEY,
+    day     INTEGER NOT NULL,
+    code    TEXT NOT NULL,
+    account INTEGER NOT NULL,
+    amount  REAL NOT NULL,
+    target  INTEGER
+);
+CREATE INDEX IF NOT EXISTS transactions_account ON transactions (account);
+CREATE INDEX IF NOT EXISTS transactions_target ON transactions (target) WHERE target IS NOT NULL;
+CREATE TABLE IF NOT EXISTS days (
+    day      INTEGER PRIMARY KEY,
+    first_id INTEGER NOT NULL,
+    last_id  INTEGER NOT NULL
+);
+"""
+
+UPSERT_ACCOUNT = ("INSERT INTO accounts (number, name, status, balance, pin, plan) VALUES (?, ?, ?, ?, ?, ?) "
+                  "ON CONFLICT (number) DO UPDATE SET name = excluded.name, status = excluded.status, "
+                  "balance = excluded.balance, pin = excluded.pin, plan = excluded.plan")
+INSERT_TRANSACTION = "INSERT INTO transactions (day, code, account, amount, target) VALUES (?, ?, ?, ?, ?)"
+COLUMNS = "number, name, status, balance, pin, plan"
+CACHE_KIB = 64 * 1024
+
+SQLITE_MAX_PARAMS = 900                   # below every build's host parameter limit
+
+
+def _account(row):
+    number, name, status, balance, pin, plan = row
+    return {'account_number': str(number), 'name': name, 'status': status,
+            'balance': balance, 'pin': pin, 'plan': plan}
+
+
+def _account_row(acc):
+    return (int(acc['account_number']), acc['name'], acc['status'], round(acc['balance'], 2),
+            acc['pin'], acc.get('plan', 'NP'))
+
+
+class AccountStore:
+    """One SQLite database of accounts and applied transactions."""
+
+    def __init__(self, path, create=False):
+        if not create and not os.path.exists(path):
+            raise FileNotFoundError(f"No such account store: '{path}'")
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")   # WAL stays consistent; a crash may lose the last day
+        self._db.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── reading ───────────────────────────────────────────────────────── #
+    def read_accounts(self, account_numbers=None):
+        """
+        Returns account dicts in account number order, as read_bank_accounts
+        would: all of them, or only those in *account_numbers*.
+        """
+        if account_numbers is None:
+            return [_account(row) for row in self._db.execute(f"SELECT {COLUMNS} FROM accounts ORDER BY number")]
+        numbers = sorted(int(number) for number in account_numbers if number.isdigit())
+        accounts = []
+        for start in range(0, len(numbers), SQLITE_MAX_PARAMS):
+            chunk = numbers[start:start + SQLITE_MAX_PARAMS]
+            query = f"SELECT {COLUMNS} FROM accounts WHERE number IN ({','.join('?' * len(chunk))}) ORDER BY number"
+            accounts += [_account(row) for row in self._db.execute(query, chunk)]
+        return accounts
+
+    def lookup(self, account_number):
+        """Return the account record as a dict, or None."""
+        account_number = account_number.lstrip('0') or '0'
+        if not account_number.isdigit():
+            return None
+        row = self._db.execute(f"SELECT {COLUMNS} FROM accounts WHERE number = ?", (int(account_number),)).fetchone()
+        return None if row is None else _account(row)
+
+    def find_by_name(self, name):
+        """Number of the last account whose upper-cased name equals *name*, or None."""
+        row = self._db.execute("SELECT max(number) FROM accounts WHERE upper(name) = ?", (name,)).fetchone()
+        return None if row[0] is None else str(row[0])
+
+    def iter_accounts(self):
+        for row in self._db.execute(f"SELECT {COLUMNS} FROM accounts ORDER BY number"):
+            yield _account(row)
+
+    def history(self, account_number):
+        """Returns (day, code, account, amount, target) for every record naming the account."""
+        number = int(account_number)
+        return self._db.execute("SELECT day, code, account, amount, target FROM transactions WHERE id IN "
+                                "(SELECT id FROM transactions WHERE account = ? "
+                                "UNION SELECT id FROM transactions WHERE target = ? AND target IS NOT NULL) "
+                                "ORDER BY id",
+                                (number, number)).fetchall()
+
+    def last_day(self):
+        return self._db.execute("SELECT coalesce(max(day), 0) FROM days").fetchone()[0]
+
+    # ── writing ───────────────────────────────────────────────────────── #
+    def write_accounts(self, accounts):
+        """
+        Inserts or updates *accounts* in one transaction. Every account is
+        validated first, so a ValueError leaves the store untouched.
+        """
+        for acc in accounts:
+            validate_account(acc)
+        with self._db:
+            self._db.executemany(UPSERT_ACCOUNT, map(_account_row, accounts))
+
+    def add_transactions(self, records):
+        """Appends parsed records (code, account, amount, target) as the next day. Returns the day number."""
+        return self.save_day([], records)
+
+    def save_day(self, accounts, records):
+        """
+        Saves the (changed) accounts of a processed day and its applied
+        records as the next day, all in one transaction. Returns the day
+        number.
+        """
+        for acc in accounts:
+            validate_account(acc)
+        day = self.last_day() + 1
+        with self._db:
+            self._db.executemany(UPSERT_ACCOUNT, map(_account_row, accounts))
+            first_id = self._db.execute("SELECT coalesce(max(id), 0) + 1 FROM transactions").fetchone()[0]
+            self._db.executemany(INSERT_TRANSACTION, (
+                (day, code, int(account), amount, None if target is None else int(target))
+                for code, account, amount, target in records if code != "END"))
+            last_id = self._db.execute("SELECT coalesce(max(id), 0) FROM transactions").fetchone()[0]
+            self._db.execute("INSERT INTO days (day, first_id, last_id) VALUES (?, ?, ?)", (day, first_id, last_id))
+        return day
+
+    # ── text formats ──────────────────────────────────────────────────── #
+    def import_accounts(self, accounts_file):
+        version = record_format(accounts_file)
+        if version != 1:
+            raise ValueError(f"{accounts_file} holds v{version} records; the store holds v1 accounts only")
+        accounts = read_bank_accounts(accounts_file)
+        self.write_accounts(accounts)
+        return len(accounts)
+
+    def export_accounts(self, accounts_file):
+        accounts = self.read_accounts()
+        write_new_accounts(accounts, accounts_file)
+        return len(accounts)
+
+    def import_transactions(self, trans_file):
+        """Imports a transaction file (up to END) as the next day. Returns the day number."""
+        from backend import TransactionProcessor
+        return self.add_transactions(TransactionProcessor(None).read_records(trans_file))
+
+    def export_transactions(self, trans_file, day=None):
+        """Writes the records of one day (default: the last) in the front end's format, then END."""
+        day = self.last_day() if day is None else day
+        with open(trans_file, 'w') as file:
+            for code, account, amount, target in self._db.execute(
+                    "SELECT code, account, amount, target FROM transactions WHERE id BETWEEN "
+                    "(SELECT first_id FROM days WHERE day = ?) AND (SELECT last_id FROM days WHERE day = ?) "
+                    "ORDER BY id", (day, day)):
+                target = "" if target is None else f" {target}"
+                file.write(f"{code} {account} {amount:.2f}{target}\n")
+            file.write("END\n")
+        return day
+
+
+if __name__ == "__main__":
+    commands = {"import-accounts": (4,), "export-accounts": (4,),
+                "import-transactions": (4,), "export-transactions": (4, 5)}
+    if len(sys.argv) < 2 or len(sys.argv) not in commands.get(sys.argv[1], ()):
+        print("Usage: python sqlite_store.py import-accounts <db> <accounts_file>\n"
+              "       python sqlite_store.py export-accounts <db> <accounts_file>\n"
+              "       python sqlite_store.py import-transactions <db> <transaction_file>\n"
+              "       python sqlite_store.py export-transactions <db> <transaction_file> [day]")
+        sys.exit(1)
+    command, path, text_file = sys.argv[1:4]
+    with AccountStore(path, create=command.startswith("import")) as store:
+        if command == "import-accounts":
+            print(f"{store.import_accounts(text_file)} accounts imported")
+        elif command == "export-accounts":
+            print(f"{store.export_accounts(text_file)} accounts exported")
+        elif command == "import-transactions":
+            print(f"Imported as day {store.import_transactions(text_file)}")
+        else:
+            day = int(sys.argv[4]) if len(sys.argv) == 5 else None
+            print(f"Exported day {store.export_transactions(text_file, day)}")
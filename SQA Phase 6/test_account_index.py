@@ -0,0 +1,158 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from account_index import AccountIndex, build_index
+from backend import AccountManager
+import bankingapp
+from bankingapp import BankingApp
+
+LINES = [
+    "01234 John Doe             A 10000.00 4321 NP",
+    "02345 Sarah Smith          A 01240.00 5687 SP",
+    "19276 Mark Anderson        A 23160.00 3333 NP",
+    "83413 Jerry Mickelson      A 07055.00 5190 NP",
+    "83414 Michelle Mickelson   A 05800.00 2222 SP",
+]
+
+
+class IndexTestCase(unittest.TestCase):
+
+    def create_temp_file(self, lines):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False, newline="\n", suffix=".txt")
+        temp.write("\n".join(lines) + "\n")
+        temp.close()
+        self.addCleanup(self._remove, temp.name)
+        return temp.name
+
+    @staticmethod
+    def _remove(path):
+        for p in (path, path + ".idx"):
+            if os.path.exists(p):
+                os.remove(p)
+
+
+class TestAccountIndexLookup(IndexTestCase):
+    """
+    Binary search over a sorted fixed-width accounts file.
+    """
+
+    def setUp(self):
+        self.index = AccountIndex(self.create_temp_file(LINES), is_sorted=True)
+        self.addCleanup(self.index.close)
+
+    def test_every_account_is_found(self):
+        for line in LINES:
+            acc = self.index.lookup(line[:5])
+            self.assertEqual(acc["account_number"], line[:5].lstrip("0"))
+
+    def test_lookup_matches_read_bank_accounts_shape(self):
+        self.assertEqual(self.index.lookup("83413"), {
+            "account_number": "83413",
+            "name": "Jerry Mickelson",
+            "status": "A",
+            "balance": 7055.00,
+            "pin": "5190",
+            "plan": "NP"
+        })
+
+    def test_missing_and_malformed_numbers(self):
+        self.assertIsNone(self.index.lookup("50000"))
+        self.assertIsNone(self.index.lookup("123456"))
+        self.assertIsNone(self.index.lookup("12a45"))
+
+    def test_lookup_returns_copies(self):
+        self.index.lookup("1234")["balance"] = 0
+        self.assertEqual(self.index.lookup("1234")["balance"], 10000.00)
+
+    def test_cache_is_bounded(self):
+        index = AccountIndex(self.index.file_path, cache_size=2, is_sorted=True)
+        self.addCleanup(index.close)
+        for line in LINES:
+            index.lookup(line[:5])
+        self.assertEqual(list(index._cache), ["83413", "83414"])
+
+
+class TestAccountIndexSidecar(IndexTestCase):
+    """
+    Unsorted files are searched through the sidecar index.
+    """
+
+    def test_unsorted_file_with_sidecar(self):
+        path = self.create_temp_file(list(reversed(LINES)))
+        build_index(path)
+        with AccountIndex(path) as index:
+            for line in LINES:
+                self.assertEqual(index.lookup(line[:5])["name"], line[6:26].strip())
+
+    def test_missing_sidecar_is_built(self):
+        path = self.create_temp_file(list(reversed(LINES)))
+        with AccountIndex(path) as index:
+            self.assertEqual(index.lookup("2345")["name"], "Sarah Smith")
+        self.assertTrue(os.path.exists(path + ".idx"))
+
+    def test_stale_sidecar_is_rebuilt(self):
+        path = self.create_temp_file(list(reversed(LINES)))
+        build_index(path)
+        with open(path, "w", newline="\n") as f:
+            f.write("\n".join(LINES[:2]) + "\n")
+        os.utime(path, ns=(os.stat(path + ".idx").st_mtime_ns + 1,) * 2)
+        with AccountIndex(path) as index:
+            self.assertEqual(len(index), 2)
+            self.assertIsNone(index.lookup("83413"))
+            self.assertEqual(index.lookup("1234")["name"], "John Doe")
+
+
+class TestIndexedCallers(IndexTestCase):
+    """
+    BankingApp and AccountManager fetch single records from the index.
+    """
+
+    def test_banking_app_login_without_full_load(self):
+        index = AccountIndex(self.create_temp_file(LINES))
+        self.addCleanup(index.close)
+        app = BankingApp(index.file_path, source=index)
+        self.assertEqual(app.accounts, {})
+
+        with mock.patch("builtins.input", side_effect=["83413", "5190"]), \
+                redirect_stdout(io.StringIO()):
+            self.assertTrue(app.login())
+            bankingapp._screen.flush()
+        self.assertEqual(list(app.accounts), ["83413"])
+        self.assertEqual(app.current_user.get_balance(), 7055.00)
+
+    def test_banking_app_transfer_target_by_name(self):
+        index = AccountIndex(self.create_temp_file(LINES))
+        self.addCleanup(index.close)
+        app = BankingApp(index.file_path, source=index)
+        self.assertEqual(app.find_account_by_name("SARAH SMITH"), "2345")
+
+    def test_find_by_name_scans_once(self):
+        index = AccountIndex(self.create_temp_file(LINES))
+        self.addCleanup(index.close)
+        self.assertEqual(index.find_by_name("SARAH SMITH"), "2345")
+        with mock.patch.object(index, "iter_accounts", side_effect=AssertionError("rescanned")):
+            self.assertEqual(index.find_by_name("JERRY MICKELSON"), "83413")
+            self.assertIsNone(index.find_by_name("NOBODY"))
+
+    def test_account_manager_fetches_on_demand(self):
+        index = AccountIndex(self.create_temp_file(LINES))
+        self.addCleanup(index.close)
+        accounts = []
+        manager = AccountManager(accounts, index=index)
+        manager.deposit("19276", 40.00)
+        self.assertEqual(len(accounts), 1)
+        self.assertEqual(manager.find_account("19276")["balance"], 23200.00)
+
+
+if __name__ == "__main__":
+    unittest.main()
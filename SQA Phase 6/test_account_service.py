@@ -0,0 +1,128 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from account_service import AccountService, AccountServiceClient
+from bankingapp import BankingApp, main
+
+ACCOUNTS = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+    "03456 John Doe             A 00200.00 1111 NP\n"
+)
+V2_ACCOUNTS = (
+    "0001234567 Big Spender          A 000000250000.00 4321 SP\n"
+    "0000002345 Sarah Smith          A 000000000500.00 5687 SP\n"
+)
+
+
+class TestAccountService(unittest.TestCase):
+    """
+    The daemon answers lookups for clients and batches waiting requests.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.accounts_file = os.path.join(self.directory, "accounts.txt")
+        with open(self.accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        self.service = AccountService(self.accounts_file)
+
+    def start(self):
+        self.service.start()
+        self.addCleanup(self.service.stop)
+        client = AccountServiceClient(self.service.socket_path)
+        self.addCleanup(client.close)
+        return client
+
+    def test_queries(self):
+        client = self.start()
+        self.assertEqual(client.lookup("01234")["balance"], 1000.00)
+        self.assertEqual(client.lookup("2345")["name"], "Sarah Smith")
+        self.assertIsNone(client.lookup("99999"))
+        self.assertEqual(client.find_by_name("JOHN DOE"), "3456")      # last match wins
+        self.assertIsNone(client.find_by_name("NOBODY"))
+        self.assertTrue(client.validate("1234", "4321"))
+        self.assertFalse(client.validate("1234", "0000"))
+        self.assertEqual(client.balance("3456"), 200.00)
+        self.assertEqual([acc["account_number"] for acc in client.iter_accounts()], ["1234", "2345", "3456"])
+        self.assertEqual(client.lookup("1234")["pin"], "4321")         # still in step after I
+
+    def test_waiting_requests_form_one_batch(self):
+        replies = {}
+
+        def ask(number):
+            replies[number] = self.service.submit(f"B {number}")
+
+        threads = [threading.Thread(target=ask, args=(number,)) for number in ("1234", "2345", "1234", "777")]
+        for thread in threads:
+            thread.start()
+        while self.service._pending.qsize() < len(threads):
+            threading.Event().wait(0.001)
+        self.assertEqual(self.service.dispatch_pending(), 4)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(replies, {"1234": "01000.00", "2345": "00500.00", "777": "-"})
+        self.assertEqual(self.service.batches, 1)
+
+    def test_reloads_changed_file(self):
+        client = self.start()
+        self.assertEqual(client.balance("1234"), 1000.00)
+        with open(self.accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS.replace("01000.00", "00999.00"))
+        os.utime(self.accounts_file, ns=(0, 0))
+        self.assertEqual(client.balance("1234"), 999.00)
+
+    def test_v2_accounts_file(self):
+        client = self.start()
+        self.assertEqual(client.lookup("1234")["balance"], 1000.00)
+        with open(self.accounts_file, "w", newline="\n") as f:
+            f.write(V2_ACCOUNTS)
+        os.utime(self.accounts_file, ns=(0, 0))
+        self.assertEqual(client.lookup("1234567")["balance"], 250000.00)
+        self.assertEqual(client.balance("0001234567"), 250000.00)
+        self.assertEqual([acc["account_number"] for acc in client.iter_accounts()], ["1234567", "2345"])
+
+        app = BankingApp(self.accounts_file, client, os.path.join(self.directory, "Transactions"))
+        status = []
+        app.replay("1234567\n4321\n1\n6\n", status)
+        self.assertEqual(status, ["LOGIN OK", "BAL 250000.00", "EXIT OK"])
+
+    def test_app_uses_service_as_source(self):
+        client = self.start()
+        history_dir = os.path.join(self.directory, "Transactions")
+        app = BankingApp(self.accounts_file, client, history_dir)
+        status = []
+        app.replay("1234\n4321\n4\n25\nSarah Smith\n6\n", status)
+        self.assertEqual(status, ["LOGIN OK", "TRN OK", "EXIT OK"])
+        self.assertEqual(set(app.accounts), {"1234"})          # the target is found by name only
+        self.assertGreaterEqual(self.service.requests, 2)
+
+    def test_app_falls_back_to_file_without_service(self):
+        history_dir = os.path.join(self.directory, "Transactions")
+        stdin = sys.stdin
+        sys.stdin = io.StringIO("1234\n4321\n1\n6\n")
+        try:
+            with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()) as err:
+                code = main(["bankingapp.py", self.accounts_file, "--service", "--headless", "--status",
+                             "--history-dir", history_dir])
+        finally:
+            sys.stdin = stdin
+        self.assertEqual(code, 0)
+        self.assertEqual(out.getvalue(), "LOGIN OK\nBAL 1000.00\nEXIT OK\n")
+        self.assertIn("not running", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from append_log import SegmentedLog
+from backend import BankingBackend, parse_transaction
+from bankingapp import BankingApp
+from pipeline import pipelined_records
+
+ACCOUNTS = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+)
+
+
+def append_many(directory, worker, count):
+    log = SegmentedLog(directory, max_segment_bytes=2048)
+    for n in range(count):
+        log.append(f"DEP {worker} {n}.00\nWDR {worker} {n}.00")
+
+
+class TestSegmentedLog(unittest.TestCase):
+    """
+    Whole records from many writers, rotated into ordered segments.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.log_dir = os.path.join(self.directory, "segments")
+
+    def test_rotation_keeps_order(self):
+        log = SegmentedLog(self.log_dir, max_segment_bytes=40)
+        for n in range(10):
+            log.append(f"DEP 1234 {n}.00")
+        self.assertGreater(len(log.segments()), 1)
+        for path in log.segments():
+            self.assertLessEqual(os.path.getsize(path), 40)
+        self.assertEqual(list(log.read_lines()), [f"DEP 1234 {n}.00" for n in range(10)])
+
+    def test_concurrent_appenders(self):
+        context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        workers = [context.Process(target=append_many, args=(self.log_dir, worker, 100))
+                   for worker in range(1, 5)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        lines = list(SegmentedLog(self.log_dir).read_lines())
+        self.assertEqual(len(lines), 800)
+        for worker in range(1, 5):
+            mine = [line for line in lines if line.split()[1] == str(worker)]
+            expected = [f"{code} {worker} {n}.00" for n in range(100) for code in ("DEP", "WDR")]
+            self.assertEqual(mine, expected)
+        for i in range(0, 800, 2):               # each append landed in one piece
+            self.assertEqual(lines[i].replace("DEP", "WDR"), lines[i + 1])
+
+    def test_app_and_backend(self):
+        accounts_file = os.path.join(self.directory, "accounts.txt")
+        with open(accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        history_dir = os.path.join(self.directory, "Transactions")
+        os.makedirs(history_dir)
+        log = SegmentedLog(self.log_dir, max_segment_bytes=30)
+        app = BankingApp(accounts_file, history_dir=history_dir, append_log=log)
+        app.replay_sessions(["1234\n4321\n2\n10\n3\n5\n6\n", "2345\n5687\n2\n1\n6\n"])
+        self.assertEqual(os.listdir(history_dir), [])
+        self.assertEqual(list(log.read_lines()), ["DEP 1234 10.00", "WDR 1234 5.00", "DEP 2345 1.00"])
+
+        with redirect_stdout(io.StringIO()):
+            records = list(pipelined_records(self.log_dir, parse_transaction, chunk_size=4))
+        self.assertEqual([record[2] for record in records], [10.0, 5.0, 1.0])
+
+        master = os.path.join(self.directory, "master.txt")
+        shutil.copy(accounts_file, master)
+        backend = BankingBackend(self.log_dir, os.path.join(self.directory, "current.txt"), master,
+                                 fee_table={})
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        with open(master) as f:
+            self.assertEqual(f.read(), "01234 John Doe             A 01005.00 4321 NP\n"
+                                       "02345 Sarah Smith          A 00501.00 5687 SP\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from write import format_account, write_new_accounts
+
+
+def make_accounts(count, balance):
+    return [
+        {"account_number": str(i), "name": f"Holder {i}", "status": "A",
+         "balance": balance, "pin": "0000", "plan": "NP"}
+        for i in range(1, count + 1)
+    ]
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """
+    write_new_accounts() replaces the destination in one step.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "currentaccounts.txt")
+
+    def test_contents_and_no_temp_files_left(self):
+        accounts = make_accounts(3, 10.00)
+        write_new_accounts(accounts, self.path, fsync=True)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "".join(format_account(acc) for acc in accounts))
+        self.assertEqual(os.listdir(self.directory.name), ["currentaccounts.txt"])
+
+    def test_existing_permissions_are_kept(self):
+        write_new_accounts(make_accounts(1, 1.00), self.path)
+        os.chmod(self.path, 0o640)
+        write_new_accounts(make_accounts(2, 1.00), self.path)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_new_file_mode_does_not_touch_umask(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        with mock.patch("os.umask", side_effect=AssertionError("umask changed")):
+            write_new_accounts(make_accounts(1, 1.00), self.path)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o666 & ~umask)
+
+    def test_failed_validation_leaves_no_temp_file(self):
+        accounts = make_accounts(2, 1.00)
+        accounts[1]["status"] = "X"
+        with self.assertRaises(ValueError):
+            write_new_accounts(accounts, self.path)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_concurrent_readers_never_see_partial_file(self):
+        versions = [make_accounts(1000, 1.00), make_accounts(1500, 2.00)]
+        expected = {"".join(format_account(acc) for acc in accounts) for accounts in versions}
+        write_new_accounts(versions[0], self.path)
+
+        stop = threading.Event()
+        bad_reads = []
+
+        def reader():
+            while not stop.is_set():
+                with open(self.path) as f:
+                    text = f.read()
+                if text not in expected:
+                    bad_reads.append(len(text))
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for t in readers:
+            t.start()
+        try:
+            for i in range(100):
+                write_new_accounts(versions[i % 2], self.path)
+        finally:
+            stop.set()
+            for t in readers:
+                t.join()
+
+        self.assertEqual(bad_reads, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
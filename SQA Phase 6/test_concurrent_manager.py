@@ -0,0 +1,113 @@
+import os
+import random
+import sys
+import threading
+import unittest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import AccountManager, ConcurrentAccountManager
+
+
+def make_accounts(count, balance=1000.00):
+    return [
+        {
+            "account_number": str(10000 + i),
+            "name": f"Holder {i}",
+            "status": "A",
+            "balance": balance,
+            "pin": "0000",
+            "plan": "NP"
+        }
+        for i in range(count)
+    ]
+
+
+class TestAccountManagerLookup(unittest.TestCase):
+    """
+    find_account() uses an index instead of scanning the list.
+    """
+
+    def test_find_existing_account(self):
+        accounts = make_accounts(3)
+        manager = AccountManager(accounts)
+        self.assertIs(manager.find_account("10001"), accounts[1])
+
+    def test_find_missing_account(self):
+        manager = AccountManager(make_accounts(3))
+        self.assertIsNone(manager.find_account("99999"))
+
+    def test_duplicate_keeps_first_record(self):
+        accounts = make_accounts(2)
+        accounts[1]["account_number"] = accounts[0]["account_number"]
+        manager = AccountManager(accounts)
+        self.assertIs(manager.find_account("10000"), accounts[0])
+
+
+class TestConcurrentAccountManagerStress(unittest.TestCase):
+    """
+    Hammers one ConcurrentAccountManager from many threads and checks that
+    no money is created or lost.
+    """
+
+    THREADS = 16
+    OPERATIONS = 2000
+
+    def _hammer(self, manager, numbers, seed):
+        rng = random.Random(seed)
+        for _ in range(self.OPERATIONS):
+            src, dst = rng.sample(numbers, 2)
+            amount = rng.randint(1, 50)
+            manager.transfer(src, dst, amount)
+            # a deposit immediately undone keeps the total unchanged while
+            # still racing with the transfers on the same stripes
+            manager.deposit(src, amount)
+            manager.pay_bill(src, amount)
+
+    def test_money_is_conserved(self):
+        accounts = make_accounts(40)
+        manager = ConcurrentAccountManager(accounts, stripes=8)
+        numbers = [acc["account_number"] for acc in accounts]
+        total_before = sum(acc["balance"] for acc in accounts)
+
+        threads = [
+            threading.Thread(target=self._hammer, args=(manager, numbers, seed))
+            for seed in range(self.THREADS)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+            self.assertFalse(t.is_alive(), "worker thread did not finish (deadlock?)")
+
+        self.assertEqual(sum(acc["balance"] for acc in accounts), total_before)
+
+    def test_opposing_transfers_do_not_deadlock(self):
+        accounts = make_accounts(2)
+        manager = ConcurrentAccountManager(accounts, stripes=2)
+        a, b = accounts[0]["account_number"], accounts[1]["account_number"]
+
+        def forward():
+            for _ in range(self.OPERATIONS):
+                manager.transfer(a, b, 1)
+
+        def backward():
+            for _ in range(self.OPERATIONS):
+                manager.transfer(b, a, 1)
+
+        threads = [threading.Thread(target=forward), threading.Thread(target=backward)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+            self.assertFalse(t.is_alive(), "opposing transfers deadlocked")
+
+        self.assertEqual(accounts[0]["balance"], 1000.00)
+        self.assertEqual(accounts[1]["balance"], 1000.00)
+
+
+if __name__ == "__main__":
+    unittest.main()
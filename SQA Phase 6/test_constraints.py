@@ -0,0 +1,168 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend, ConstraintChecker
+from fees import DEFAULT_FEE_TABLE
+from write import write_new_accounts
+
+MASTER = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 99900.00 5687 SP\n"
+)
+
+
+def make_accounts():
+    return [
+        {"account_number": "1234", "name": "John Doe", "status": "A",
+         "balance": 1000.00, "pin": "4321", "plan": "NP"},
+        {"account_number": "2345", "name": "Sarah Smith", "status": "A",
+         "balance": 99900.00, "pin": "5687", "plan": "SP"},
+    ]
+
+
+class TestConstraintChecker(unittest.TestCase):
+    """
+    One pass over the records finds balance violations before applying.
+    """
+
+    def test_running_min_and_final(self):
+        checker = ConstraintChecker(make_accounts())
+        accepted = checker.check([
+            ("WDR", "1234", 800.00, None),
+            ("DEP", "1234", 300.00, None),
+        ])
+        self.assertEqual(len(accepted), 2)
+        self.assertEqual(checker.running_min["1234"], 200.00)
+        self.assertEqual(checker.final["1234"], 500.00)
+        self.assertEqual(checker.violations, [])
+
+    def test_unknown_code_is_a_violation(self):
+        checker = ConstraintChecker(make_accounts())
+        accepted = checker.check([("XYZ", "1234", 10.00, None), ("WDR", "1234", 1000.00, None)])
+        self.assertEqual(accepted, [("WDR", "1234", 1000.00, None)])
+        self.assertEqual(checker.violations, [(1, ("XYZ", "1234", 10.00, None), "Unknown transaction code XYZ")])
+        self.assertEqual(checker.final["1234"], 0.00)
+
+        flagged = ConstraintChecker(make_accounts(), reject=False)
+        self.assertEqual(len(flagged.check([("XYZ", "1234", 10.00, None)])), 1)
+        self.assertNotIn("1234", flagged.final)
+
+    def test_overdraft_is_rejected(self):
+        checker = ConstraintChecker(make_accounts())
+        accepted = checker.check([
+            ("WDR", "1234", 600.00, None),
+            ("PAY", "1234", 600.00, None),    # would leave -200.00
+            ("WDR", "1234", 400.00, None),    # exactly empties the account
+        ])
+        self.assertEqual([r[2] for r in accepted], [600.00, 400.00])
+        self.assertEqual(checker.final["1234"], 0.00)
+        self.assertEqual([v[0] for v in checker.violations], [2])
+
+    def test_transfer_above_maximum_is_rejected(self):
+        checker = ConstraintChecker(make_accounts())
+        accepted = checker.check([("TRN", "1234", 100.00, "2345")])
+        self.assertEqual(accepted, [])
+        self.assertIn("exceed", checker.violations[0][2])
+        self.assertNotIn("1234", checker.final)
+
+    def test_unknown_account_is_rejected(self):
+        checker = ConstraintChecker(make_accounts())
+        self.assertEqual(checker.check([("DEP", "777", 1.00, None)]), [])
+        self.assertEqual(len(checker.violations), 1)
+
+    def test_flag_mode_keeps_records(self):
+        checker = ConstraintChecker(make_accounts(), reject=False)
+        accepted = checker.check([("WDR", "1234", 1500.00, None)])
+        self.assertEqual(len(accepted), 1)
+        self.assertEqual(checker.final["1234"], -500.00)
+        self.assertEqual(len(checker.violations), 1)
+
+
+class TestValidateThenCommit(unittest.TestCase):
+    """
+    Nothing is written when a balance breaks the file constraints.
+    """
+
+    def create_temp_file(self, text):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False, newline="\n")
+        temp.write(text)
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        return temp.name
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_invalid_account_leaves_file_untouched(self):
+        path = self.create_temp_file(MASTER)
+        accounts = make_accounts()
+        accounts[1]["balance"] = -1.00
+        with self.assertRaises(ValueError):
+            write_new_accounts(accounts, path)
+        self.assertEqual(self.read(path), MASTER)
+
+    def test_backend_rejects_violating_records(self):
+        master = self.create_temp_file(MASTER)
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("WDR 01234 2000.00\nDEP 02345 500.00\nDEP 01234 10.00\n")
+        backend = BankingBackend(trans, current, master, fee_table={})
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertTrue(backend.run())
+        self.assertEqual(len(backend.violations), 2)
+        self.assertIn("rejected", out.getvalue())
+        self.assertEqual(self.read(master),
+                         "01234 John Doe             A 01010.00 4321 NP\n"
+                         "02345 Sarah Smith          A 99900.00 5687 SP\n")
+
+    def test_backend_flag_mode_writes_nothing(self):
+        master = self.create_temp_file(MASTER)
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("DEP 01234 10.00\nWDR 01234 2000.00\n")
+        backend = BankingBackend(trans, current, master, reject_violations=False)
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(backend.run())
+        self.assertEqual(self.read(master), MASTER)
+        self.assertEqual(self.read(current), "")
+
+    def test_applied_balances_match_checked_balances(self):
+        master = self.create_temp_file("00001 Penny Pincher        A 00000.30 1111 NP\n")
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("WDR 00001 0.10\n" * 3 + "END\n")
+        backend = BankingBackend(trans, current, master)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        self.assertEqual(backend.violations, [])
+        self.assertEqual(self.read(master), "00001 Penny Pincher        A 00000.00 1111 NP\n")
+
+    def test_transfer_to_same_account_is_checked_as_net_zero(self):
+        master = self.create_temp_file("01234 John Doe             A 00100.00 1111 NP\n")
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("TRN 01234 100.00 01234\nWDR 01234 150.00\nEND\n")
+        backend = BankingBackend(trans, current, master)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        self.assertEqual([v[0] for v in backend.violations], [2])
+        self.assertEqual(self.read(master), "01234 John Doe             A 00100.00 1111 NP\n")
+
+    def test_fee_never_overdraws(self):
+        master = self.create_temp_file(MASTER)
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("WDR 01234 1000.00\n")
+        backend = BankingBackend(trans, current, master, fee_table=DEFAULT_FEE_TABLE)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        self.assertTrue(self.read(master).startswith("01234 John Doe             A 00000.00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend, DryRunAccountManager
+from fees import DEFAULT_FEE_TABLE
+
+MASTER = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+    "03456 Bob Lee              A 00200.00 1111 NP\n"
+)
+
+
+def make_accounts():
+    return [
+        {"account_number": "1234", "name": "John Doe", "status": "A",
+         "balance": 1000.00, "pin": "4321", "plan": "NP"},
+        {"account_number": "2345", "name": "Sarah Smith", "status": "A",
+         "balance": 500.00, "pin": "5687", "plan": "SP"},
+        {"account_number": "3456", "name": "Bob Lee", "status": "A",
+         "balance": 200.00, "pin": "1111", "plan": "NP"},
+    ]
+
+
+class TestDryRunAccountManager(unittest.TestCase):
+    """
+    Changes land in copies of the touched accounts only.
+    """
+
+    def test_copy_on_write(self):
+        accounts = make_accounts()
+        manager = DryRunAccountManager(accounts)
+        manager.transfer("1234", "2345", 100.00)
+        manager.deposit("2345", 0.00)
+        self.assertEqual(accounts, make_accounts())
+        self.assertEqual(set(manager.overlay), {"1234", "2345"})
+        self.assertEqual(manager.diff(), [("1234", 1000.00, 900.00), ("2345", 500.00, 600.00)])
+
+    def test_unchanged_balance_not_in_diff(self):
+        manager = DryRunAccountManager(make_accounts())
+        manager.deposit("3456", 0.10)
+        manager.withdraw("3456", 0.10)
+        self.assertEqual(manager.diff(), [])
+
+
+class TestBackendDryRun(unittest.TestCase):
+    """
+    A dry run reports the day's effect and writes nothing.
+    """
+
+    def create_temp_file(self, text):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False, newline="\n")
+        temp.write(text)
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        return temp.name
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_nothing_written(self):
+        master = self.create_temp_file(MASTER)
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("DEP 01234 10.00\nWDR 03456 500.00\n")
+        backend = BankingBackend(trans, current, master, dry_run=True, fee_table=DEFAULT_FEE_TABLE)
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertFalse(backend.run())
+        self.assertIn("Record 2 rejected", out.getvalue())
+        self.assertEqual(self.read(master), MASTER)
+        self.assertEqual(self.read(current), "")
+        self.assertEqual(backend.changes, [("1234", 1000.00, 1009.90)])
+        self.assertEqual(backend.accounts[0]["balance"], 1000.00)
+        self.assertEqual(backend.dry_run_report(), [
+            "DRY RUN: 1 account(s) would change, 1 violation(s), nothing written",
+            "01234   1000.00 ->   1009.90 (+9.90)",
+        ])
+
+    def test_clean_day_previews_real_run(self):
+        trans = self.create_temp_file("TRN 01234 25.00 02345\nPAY 03456 20.00\n")
+        master = self.create_temp_file(MASTER)
+        backend = BankingBackend(trans, self.create_temp_file(""), master, dry_run=True)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        preview = {number: new for number, _, new in backend.changes}
+
+        real = BankingBackend(trans, self.create_temp_file(""), master)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(real.run())
+        self.assertEqual(preview, {acc["account_number"]: acc["balance"] for acc in real.accounts})
+
+
+if __name__ == "__main__":
+    unittest.main()
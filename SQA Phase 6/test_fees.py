@@ -0,0 +1,138 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend, parse_transaction
+from fees import DEFAULT_FEE_TABLE, compute_fees, load_fee_table
+
+
+def naive_fees(records, plans, fee_table):
+    fees = {}
+    for code, account_number, _, _ in records:
+        plan = plans.get(account_number)
+        if plan is not None:
+            fee = fee_table.get(plan, {}).get(code, 0)
+            if fee:
+                fees[account_number] = round(fees.get(account_number, 0) + fee, 2)
+    return fees
+
+
+class TestParseTransaction(unittest.TestCase):
+    """
+    parse_transaction() decodes the records the front end writes.
+    """
+
+    def test_deposit(self):
+        self.assertEqual(parse_transaction("DEP 01234 525.00"), ("DEP", "1234", 525.00, None))
+
+    def test_transfer_amount_before_target(self):
+        self.assertEqual(parse_transaction("TRN 13900 400.00 01234"), ("TRN", "13900", 400.00, "1234"))
+
+    def test_end(self):
+        self.assertEqual(parse_transaction("END")[0], "END")
+
+    def test_malformed(self):
+        self.assertIsNone(parse_transaction(""))
+        self.assertIsNone(parse_transaction("DEP 1234"))
+        self.assertIsNone(parse_transaction("WDR 1234 ten"))
+
+
+class TestComputeFees(unittest.TestCase):
+    """
+    The grouped fee pass matches a record-by-record calculation.
+    """
+
+    def test_grouped_matches_naive(self):
+        plans = {"1": "SP", "2": "NP", "3": "NP"}
+        records = [
+            ("DEP", "1", 10.0, None),
+            ("WDR", "2", 5.0, None),
+            ("DEP", "1", 3.0, None),
+            ("TRN", "3", 1.0, "1"),
+            ("PAY", "9", 1.0, None),   # unknown account: no fee
+            ("WDR", "2", 5.0, None),
+        ]
+        self.assertEqual(compute_fees(records, plans, DEFAULT_FEE_TABLE),
+                         naive_fees(records, plans, DEFAULT_FEE_TABLE))
+        self.assertEqual(compute_fees(records, plans, DEFAULT_FEE_TABLE),
+                         {"1": 0.10, "2": 0.20, "3": 0.10})
+
+    def test_codes_missing_from_table_are_free(self):
+        fees = compute_fees([("DEP", "1", 1.0, None)], {"1": "SP"}, {"SP": {"WDR": 1.00}})
+        self.assertEqual(fees, {})
+
+    def test_load_fee_table(self):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False)
+        temp.write("# plan code fee\nSP DEP 0.00\n\nNP WDR 1.25\n")
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        self.assertEqual(load_fee_table(temp.name), {"SP": {"DEP": 0.00}, "NP": {"WDR": 1.25}})
+
+    def test_load_fee_table_rejects_bad_plan(self):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False)
+        temp.write("XP DEP 0.05\n")
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        with self.assertRaises(ValueError):
+            load_fee_table(temp.name)
+
+
+class TestBackendFeeStage(unittest.TestCase):
+    """
+    BankingBackend charges fees alongside the day's balance changes.
+    """
+
+    def create_temp_file(self, text):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False, newline="\n")
+        temp.write(text)
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        return temp.name
+
+    def test_run_applies_records_and_fees(self):
+        master = self.create_temp_file(
+            "01234 John Doe             A 01000.00 4321 NP\n"
+            "02345 Sarah Smith          A 00500.00 5687 SP\n"
+        )
+        current = self.create_temp_file("")
+        trans = self.create_temp_file(
+            "DEP 01234 100.00\n"
+            "TRN 02345 50.00 01234\n"
+            "END\n"
+            "DEP 01234 999.00\n"
+        )
+        backend = BankingBackend(trans, current, master, fee_table=DEFAULT_FEE_TABLE)
+        with redirect_stdout(io.StringIO()):
+            backend.run()
+
+        with open(master) as f:
+            self.assertEqual(f.read(),
+                             "01234 John Doe             A 01149.90 4321 NP\n"
+                             "02345 Sarah Smith          A 00449.95 5687 SP\n")
+
+    def test_no_fees_without_a_table(self):
+        master = self.create_temp_file(
+            "01234 John Doe             A 01000.00 4321 NP\n"
+            "02345 Sarah Smith          A 00500.00 5687 SP\n"
+        )
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("DEP 01234 100.00\nTRN 02345 50.00 01234\nEND\n")
+        with redirect_stdout(io.StringIO()):
+            BankingBackend(trans, current, master).run()
+
+        with open(master) as f:
+            self.assertEqual(f.read(),
+                             "01234 John Doe             A 01150.00 4321 NP\n"
+                             "02345 Sarah Smith          A 00450.00 5687 SP\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
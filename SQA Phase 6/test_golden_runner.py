@@ -0,0 +1,72 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PHASE3_DIR = os.path.join(os.path.dirname(CURRENT_DIR), "SQA Phase 3")
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+sys.path.insert(0, PHASE3_DIR)
+
+import run_tests
+
+ACCOUNTS = (
+    "83413 Jerry Mickelson      A 07055.00 5190 NP\n"
+    "02345 Sarah Smith          A 01240.00 5687 SP\n"
+)
+CASES = {
+    "deposit-then-exit": "83413\n5190\n2\n100.00\n6\n",
+    "invalid-login": "99999\n0000\n",
+}
+
+
+class TestRunnerAgainstPhase6(unittest.TestCase):
+    """
+    run_tests.py --app drives this phase's BankingApp and reproduces what
+    a `python bankingapp.py` launch prints and records.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.accounts_file = os.path.join(self.directory.name, "accounts.txt")
+        with open(self.accounts_file, "w") as f:
+            f.write(ACCOUNTS)
+
+    def expect(self, cases_dir, name, keystrokes):
+        """Record the expected output of one case from a real launch."""
+        history_dir = os.path.join(self.directory.name, "history_" + name)
+        result = subprocess.run(
+            [sys.executable, os.path.join(CURRENT_DIR, "bankingapp.py"), self.accounts_file,
+             "--history-dir", history_dir],
+            input=keystrokes, capture_output=True, text=True, encoding="utf-8", check=True)
+        for folder, file_name, text in (("inputs", name, keystrokes),
+                                         ("expected", name + ".eout", result.stdout)):
+            with open(os.path.join(cases_dir, folder, file_name), "w", encoding="utf-8") as f:
+                f.write(text)
+        for log in os.listdir(history_dir):
+            with open(os.path.join(history_dir, log), encoding="utf-8") as src, \
+                    open(os.path.join(cases_dir, "expected", name + ".etf"), "w", encoding="utf-8") as dst:
+                dst.write(src.read())
+
+    def test_cases_pass_in_process(self):
+        cases_dir = os.path.join(self.directory.name, "cases")
+        os.makedirs(os.path.join(cases_dir, "inputs"))
+        os.makedirs(os.path.join(cases_dir, "expected"))
+        for name, keystrokes in CASES.items():
+            self.expect(cases_dir, name, keystrokes)
+
+        with redirect_stdout(io.StringIO()) as out:
+            failed = run_tests.main(["run_tests.py", "--cases", cases_dir, "--app", CURRENT_DIR,
+                                     "--accounts", self.accounts_file, "--workers", "1"])
+        self.assertEqual(failed, 0, out.getvalue())
+        self.assertIn("2 passed, 0 failed", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import glob
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from bankingapp import BankingApp
+
+ACCOUNTS_FILE = os.path.join(CURRENT_DIR, "currentaccounts.txt")
+DAY_INPUTS = sorted(glob.glob(os.path.join(CURRENT_DIR, "tests", "day_*", "*.txt")))
+
+
+class HeadlessTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def history_dir(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def read_logs(self, directory):
+        logs = {}
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name)) as f:
+                logs[name] = f.read()
+        return logs
+
+    def run_interactive(self, keystrokes, history_dir):
+        app = BankingApp(ACCOUNTS_FILE, history_dir=history_dir)
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(keystrokes)
+        try:
+            with redirect_stdout(io.StringIO()):
+                app.run()
+        finally:
+            sys.stdin = stdin
+
+
+class TestReplayMatchesInteractive(HeadlessTestCase):
+    """
+    replay() writes the same records as run() for the same keystrokes.
+    """
+
+    def test_day_inputs(self):
+        for path in DAY_INPUTS:
+            with self.subTest(path=os.path.relpath(path, CURRENT_DIR)):
+                with open(path) as f:
+                    keystrokes = f.read()
+                name = os.path.basename(path)
+                self.run_interactive(keystrokes, self.history_dir("interactive_" + name))
+                BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir("headless_" + name)).replay(keystrokes)
+                self.assertEqual(self.read_logs(self.history_dir("interactive_" + name)),
+                                 self.read_logs(self.history_dir("headless_" + name)))
+
+
+class TestReplayStatus(HeadlessTestCase):
+    """
+    Compact status codes describe each step of a replayed session.
+    """
+
+    def test_status_codes(self):
+        keystrokes = "83413\n5190\n1\n2\n-5\n3\n99999\n4\n10\nNobody\n4\n10.50\nsarah smith\n9\n5\n83413\n0000\n"
+        app = BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir("h"))
+        status = []
+        records = app.replay(keystrokes, status)
+        self.assertEqual(status, [
+            "LOGIN OK", "BAL 7055.00", "DEP AMT", "WDR NSF", "TRN TGT", "TRN OK",
+            "MENU OPT", "LOGOUT OK", "LOGIN CRED",
+        ])
+        self.assertEqual(records, ["TRN 83413 10.50 2345"])
+
+    def test_invalid_format_ends_session(self):
+        app = BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir("h"))
+        status = []
+        app.replay("83413\n5190\nabc\n2\n50\n", status)
+        self.assertEqual(status, ["LOGIN OK", "MENU FMT"])
+
+
+class TestReplaySessions(HeadlessTestCase):
+    """
+    replay_sessions() isolates sessions like separate ATM processes.
+    """
+
+    def test_balances_reset_between_sessions(self):
+        withdraw_all = "83413\n5190\n3\n7055\n6\n"
+        app = BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir("h"))
+        status = []
+        self.assertEqual(app.replay_sessions([withdraw_all, withdraw_all], status), 2)
+        self.assertEqual(status.count("WDR OK"), 2)
+        self.assertEqual(sorted(os.listdir(self.history_dir("h"))), ["session_1.txt", "session_2.txt"])
+
+    def test_numbering_matches_separate_launches(self):
+        sessions = []
+        for path in DAY_INPUTS:
+            with open(path) as f:
+                sessions.append(f.read())
+        for keystrokes in sessions:
+            self.run_interactive(keystrokes, self.history_dir("interactive"))
+        BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir("headless")).replay_sessions(sessions)
+        self.assertEqual(self.read_logs(self.history_dir("interactive")),
+                         self.read_logs(self.history_dir("headless")))
+
+
+if __name__ == "__main__":
+    unittest.main()
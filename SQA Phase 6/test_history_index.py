@@ -0,0 +1,157 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from bankingapp import BankingApp
+import history_index
+from history_index import HistoryIndex
+
+def _run_atm(log_dir, atm, sessions):
+    """One ATM process: appends to its own logs and indexes after every write."""
+    index = HistoryIndex(log_dir)
+    for session in range(sessions):
+        path = os.path.join(log_dir, f"session_{atm}_{session}.txt")
+        for amount in range(1, 4):
+            with open(path, "a", newline="\n") as f:
+                f.write(f"DEP 1234 {atm}.{session}{amount}\n")
+            index.ingest_file(path)
+
+
+ACCOUNTS = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+)
+
+
+class HistoryIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir)
+
+    def write_log(self, name, text, mtime, mode="w"):
+        path = os.path.join(self.log_dir, name)
+        with open(path, mode, newline="\n") as f:
+            f.write(text)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def lines(self, index, account, **limits):
+        return [(name, line) for _, name, line in index.history(account, **limits)]
+
+
+class TestHistoryIndex(HistoryIndexTestCase):
+    """
+    Postings find an account's lines in time order, incrementally.
+    """
+
+    def test_time_order_and_transfer_targets(self):
+        self.write_log("session_2.txt", "WDR 1234 5.00\n", 2000)
+        self.write_log("session_1.txt", "DEP 1234 10.00\nTRN 2345 20.00 1234\nDEP 2345 1.00\n", 1000)
+        index = HistoryIndex(self.log_dir)
+        self.assertEqual(index.ingest(), 5)
+        self.assertEqual(self.lines(index, "01234"), [
+            ("session_1.txt", "DEP 1234 10.00"),
+            ("session_1.txt", "TRN 2345 20.00 1234"),
+            ("session_2.txt", "WDR 1234 5.00"),
+        ])
+        self.assertEqual(self.lines(index, "1234", since=1500), [("session_2.txt", "WDR 1234 5.00")])
+        self.assertEqual(self.lines(index, "1234", until=1500)[-1], ("session_1.txt", "TRN 2345 20.00 1234"))
+        self.assertEqual(index.history("99999"), [])
+
+    def test_incremental_ingest(self):
+        path = self.write_log("session_1.txt", "DEP 1234 10.00\nWDR 12", 1000)
+        index = HistoryIndex(self.log_dir)
+        self.assertEqual(index.ingest(), 1)
+        self.assertEqual(index.ingest(), 0)
+        self.write_log("session_1.txt", "34 3.00\n", 1100, mode="a")
+
+        reopened = HistoryIndex(self.log_dir)
+        self.assertEqual(reopened.ingest_file(path), 1)
+        self.assertEqual(self.lines(reopened, "1234"),
+                         [("session_1.txt", "DEP 1234 10.00"), ("session_1.txt", "WDR 1234 3.00")])
+
+    def test_replaced_and_deleted_logs(self):
+        path = self.write_log("session_1.txt", "DEP 1234 10.00\nDEP 1234 20.00\n", 1000)
+        index = HistoryIndex(self.log_dir)
+        index.ingest()
+        os.remove(path)
+        self.write_log("session_1.txt", "PAY 1234 1.00\n", 2000)
+        index.ingest()
+        self.assertEqual(self.lines(index, "1234"), [("session_1.txt", "PAY 1234 1.00")])
+
+        os.remove(path)
+        index.ingest()
+        self.assertEqual(index.history("1234"), [])
+
+    def test_app_indexes_as_it_writes(self):
+        accounts_file = os.path.join(self.log_dir, "accounts.txt")
+        with open(accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        history_dir = os.path.join(self.log_dir, "Transactions")
+        os.makedirs(history_dir)
+        index = HistoryIndex(history_dir)
+        app = BankingApp(accounts_file, history_dir=history_dir, history_index=index)
+        app.replay("1234\n4321\n2\n50\n4\n25\nSarah Smith\n6\n")
+        self.assertEqual(self.lines(index, "2345"), [("session_1.txt", "TRN 1234 25.00 2345")])
+        self.assertEqual(len(index.history("1234")), 2)
+
+
+class TestSharedHistoryIndex(HistoryIndexTestCase):
+    """
+    Several processes share one index without losing or mixing up entries.
+    """
+
+    def test_instances_see_each_others_logs(self):
+        first, second = HistoryIndex(self.log_dir), HistoryIndex(self.log_dir)
+        path_a = self.write_log("session_1.txt", "DEP 1234 1.00\n", 1000)
+        path_b = self.write_log("session_2.txt", "DEP 1234 2.00\n", 2000)
+        first.ingest_file(path_a)
+        second.ingest_file(path_b)
+        self.write_log("session_1.txt", "DEP 1234 3.00\n", 3000, mode="a")
+        first.ingest_file(path_a)
+        expected = [("session_1.txt", "DEP 1234 1.00"), ("session_2.txt", "DEP 1234 2.00"),
+                    ("session_1.txt", "DEP 1234 3.00")]
+        self.assertEqual(self.lines(first, "1234"), expected)
+        self.assertEqual(self.lines(second, "1234"), expected)
+
+    def test_concurrent_processes(self):
+        atms, sessions = 4, 5
+        with ProcessPoolExecutor(atms) as pool:
+            list(pool.map(_run_atm, [self.log_dir] * atms, range(atms), [sessions] * atms))
+
+        results = HistoryIndex(self.log_dir).history("1234")
+        found = sorted((name, line) for _, name, line in results)
+        expected = sorted((f"session_{atm}_{session}.txt", f"DEP 1234 {atm}.{session}{amount}")
+                          for atm in range(atms) for session in range(sessions) for amount in range(1, 4))
+        self.assertEqual(found, expected)
+
+    def test_compacted_journal(self):
+        path = self.write_log("session_1.txt", "DEP 1234 1.00\n", 1000)
+        other = self.write_log("session_2.txt", "DEP 2345 1.00\n", 1000)
+        index, reader = HistoryIndex(self.log_dir), HistoryIndex(self.log_dir)
+        index.ingest()
+        os.remove(other)
+        with mock.patch.object(history_index, "COMPACT_LINES", 5):
+            for amount in range(2, 8):
+                self.write_log("session_1.txt", f"DEP 1234 {amount}.00\n", 1000 + amount, mode="a")
+                index.ingest()
+        with open(os.path.join(index.index_dir, "files.log")) as f:
+            self.assertLess(len(f.read().splitlines()), 6)
+        expected = [("session_1.txt", f"DEP 1234 {amount}.00") for amount in range(1, 8)]
+        self.assertEqual(self.lines(reader, "1234"), expected)
+        self.assertEqual(self.lines(HistoryIndex(self.log_dir), "1234"), expected)
+        self.assertEqual(reader.history("2345"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend
+from fees import DEFAULT_FEE_TABLE
+from memprofile import NULL_PROFILER, MemoryProfiler
+
+MASTER = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+)
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    """
+    Stages report their peak and retained memory; the null profiler is free.
+    """
+
+    def setUp(self):
+        self.profiler = MemoryProfiler()
+        self.addCleanup(self.profiler.stop)
+
+    def test_peak_and_retained(self):
+        with self.profiler.stage("temporary"):
+            buffer = bytearray(4_000_000)
+            del buffer
+        with self.profiler.stage("kept"):
+            self.kept = bytearray(2_000_000)
+
+        temporary, kept = self.profiler.stages
+        self.assertGreaterEqual(temporary["peak_bytes"], 4_000_000)
+        self.assertLess(temporary["retained_bytes"], 100_000)
+        self.assertGreaterEqual(kept["retained_bytes"], 2_000_000)
+        site = kept["top_allocations"][0]["site"]
+        self.assertTrue(site.startswith(__file__), site)
+
+    def test_report_written_as_json(self):
+        with self.profiler.stage("only"):
+            pass
+        path = tempfile.mktemp(suffix=".json")
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        self.profiler.write(path)
+        with open(path) as f:
+            report = json.load(f)
+        self.assertEqual([s["name"] for s in report["stages"]], ["only"])
+        self.assertEqual(set(report), {"stages", "peak_bytes", "current_bytes"})
+
+    def test_null_profiler_does_not_trace(self):
+        self.profiler.stop()
+        with NULL_PROFILER.stage("anything"):
+            pass
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+class TestBackendProfiling(unittest.TestCase):
+    """
+    The backend reports one entry per stage when given a profiler.
+    """
+
+    def create_temp_file(self, text):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False, newline="\n")
+        temp.write(text)
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        return temp.name
+
+    def run_backend(self, profiler=None):
+        master = self.create_temp_file(MASTER)
+        current = self.create_temp_file("")
+        trans = self.create_temp_file("DEP 01234 10.00\nTRN 01234 20.00 02345\n")
+        backend = BankingBackend(trans, current, master, profiler=profiler, fee_table=DEFAULT_FEE_TABLE)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        with open(master) as f:
+            return f.read()
+
+    def test_all_stages_reported(self):
+        profiler = MemoryProfiler()
+        self.addCleanup(profiler.stop)
+        profiled = self.run_backend(profiler)
+        self.assertEqual([s["name"] for s in profiler.stages],
+                         ["load_accounts", "read_transactions", "check_constraints",
+                          "compute_fees", "apply_records", "save_accounts"])
+        self.assertEqual(profiled, self.run_backend())
+
+    def test_normal_run_does_not_trace(self):
+        self.run_backend()
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+if __name__ == "__main__":
+    unittest.main()
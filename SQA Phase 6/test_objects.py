@@ -0,0 +1,109 @@
+import copy
+import os
+import pickle
+import sys
+import tracemalloc
+import unittest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from account import Account
+from backend import parse_transaction
+from transaction import Transaction
+
+
+class DictTransaction:
+    """The __dict__-based layout Transaction used to have."""
+
+    def __init__(self, trans_code, account_number, amount, account_target=None):
+        self.trans_code = trans_code
+        self.account_number = account_number
+        self.amount = float(amount)
+        self.account_target = account_target
+
+
+def traced(factory, count):
+    """Bytes allocated by count calls of factory, payload excluded."""
+    kept = [None] * count
+    tracemalloc.start()
+    try:
+        for i in range(count):
+            kept[i] = factory(i)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+class TestTransaction(unittest.TestCase):
+    """
+    Transactions are slotted and immutable but keep their public API.
+    """
+
+    def test_api_unchanged(self):
+        transfer = Transaction("TRN", "1234", 25, "2345")
+        self.assertEqual(transfer.account_number, "1234")
+        self.assertEqual(transfer.amount, 25.0)
+        self.assertEqual(transfer.format(), "TRN 1234 25.00 2345")
+        self.assertEqual(Transaction("DEP", "1234", 5.5).format(), "DEP 1234 5.50")
+
+    def test_immutable(self):
+        transaction = Transaction("WDR", "1234", 10)
+        with self.assertRaises(AttributeError):
+            transaction.amount = 20
+        with self.assertRaises(AttributeError):
+            transaction.note = "x"
+        with self.assertRaises(AttributeError):
+            del transaction.trans_code
+
+    def test_copy_and_pickle(self):
+        transaction = Transaction("TRN", "1234", 25, "2345")
+        for clone in (copy.copy(transaction), pickle.loads(pickle.dumps(transaction))):
+            self.assertEqual(clone.format(), transaction.format())
+
+    def test_memory_per_instance(self):
+        amounts = [i * 0.25 for i in range(50000)]
+        code = "".join(["DE", "P"])       # a fresh, non-interned string
+        old = traced(lambda i: DictTransaction(code, "1234", amounts[i]), len(amounts))
+        new = traced(lambda i: Transaction(code, "1234", amounts[i]), len(amounts))
+        self.assertLessEqual(new, old * 0.65)
+
+
+class TestAccount(unittest.TestCase):
+    """
+    Accounts are slotted and share their PIN strings.
+    """
+
+    def test_slotted(self):
+        account = Account("1234", "John Doe", "4321", 100)
+        self.assertFalse(hasattr(account, "__dict__"))
+        account.update_balance(-40)
+        self.assertEqual(account.get_balance(), 60.0)
+        self.assertEqual(account.account_number, "1234")
+        clone = copy.copy(account)
+        clone.update_balance(1)
+        self.assertEqual(account.get_balance(), 60.0)
+
+    def test_pins_shared(self):
+        first = Account("1", "A B", "".join(["43", "21"]), 0)
+        second = Account("2", "C D", "".join(["43", "21"]), 0)
+        self.assertIs(first._pin, second._pin)
+
+
+class TestParsedRecords(unittest.TestCase):
+    """
+    Parsed backend records share their code and account strings.
+    """
+
+    def test_interned(self):
+        first = parse_transaction("TRN 01234 10.00 02345")
+        second = parse_transaction("TRN 01234 20.00 02345")
+        for a, b in zip(first, second):
+            if isinstance(a, str):
+                self.assertIs(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
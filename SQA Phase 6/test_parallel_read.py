@@ -0,0 +1,82 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from parallel_read import _parse_chunk, read_accounts_parallel, record_count
+from read import read_bank_accounts
+
+VALID = "{:05d} Customer {:<11} A 00100.00 1234 NP\n"
+
+
+class TestParallelRead(unittest.TestCase):
+    """
+    Chunks parsed on a pool give exactly what the sequential reader gives.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "accounts.txt")
+
+    def write(self, text):
+        with open(self.path, "w", newline="") as f:
+            f.write(text)
+
+    def records(self, count, bad=()):
+        lines = [VALID.format(n, n) for n in range(1, count + 1)]
+        for n in bad:
+            lines[n - 1] = lines[n - 1].replace(" A ", " X ")            # invalid status, same width
+        return "".join(lines)
+
+    def read_both(self, **options):
+        with redirect_stdout(io.StringIO()) as sequential_out:
+            sequential = read_bank_accounts(self.path)
+        with redirect_stdout(io.StringIO()) as parallel_out:
+            parallel = read_accounts_parallel(self.path, workers=3, chunk_records=7, **options)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(parallel_out.getvalue(), sequential_out.getvalue())
+        return parallel, parallel_out.getvalue()
+
+    def test_same_result_and_line_numbers(self):
+        self.write(self.records(50, bad=(3, 7, 8, 44)))
+        self.assertEqual(len(_parse_chunk(self.path, 42, 7)[1]), 1)         # no fallback
+        accounts, output = self.read_both()
+        self.assertEqual(len(accounts), 46)
+        self.assertEqual([line.split()[5] for line in output.splitlines()], ["3:", "7:", "8:", "44:"])
+
+    def test_missing_final_newline(self):
+        self.write(self.records(30).rstrip("\n"))
+        self.assertEqual(record_count(self.path), 30)
+        accounts, _ = self.read_both()
+        self.assertEqual(len(accounts), 30)
+
+    def test_misaligned_files_fall_back(self):
+        text = self.records(30)
+        for broken in (text.replace("Customer 12 ", "Customer 12"),           # one short line
+                       text.replace("\n", "\r\n"),
+                       text + "\n",
+                       text.replace("Customer 5  ", "Customer 5 é")):
+            self.write(broken)
+            self.assertTrue(record_count(self.path) is None
+                            or None in [_parse_chunk(self.path, first, 7) for first in range(0, 30, 7)])
+            self.read_both()
+
+    def test_read_bank_accounts_workers(self):
+        self.write(self.records(20, bad=(20,)))
+        with redirect_stdout(io.StringIO()) as out:
+            accounts = read_bank_accounts(self.path, workers=2)
+        self.assertEqual(len(accounts), 19)
+        self.assertIn("Line 20:", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import AccountManager, BankingBackend, TransactionProcessor, parse_transaction
+from pipeline import pipelined_records
+
+MASTER = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+)
+
+DAY = (
+    "DEP 01234 10.00\n"
+    "\n"
+    "WDR 01234 oops\n"
+    "TRN 01234 25.00 02345\n"
+    "PAY 02345 5.00\n"
+    "XYZ\n"
+    "WDR 02345 2.50\n"
+)
+
+
+class TestPipeline(unittest.TestCase):
+    """
+    The pipelined reader yields exactly what read_records() returns.
+    """
+
+    def create_temp_file(self, text):
+        temp = tempfile.NamedTemporaryFile(mode="w", delete=False, newline="\n")
+        temp.write(text)
+        temp.close()
+        self.addCleanup(os.remove, temp.name)
+        return temp.name
+
+    def sequential(self, path):
+        with redirect_stdout(io.StringIO()) as out:
+            records = TransactionProcessor(AccountManager([])).read_records(path)
+        return records, out.getvalue()
+
+    def pipelined(self, path, **options):
+        with redirect_stdout(io.StringIO()) as out:
+            records = list(pipelined_records(path, parse_transaction, **options))
+        return records, out.getvalue()
+
+    def test_same_records_and_errors(self):
+        for text in (DAY, DAY * 50, DAY + "END\nDEP 01234 99.00\n", DAY.rstrip("\n"), ""):
+            path = self.create_temp_file(text)
+            expected = self.sequential(path)
+            for chunk_size in (1, 7, 64, 1 << 20):
+                with self.subTest(lines=text.count("\n"), chunk_size=chunk_size):
+                    self.assertEqual(self.pipelined(path, chunk_size=chunk_size, depth=1), expected)
+
+    def test_early_stop_releases_threads(self):
+        path = self.create_temp_file(DAY * 1000)
+        before = threading.active_count()
+        records = pipelined_records(path, parse_transaction, chunk_size=16, depth=1)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(next(records)[0], "DEP")
+        records.close()
+        self.assertEqual(threading.active_count(), before)
+
+    def test_read_error_is_raised(self):
+        with self.assertRaises(FileNotFoundError):
+            list(pipelined_records(os.path.join(CURRENT_DIR, "no-such.atf"), parse_transaction))
+
+    def test_backend_pipelined_matches_sequential(self):
+        results = []
+        for pipelined in (False, True):
+            master = self.create_temp_file(MASTER)
+            current = self.create_temp_file("")
+            trans = self.create_temp_file(DAY + "WDR 02345 9999.00\n")
+            backend = BankingBackend(trans, current, master, pipelined=pipelined)
+            with redirect_stdout(io.StringIO()) as out:
+                self.assertTrue(backend.run())
+            with open(master) as f:
+                results.append((f.read(), out.getvalue(), backend.violations))
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
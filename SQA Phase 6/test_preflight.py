@@ -0,0 +1,94 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend
+from preflight import check_logs, check_record, report, session_logs, write_stream
+
+KNOWN = frozenset({"1", "1234", "2345"})
+ACCOUNTS = (
+    "00001 Stan Lee             A 01000.00 9999 NP\n"
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+)
+
+
+class TestPreflight(unittest.TestCase):
+    """
+    Every log checked up front, one report, one clean stream.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_log(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", newline="\n") as f:
+            f.write(text)
+        return path
+
+    def test_check_record(self):
+        self.assertIsNone(check_record("DEP 01234 10.00", KNOWN))
+        self.assertIsNone(check_record("TRN 1234 10.00 2345", KNOWN))
+        self.assertIsNone(check_record("END", KNOWN))
+        for line, reason in (("DEP 1234", "malformed record"),
+                             ("DEP 1234 ten", "malformed record"),
+                             ("XFR 1234 10.00", "unknown transaction code XFR"),
+                             ("DEP 1234 0.00", "amount 0.00 out of range"),
+                             ("WDR 1234 -5.00", "amount -5.00 out of range"),
+                             ("PAY 1234 100000.00", "amount 100000.00 out of range"),
+                             ("PAY 1234 nan", "amount nan out of range"),
+                             ("PAY 1234 1.005", "amount 1.005 has fractions of a cent"),
+                             ("DEP 9999 10.00", "account 9999 not found"),
+                             ("TRN 1234 10.00 9999", "account 9999 not found")):
+            self.assertEqual(check_record(line, KNOWN), reason, line)
+
+    def test_parallel_matches_sequential(self):
+        paths = []
+        for n in range(1, 201):
+            bad = "DEP 77 1.00\n" if n % 50 == 0 else ""
+            paths.append(self.write_log(f"session_{n}.txt", f"DEP 1234 {n}.00\n{bad}\nWDR 2345 1.00\n"))
+        sequential = check_logs(paths, KNOWN, workers=1)
+        self.assertEqual(check_logs(paths, KNOWN, workers=3), sequential)
+        clean, problems, count = sequential
+        self.assertEqual((len(clean), len(problems), count), (400, 4, 404))
+        self.assertEqual(problems[0], (paths[49], 2, "DEP 77 1.00", "account 77 not found"))
+
+    def test_records_after_end(self):
+        first = self.write_log("session_1.txt", "DEP 1234 1.00\nEND\nDEP 1234 2.00\n")
+        second = self.write_log("session_2.txt", "DEP 2345 3.00\n")
+        clean, problems, count = check_logs(session_logs(self.directory), KNOWN, workers=1)
+        self.assertEqual(clean, ["DEP 1234 1.00"])
+        self.assertEqual([(path, line_num) for path, line_num, _, _ in problems], [(first, 3), (second, 1)])
+        self.assertEqual(report([first, second], clean, problems, count)[0],
+                         "PREFLIGHT: 2 log(s), 3 record(s), 1 passed, 2 rejected")
+
+    def test_clean_stream_feeds_backend(self):
+        self.write_log("session_1.txt", "DEP 1234 10.00\nDEP 4444 5.00\n")
+        self.write_log("session_2.txt", "TRN 2345 20.00 0001\nPAY 1234 abc\n")
+        clean, problems, _ = check_logs(session_logs(self.directory), KNOWN, workers=1)
+        self.assertEqual(len(problems), 2)
+        day = os.path.join(self.directory, "day.atf")
+        write_stream(clean, day)
+        with open(day) as f:
+            self.assertEqual(f.read(), "DEP 1234 10.00\nTRN 2345 20.00 0001\nEND\n")
+
+        current = self.write_log("current.txt", ACCOUNTS)
+        master = self.write_log("master.txt", ACCOUNTS)
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertTrue(BankingBackend(day, current, master, fee_table={}).run())
+        self.assertEqual(out.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
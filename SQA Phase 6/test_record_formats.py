@@ -0,0 +1,163 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from account_index import AccountIndex
+from backend import BankingBackend
+from convert_accounts import convert_accounts
+from parallel_read import read_accounts_parallel
+from read import read_bank_accounts, record_format
+from shards import split_accounts
+from shared_table import SharedAccountTable, unpublish
+from snapshots import SnapshotStore
+from sqlite_store import AccountStore
+from write import validate_account, write_new_accounts
+
+V1 = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+)
+V2 = (
+    "0000001234 John Doe             A 000000001000.00 4321 NP\n"
+    "0000002345 Sarah Smith          A 000000000500.00 5687 SP\n"
+)
+WIDE = {"account_number": "1234567890", "name": "Big Spender", "status": "A",
+        "balance": 123456789.5, "pin": "0000", "plan": "SP"}
+
+
+class TestRecordFormats(unittest.TestCase):
+    """
+    v1 and v2 records, told apart by length, read and written alike.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", newline="\n") as f:
+            f.write(text)
+        return path
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_detection_and_same_accounts(self):
+        v1 = self.write("v1.txt", V1)
+        v2 = self.write("v2.txt", V2)
+        self.assertEqual((record_format(v1), record_format(v2)), (1, 2))
+        self.assertEqual(read_bank_accounts(v2), read_bank_accounts(v1))
+
+    def test_lines_must_match_detected_format(self):
+        mixed = self.write("mixed.txt", V2 + V1)
+        with redirect_stdout(io.StringIO()) as out:
+            accounts = read_bank_accounts(mixed)
+        self.assertEqual(len(accounts), 2)
+        self.assertIn("Line 3: Invalid length (45 chars, expected 57)", out.getvalue())
+
+    def test_limits(self):
+        with self.assertRaises(ValueError):
+            validate_account(dict(WIDE))
+        validate_account(dict(WIDE), 2)
+        with self.assertRaises(ValueError):
+            validate_account(dict(WIDE, balance=1e12), 2)
+
+    def test_write_keeps_format(self):
+        path = self.write("accounts.txt", V2)
+        accounts = read_bank_accounts(path) + [WIDE]
+        write_new_accounts(accounts, path)
+        self.assertEqual(self.read(path).splitlines()[2],
+                         "1234567890 Big Spender          A 000123456789.50 0000 SP")
+        self.assertEqual(read_bank_accounts(path), accounts)
+        with self.assertRaises(ValueError):
+            write_new_accounts(accounts, self.write("v1.txt", V1))
+
+    def test_convert_both_ways_in_place(self):
+        path = self.write("accounts.txt", V1)
+        self.assertEqual(convert_accounts(path, path), 2)
+        self.assertEqual(self.read(path), V2)
+        self.assertEqual(convert_accounts(path, path, version=1), 2)
+        self.assertEqual(self.read(path), V1)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_convert_stops_at_invalid_record(self):
+        source = self.write("v1.txt", V1 + "09999 Broken               X 00001.00 0000 NP\n")
+        destination = self.write("v2.txt", V2)
+        with self.assertRaises(ValueError) as raised:
+            convert_accounts(source, destination)
+        self.assertIn("Line 3", str(raised.exception))
+        self.assertEqual(self.read(destination), V2)
+
+        wide = self.write("wide.txt", V2)
+        write_new_accounts(read_bank_accounts(wide) + [WIDE], wide)
+        with self.assertRaises(ValueError):
+            convert_accounts(wide, source, version=1)
+
+    def test_index_and_parallel_reader(self):
+        path = self.write("accounts.txt", "")
+        write_new_accounts([dict(WIDE, account_number=str(n * 7919), name=f"Holder {n}")
+                            for n in range(40, 0, -1)], path, version=2)
+        with AccountIndex(path) as index:
+            self.assertEqual(index.lookup(str(13 * 7919))["name"], "Holder 13")
+            self.assertIsNone(index.lookup("12345678901"))
+        self.assertEqual(read_accounts_parallel(path, workers=2, chunk_records=7), read_bank_accounts(path))
+
+    def test_backend_uses_v2_limit(self):
+        current = self.write("current.txt", V2)
+        master = self.write("master.txt", V2)
+        day = self.write("day.atf", "DEP 1234 150000.00\n")
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertTrue(BankingBackend(day, current, master, fee_table={}).run())
+        self.assertEqual(out.getvalue(), "")
+        self.assertEqual(self.read(master).splitlines()[0],
+                         "0000001234 John Doe             A 000000151000.00 4321 NP")
+
+    def test_backend_snapshots_and_shared_table_keep_v2(self):
+        current = self.write("current.txt", V2)
+        master = self.write("master.txt", V2)
+        day = self.write("day.atf", "DEP 1234 150000.00\nDEP 2345 1.00\n")
+        snapshots = SnapshotStore(os.path.join(self.directory, "snapshots"))
+        pointer = current + ".shm"
+        self.addCleanup(unpublish, pointer)
+        for _ in range(2):
+            with redirect_stdout(io.StringIO()) as out:
+                self.assertTrue(BankingBackend(day, current, master, fee_table={},
+                                               snapshots=snapshots, shared_table=pointer).run())
+            self.assertEqual(out.getvalue(), "")
+
+        self.assertEqual(snapshots.accounts(2), read_bank_accounts(master))
+        self.assertEqual(snapshots.accounts(2)[0]["balance"], 301000.00)
+        rebuilt = os.path.join(self.directory, "rebuilt.txt")
+        snapshots.rebuild(1, rebuilt)
+        self.assertEqual(record_format(rebuilt), 2)
+        self.assertEqual(read_bank_accounts(rebuilt)[0]["balance"], 151000.00)
+
+        with SharedAccountTable(pointer) as table:
+            self.assertEqual(table.lookup("0000001234")["balance"], 301000.00)
+            self.assertIsNone(table.lookup("12345678901"))
+            self.assertEqual(table.find_by_name("SARAH SMITH"), "2345")
+            self.assertEqual(list(table.iter_accounts()), read_bank_accounts(master))
+
+    def test_shards_and_store_reject_v2(self):
+        source = self.write("v2.txt", V2)
+        with self.assertRaisesRegex(ValueError, "v1 records only"):
+            split_accounts(source, os.path.join(self.directory, "shards"))
+        with AccountStore(os.path.join(self.directory, "accounts.db"), create=True) as store:
+            with self.assertRaisesRegex(ValueError, "v1 accounts only"):
+                store.import_accounts(source)
+            self.assertEqual(store.read_accounts(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from bankingapp import BankingApp
+
+JERRY = "83413 Jerry Mickelson      A 07055.00 5190 NP\n"
+SARAH = "02345 Sarah Smith          A 01240.00 5687 SP\n"
+MARIA = "11111 Maria Lopez          A 00500.00 1234 NP\n"
+
+
+class ReloadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.accounts_file = os.path.join(self.directory.name, "accounts.txt")
+        self.publish(JERRY + SARAH)
+        self.app = BankingApp(self.accounts_file, history_dir=os.path.join(self.directory.name, "history"))
+        self.app.load_accounts()
+
+    def publish(self, text):
+        """Replace the accounts file the way the backend does."""
+        temp_path = self.accounts_file + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(text)
+        os.replace(temp_path, self.accounts_file)
+
+
+class TestReloadAccounts(ReloadTestCase):
+    """
+    reload_accounts() applies only what changed in the accounts file.
+    """
+
+    def test_unchanged_file_is_not_read(self):
+        self.assertEqual(self.app.reload_accounts(), 0)
+
+    def test_same_content_changes_nothing(self):
+        self.publish(JERRY + SARAH)
+        jerry = self.app.accounts["83413"]
+        jerry.update_balance(-55)
+        self.assertEqual(self.app.reload_accounts(), 0)
+        self.assertEqual(jerry.get_balance(), 7000.00)
+
+    def test_changed_account_is_refreshed_in_place(self):
+        jerry, sarah = self.app.accounts["83413"], self.app.accounts["2345"]
+        sarah.update_balance(-40)            # a session's change the file has not seen
+        self.publish(JERRY.replace("07055.00 5190", "06000.00 4321") + SARAH)
+        self.assertEqual(self.app.reload_accounts(), 1)
+        self.assertIs(self.app.accounts["83413"], jerry)
+        self.assertEqual(jerry.get_balance(), 6000.00)
+        self.assertTrue(jerry.validate_pin("4321"))
+        self.assertEqual(sarah.get_balance(), 1200.00)
+
+    def test_added_and_removed_accounts(self):
+        self.publish(JERRY + MARIA)
+        self.assertEqual(self.app.reload_accounts(), 2)
+        self.assertEqual(sorted(self.app.accounts), ["11111", "83413"])
+        self.assertEqual(self.app.accounts["11111"].get_name(), "Maria Lopez")
+
+    def test_rewritten_in_place(self):
+        with open(self.accounts_file, "w") as f:
+            f.write(JERRY + SARAH.replace("01240.00", "09999.00"))
+        self.assertEqual(self.app.reload_accounts(), 1)
+        self.assertEqual(self.app.accounts["2345"].get_balance(), 9999.00)
+
+    def test_missing_file_keeps_accounts(self):
+        os.unlink(self.accounts_file)
+        self.assertEqual(self.app.reload_accounts(), 0)
+        self.assertEqual(sorted(self.app.accounts), ["2345", "83413"])
+
+    def test_not_loaded_yet(self):
+        app = BankingApp(self.accounts_file, history_dir=os.path.join(self.directory.name, "history"))
+        self.publish(JERRY)
+        self.assertEqual(app.reload_accounts(), 0)
+        self.assertEqual(app.accounts, {})
+
+
+class TestReloadBlocks(ReloadTestCase):
+    """
+    reload_accounts() keeps checksums, not the file, and narrows a
+    same-size file down to the blocks that changed.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.lines = [f"{n:05d} Customer {n:<11} A 01000.00 1234 NP\n" for n in range(1, 101)]
+        self.publish("".join(self.lines))
+        self.app = BankingApp(self.accounts_file, history_dir=os.path.join(self.directory.name, "history"))
+        self.app.RELOAD_BLOCK = 256
+        self.app.load_accounts()
+
+    def test_no_copy_of_the_file(self):
+        self.assertFalse([name for name, value in vars(self.app).items()
+                          if isinstance(value, (bytes, str)) and len(value) > 100])
+
+    def test_only_changed_blocks_are_read(self):
+        self.lines[41] = self.lines[41].replace("01000.00", "02000.00")
+        self.publish("".join(self.lines))
+        with open(self.accounts_file, "rb") as f:
+            changed_lines, _ = self.app._changed_lines(f.read())
+        self.assertIn(41, changed_lines)
+        self.assertLess(len(changed_lines), 10)
+        self.assertEqual(self.app.reload_accounts(), 1)
+        self.assertEqual(self.app.accounts["42"].get_balance(), 2000.00)
+
+        self.lines[41] = self.lines[41].replace("02000.00", "03000.00")
+        self.publish("".join(self.lines))
+        self.assertEqual(self.app.reload_accounts(), 1)
+        self.assertEqual(self.app.accounts["42"].get_balance(), 3000.00)
+
+    def test_moved_line_boundaries(self):
+        self.lines[10] = self.lines[10].replace("Customer 11 ", "Customer 11")
+        self.lines[11] = self.lines[11].replace("Customer 12", "Customer 12 ")
+        self.publish("".join(self.lines))
+        with open(self.accounts_file, "rb") as f:
+            self.assertIsNone(self.app._changed_lines(f.read()))
+        self.assertEqual(self.app.reload_accounts(), 2)
+        self.assertEqual(len(self.app.accounts), 100)
+
+    def test_reordered_lines_change_nothing(self):
+        self.lines[3], self.lines[97] = self.lines[97], self.lines[3]
+        self.publish("".join(self.lines))
+        self.app.accounts["4"].update_balance(-1)
+        self.assertEqual(self.app.reload_accounts(), 0)
+        self.assertEqual(self.app.accounts["4"].get_balance(), 999.00)
+
+    def test_inserted_line(self):
+        self.publish(MARIA.replace("11111", "00200") + "".join(self.lines))
+        self.assertEqual(self.app.reload_accounts(), 1)
+        self.assertEqual(len(self.app.accounts), 101)
+        self.lines[0] = self.lines[0].replace("01000.00", "00001.00")
+        self.publish("".join(self.lines))
+        self.assertEqual(self.app.reload_accounts(), 2)
+        self.assertEqual(self.app.accounts["1"].get_balance(), 1.00)
+        self.assertNotIn("200", self.app.accounts)
+
+
+class TestReloadBetweenSessions(ReloadTestCase):
+    """
+    A new accounts file takes effect at the next login, not during a session.
+    """
+
+    def test_replay_picks_up_new_file(self):
+        status = []
+        self.app.replay("83413\n5190\n1\n", status)
+        self.publish(JERRY.replace("07055.00", "00100.00") + SARAH)
+        self.app.replay("83413\n5190\n1\n", status)
+        self.assertEqual(status, ["LOGIN OK", "BAL 7055.00", "LOGIN OK", "BAL 100.00"])
+
+    def test_session_in_progress_is_not_touched(self):
+        stdin = sys.stdin
+        sys.stdin = io.StringIO("83413\n5190\n")
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertTrue(self.app.login())
+        finally:
+            sys.stdin = stdin
+        self.publish(SARAH)
+        self.assertEqual(self.app.find_account("83413"), self.app.current_user)
+
+        self.app.current_user = None
+        sys.stdin = io.StringIO("83413\n5190\n")
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertFalse(self.app.login())
+        finally:
+            sys.stdin = stdin
+
+
+if __name__ == "__main__":
+    unittest.main()
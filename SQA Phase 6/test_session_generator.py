@@ -0,0 +1,68 @@
+import itertools
+import os
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from bankingapp import BankingApp
+from read import read_bank_accounts
+from session_generator import SessionModel, generate_sessions, write_sessions
+
+ACCOUNTS_FILE = os.path.join(CURRENT_DIR, "currentaccounts.txt")
+
+
+class TestGenerateSessions(unittest.TestCase):
+    """
+    Sessions are reproducible and follow the model.
+    """
+
+    def setUp(self):
+        self.accounts = read_bank_accounts(ACCOUNTS_FILE)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.history_dir = directory.name
+
+    def test_same_seed_same_sessions(self):
+        first = list(generate_sessions(self.accounts, seed=7, count=50))
+        second = list(generate_sessions(self.accounts, seed=7, count=50))
+        other = list(generate_sessions(self.accounts, seed=8, count=50))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_unbounded_stream(self):
+        sessions = generate_sessions(self.accounts, seed=1)
+        self.assertEqual(len(list(itertools.islice(sessions, 1000))), 1000)
+
+    def test_unknown_model_setting(self):
+        with self.assertRaises(ValueError):
+            SessionModel(login_faliure_rate=0.5)
+
+    def test_login_failure_rate(self):
+        model = SessionModel(login_failure_rate=0.3)
+        app = BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir)
+        status = []
+        app.replay_sessions(generate_sessions(self.accounts, model, seed=3, count=2000), status)
+        failures = status.count("LOGIN CRED") / 2000
+        self.assertAlmostEqual(failures, 0.3, delta=0.05)
+
+    def test_all_logins_succeed_without_failures(self):
+        model = SessionModel(login_failure_rate=0.0, menu_mix={"balance": 1.0})
+        app = BankingApp(ACCOUNTS_FILE, history_dir=self.history_dir)
+        status = []
+        app.replay_sessions(generate_sessions(self.accounts, model, seed=4, count=200), status)
+        self.assertEqual(status.count("LOGIN OK"), 200)
+
+    def test_write_sessions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            written = write_sessions(generate_sessions(self.accounts, seed=2, count=5), directory)
+            self.assertEqual(written, 5)
+            self.assertEqual(sorted(os.listdir(directory))[0], "s0000001.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend
+from read import read_bank_accounts
+from shards import join_shards, read_manifest, shard_file, split_accounts, touched_shards
+from write import write_new_accounts
+
+ACCOUNTS = (
+    "00012 John Doe             A 01000.00 4321 NP\n"
+    "12345 Sarah Smith          A 00500.00 5687 SP\n"
+    "00034 Bob Lee              A 00200.00 1111 NP\n"
+    "45001 Ann Wu               D 00050.00 2222 SP\n"
+)
+
+
+class TestShards(unittest.TestCase):
+    """
+    A shard directory round-trips and only touched shards are read or written.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.single = os.path.join(self.directory, "accounts.txt")
+        with open(self.single, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        self.sharded = os.path.join(self.directory, "master")
+        split_accounts(self.single, self.sharded)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_split_writes_manifest(self):
+        manifest = read_manifest(self.sharded)
+        self.assertEqual(manifest["prefix_digits"], 2)
+        self.assertEqual(manifest["shards"], {"00": 2, "12": 1, "45": 1})
+        lines = ACCOUNTS.splitlines(True)
+        self.assertEqual(self.read(shard_file(self.sharded, "00")), lines[0] + lines[2])
+
+    def test_join_round_trip(self):
+        joined = os.path.join(self.directory, "joined.txt")
+        self.assertEqual(join_shards(self.sharded, joined), 4)
+        self.assertEqual(sorted(self.read(joined).splitlines()), sorted(ACCOUNTS.splitlines()))
+        self.assertEqual(read_bank_accounts(joined), read_bank_accounts(self.sharded))
+
+    def test_read_only_touched_shards(self):
+        self.assertEqual(touched_shards(self.sharded, {"34", "12345", "99999"}), ["00", "12"])
+        accounts = read_bank_accounts(self.sharded, {"34"})
+        self.assertEqual([acc["account_number"] for acc in accounts], ["12", "34"])
+
+    def test_write_only_touched_shards(self):
+        os.utime(shard_file(self.sharded, "45"), ns=(0, 0))
+        accounts = read_bank_accounts(self.sharded, {"12345"})
+        accounts[0]["balance"] = 1.00
+        write_new_accounts(accounts, self.sharded)
+        self.assertEqual(os.stat(shard_file(self.sharded, "45")).st_mtime_ns, 0)
+        self.assertIn("12345 Sarah Smith          A 00001.00", self.read(shard_file(self.sharded, "12")))
+
+    def test_new_shard_added_to_manifest(self):
+        write_new_accounts([{"account_number": "99000", "name": "New Person", "status": "A",
+                             "balance": 0.0, "pin": "0000", "plan": "NP"}], self.sharded)
+        self.assertEqual(read_manifest(self.sharded)["shards"]["99"], 1)
+
+    def test_backend_rewrites_touched_shards(self):
+        current = os.path.join(self.directory, "current")
+        shutil.copytree(self.sharded, current)
+        for key in ("00", "12", "45"):
+            os.utime(shard_file(self.sharded, key), ns=(0, 0))
+        trans = os.path.join(self.directory, "day.atf")
+        with open(trans, "w") as f:
+            f.write("DEP 00012 10.00\nEND\nDEP 45001 1.00\n")
+
+        backend = BankingBackend(trans, current, self.sharded, fee_table={})
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        self.assertEqual(len(backend.accounts), 2)
+        self.assertNotEqual(os.stat(shard_file(self.sharded, "00")).st_mtime_ns, 0)
+        self.assertEqual(os.stat(shard_file(self.sharded, "12")).st_mtime_ns, 0)
+        self.assertEqual(os.stat(shard_file(self.sharded, "45")).st_mtime_ns, 0)
+        self.assertTrue(self.read(shard_file(current, "00")).startswith(
+            "00012 John Doe             A 01010.00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend
+from bankingapp import BankingApp
+from read import read_bank_accounts
+from shared_table import SharedAccountTable, publish_file, unpublish
+
+ACCOUNTS = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+    "03456 John Doe             D 00200.00 1111 NP\n"
+)
+
+
+class TestSharedAccountTable(unittest.TestCase):
+    """
+    One published table, attached and searched in place.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.accounts_file = os.path.join(self.directory, "accounts.txt")
+        with open(self.accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        self.pointer = self.accounts_file + ".shm"
+        self.addCleanup(unpublish, self.pointer)
+
+    def attach(self):
+        table = SharedAccountTable(self.pointer)
+        self.addCleanup(table.close)
+        return table
+
+    def test_lookups(self):
+        publish_file(self.accounts_file)
+        table = self.attach()
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.lookup("01234"), read_bank_accounts(self.accounts_file)[0])
+        self.assertEqual(table.lookup("3456")["status"], "D")
+        for missing in ("99999", "123456", "12a"):
+            self.assertIsNone(table.lookup(missing))
+        self.assertEqual(table.find_by_name("JOHN DOE"), "3456")        # last match wins
+        self.assertIsNone(table.find_by_name("NOBODY"))
+        self.assertEqual(list(table.iter_accounts()), read_bank_accounts(self.accounts_file))
+
+    def test_large_table(self):
+        with open(self.accounts_file, "w") as f:
+            for n in range(1, 5001):
+                f.write(f"{n * 7 % 99999:05d} {f'Customer {n}':<20} A 00001.00 1234 NP\n")
+        publish_file(self.accounts_file)
+        table = self.attach()
+        for n in range(1, 5001):
+            self.assertEqual(table.lookup(str(n * 7 % 99999))["name"], f"Customer {n}")
+            self.assertEqual(table.find_by_name(f"CUSTOMER {n}"), str(n * 7 % 99999))
+
+    def test_republish_keeps_attached_tables(self):
+        first = publish_file(self.accounts_file)
+        old = self.attach()
+        with open(self.accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS.replace("01000.00", "00999.00"))
+        second = publish_file(self.accounts_file)
+        self.assertNotEqual(first, second)
+        self.assertFalse(os.path.exists(os.path.join("/dev/shm", first)))
+        self.assertEqual(old.lookup("1234")["balance"], 1000.00)        # still mapped
+        self.assertEqual(self.attach().lookup("1234")["balance"], 999.00)
+
+    def test_attached_in_another_process(self):
+        publish_file(self.accounts_file)
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); from shared_table import SharedAccountTable; "
+                "print(SharedAccountTable(sys.argv[2]).lookup('2345')['name'])")
+        result = subprocess.run([sys.executable, "-c", code, CURRENT_DIR, self.pointer],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout, "Sarah Smith\n")
+        self.assertEqual(result.stderr, "")
+        self.assertEqual(self.attach().lookup("2345")["name"], "Sarah Smith")  # not unlinked at exit
+
+    def test_backend_republishes_and_app_attaches(self):
+        master = os.path.join(self.directory, "master.txt")
+        shutil.copy(self.accounts_file, master)
+        trans_file = os.path.join(self.directory, "day.atf")
+        with open(trans_file, "w") as f:
+            f.write("DEP 1234 10.00\nTRN 2345 5.00 1234\n")
+        publish_file(self.accounts_file)
+        backend = BankingBackend(trans_file, self.accounts_file, master, fee_table={},
+                                 shared_table=self.pointer)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        table = self.attach()
+        self.assertEqual(table.lookup("1234")["balance"], 1015.00)
+
+        app = BankingApp(self.accounts_file, table, os.path.join(self.directory, "Transactions"))
+        status = []
+        app.replay("1234\n4321\n4\n15\nSarah Smith\n6\n", status)
+        self.assertEqual(status, ["LOGIN OK", "TRN OK", "EXIT OK"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend
+from shards import split_accounts
+from snapshots import SnapshotStore
+
+MASTER = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+    "03456 Bob Lee              A 00200.00 1111 NP\n"
+)
+
+
+def make_accounts():
+    return [
+        {"account_number": "1234", "name": "John Doe", "status": "A",
+         "balance": 1000.00, "pin": "4321", "plan": "NP"},
+        {"account_number": "2345", "name": "Sarah Smith", "status": "A",
+         "balance": 500.00, "pin": "5687", "plan": "SP"},
+        {"account_number": "3456", "name": "Bob Lee", "status": "A",
+         "balance": 200.00, "pin": "1111", "plan": "NP"},
+    ]
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """
+    Days are stored as bases plus deltas and rebuilt exactly.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = SnapshotStore(os.path.join(self.directory, "snapshots"), base_every=3)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_deltas_hold_changed_records_only(self):
+        accounts = make_accounts()
+        self.assertEqual(self.store.record(accounts), "base")
+        accounts[1]["balance"] = 450.00
+        self.assertEqual(self.store.record(accounts), "delta")
+        self.assertEqual(self.read(os.path.join(self.store.directory, "day_000002.delta")),
+                         "02345 Sarah Smith          A 00450.00 5687 SP\n")
+        self.assertEqual(self.store.record(accounts[:2]), "delta")
+        self.assertEqual(self.read(os.path.join(self.store.directory, "day_000003.delta")), "-03456\n")
+        self.assertEqual(self.store.record(accounts), "base")
+        self.assertEqual(self.store.days(), {1: "base", 2: "delta", 3: "delta", 4: "base"})
+
+    def test_rebuild_every_day(self):
+        accounts = make_accounts()
+        expected = {}
+        for day in range(1, 9):
+            accounts[day % 3]["balance"] += day
+            if day == 5:
+                accounts.append({"account_number": "99", "name": "New Person", "status": "A",
+                                 "balance": 1.0, "pin": "0000", "plan": "SP"})
+            self.store.record(accounts)
+            expected[day] = [dict(acc) for acc in accounts]
+
+        for day, accounts_then in expected.items():
+            with self.subTest(day=day):
+                self.assertEqual(self.store.accounts(day), accounts_then)
+        out = os.path.join(self.directory, "day4.txt")
+        self.store.rebuild(4, out)
+        self.assertEqual(len(self.read(out).splitlines()), 3)
+
+    def test_partial_record_keeps_other_accounts(self):
+        self.store.record(make_accounts())
+        changed = make_accounts()[2]
+        changed["balance"] = 0.0
+        self.store.record([changed], complete=False)
+        self.assertEqual([acc["balance"] for acc in self.store.accounts(2)], [1000.00, 500.00, 0.0])
+
+    def test_first_day_must_be_complete(self):
+        with self.assertRaises(ValueError):
+            self.store.record(make_accounts()[:1], complete=False)
+        self.assertEqual(self.store.days(), {})
+
+    def test_unknown_and_past_days(self):
+        self.store.record(make_accounts(), day=5)
+        with self.assertRaises(ValueError):
+            self.store.accounts(4)
+        with self.assertRaises(ValueError):
+            self.store.record(make_accounts(), day=5)
+
+    def test_fresh_store_reads_existing_history(self):
+        accounts = make_accounts()
+        self.store.record(accounts)
+        accounts[0]["balance"] = 1.0
+        self.store.record(accounts)
+        reopened = SnapshotStore(self.store.directory, base_every=3)
+        accounts[0]["balance"] = 2.0
+        self.assertEqual(reopened.record(accounts), "delta")
+        self.assertEqual(reopened.accounts(3), accounts)
+
+
+class TestBackendSnapshots(unittest.TestCase):
+    """
+    Each saved day is recorded in the snapshot store.
+    """
+
+    def test_backend_records_each_day(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        master = os.path.join(directory, "master.txt")
+        current = os.path.join(directory, "current.txt")
+        trans = os.path.join(directory, "day.atf")
+        with open(master, "w", newline="\n") as f:
+            f.write(MASTER)
+        store = SnapshotStore(os.path.join(directory, "snapshots"))
+
+        history = []
+        for amount in ("10.00", "20.00"):
+            with open(trans, "w") as f:
+                f.write(f"DEP 01234 {amount}\n")
+            with redirect_stdout(io.StringIO()):
+                self.assertTrue(BankingBackend(trans, current, master, fee_table={}, snapshots=store).run())
+            with open(master) as f:
+                history.append(f.read())
+
+        self.assertEqual(store.days(), {1: "base", 2: "delta"})
+        for day, text in enumerate(history, 1):
+            rebuilt = os.path.join(directory, f"rebuilt{day}.txt")
+            store.rebuild(day, rebuilt)
+            with open(rebuilt) as f:
+                self.assertEqual(f.read(), text)
+
+
+    def test_sharded_first_day_records_every_account(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        single = os.path.join(directory, "accounts.txt")
+        with open(single, "w", newline="\n") as f:
+            f.write(MASTER)
+        master = os.path.join(directory, "master")
+        current = os.path.join(directory, "current")
+        split_accounts(single, master)
+        split_accounts(single, current)
+        trans = os.path.join(directory, "day.atf")
+        with open(trans, "w") as f:
+            f.write("DEP 01234 10.00\nEND\n")
+        store = SnapshotStore(os.path.join(directory, "snapshots"))
+
+        backend = BankingBackend(trans, current, master, snapshots=store)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(backend.run())
+        self.assertTrue(backend.partial)
+        rebuilt = os.path.join(directory, "rebuilt.txt")
+        store.rebuild(1, rebuilt)
+        with open(rebuilt) as f:
+            self.assertEqual(sorted(f.read().splitlines()),
+                             sorted(MASTER.replace("01000.00", "01010.00").splitlines()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from backend import BankingBackend
+from bankingapp import BankingApp
+from read import read_bank_accounts
+from sqlite_store import AccountStore
+
+ACCOUNTS = (
+    "01234 John Doe             A 01000.00 4321 NP\n"
+    "02345 Sarah Smith          A 00500.00 5687 SP\n"
+    "03456 John Doe             D 00200.00 1111 NP\n"
+)
+
+
+class TestAccountStore(unittest.TestCase):
+    """
+    Accounts and applied days kept in SQLite, with the text formats at the edges.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.accounts_file = self.path("accounts.txt")
+        with open(self.accounts_file, "w", newline="\n") as f:
+            f.write(ACCOUNTS)
+        self.store = AccountStore(self.path("accounts.db"), create=True)
+        self.addCleanup(self.store.close)
+        self.store.import_accounts(self.accounts_file)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def run_day(self, text, **options):
+        trans_file = self.path("day.atf")
+        with open(trans_file, "w") as f:
+            f.write(text)
+        backend = BankingBackend(trans_file, self.path("unused_current.txt"), self.path("unused_master.txt"),
+                                 fee_table={}, store=self.store, **options)
+        with redirect_stdout(io.StringIO()):
+            return backend.run()
+
+    def test_missing_store(self):
+        with self.assertRaises(FileNotFoundError):
+            AccountStore(self.path("missing.db"))
+
+    def test_wal_mode(self):
+        self.assertEqual(self.store._db.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_round_trip(self):
+        exported = self.path("exported.txt")
+        self.assertEqual(self.store.export_accounts(exported), 3)
+        with open(exported) as f:
+            self.assertEqual(f.read(), ACCOUNTS)
+        self.assertEqual(self.store.read_accounts(), read_bank_accounts(self.accounts_file))
+        self.assertEqual([acc["name"] for acc in self.store.read_accounts(["3456", "9", "1234"])],
+                         ["John Doe", "John Doe"])
+
+    def test_source_queries(self):
+        self.assertEqual(self.store.lookup("02345")["plan"], "SP")
+        self.assertIsNone(self.store.lookup("99999"))
+        self.assertEqual(self.store.find_by_name("JOHN DOE"), "3456")
+        self.assertIsNone(self.store.find_by_name("NOBODY"))
+        self.assertEqual(len(list(self.store.iter_accounts())), 3)
+
+    def test_backend_saves_day_in_one_transaction(self):
+        self.assertTrue(self.run_day("DEP 1234 10.00\nTRN 2345 5.00 1234\nWDR 2345 600.00\nEND\n"))
+        self.assertEqual(self.store.lookup("1234")["balance"], 1015.00)
+        self.assertEqual(self.store.lookup("2345")["balance"], 495.00)     # the WDR was rejected
+        self.assertEqual(self.store.history("1234"), [(1, "DEP", 1234, 10.0, None), (1, "TRN", 2345, 5.0, 1234)])
+
+        self.assertTrue(self.run_day("PAY 1234 15.00\n"))
+        exported = self.path("day2.atf")
+        self.assertEqual(self.store.export_transactions(exported), 2)
+        with open(exported) as f:
+            self.assertEqual(f.read(), "PAY 1234 15.00\nEND\n")
+
+    def test_failed_save_leaves_store_unchanged(self):
+        self.store._db.execute("CREATE TRIGGER fail BEFORE INSERT ON transactions "
+                               "BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+        with self.assertRaises(sqlite3.DatabaseError):
+            self.run_day("DEP 1234 10.00\n")
+        self.assertEqual(self.store.lookup("1234")["balance"], 1000.00)
+
+    def test_import_transactions(self):
+        trans_file = self.path("day.atf")
+        with open(trans_file, "w") as f:
+            f.write("DEP 1234 1.00\nEND\nDEP 1234 2.00\n")
+        self.assertEqual(self.store.import_transactions(trans_file), 1)
+        self.assertEqual(self.store.history("1234"), [(1, "DEP", 1234, 1.0, None)])
+
+    def test_app_reads_through_store(self):
+        app = BankingApp(self.store.path, self.store, self.path("Transactions"))
+        status = []
+        app.replay("2345\n5687\n4\n25\nJohn Doe\n6\n", status)
+        self.assertEqual(status, ["LOGIN OK", "TRN OK", "EXIT OK"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import unittest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+sys.path.insert(0, os.path.join(CURRENT_DIR, "benchmarks"))
+
+from bankingapp import BankingApp
+from startup import time_to_first_prompt, write_accounts
+
+# Seconds a full-size accounts file may add to the time to the first
+# prompt; override on slow hosts. Parsing 99,999 accounts up front adds
+# about 0.3s, deferring it adds next to nothing.
+STARTUP_BUDGET = float(os.environ.get("BANKING_STARTUP_BUDGET", "0.1"))
+
+
+class TestDeferredStartup(unittest.TestCase):
+    """
+    Constructing BankingApp does no work that scales with the data.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.accounts_file = os.path.join(self.directory.name, "currentaccounts.txt")
+        write_accounts(self.accounts_file, 50)
+
+    def test_accounts_load_on_first_lookup(self):
+        app = BankingApp(self.accounts_file, history_dir=self.directory.name)
+        self.assertEqual(app.accounts, {})
+        self.assertIsNotNone(app.find_account("7"))
+        self.assertEqual(len(app.accounts), 50)
+
+    def test_history_file_named_on_first_write(self):
+        app = BankingApp(self.accounts_file, history_dir=self.directory.name)
+        self.assertIsNone(app.history_file)
+        app.log_history("DEP 7 1.00")
+        self.assertEqual(os.path.basename(app.history_file), "session_2.txt")
+
+    def test_missing_accounts_file_fails_fast(self):
+        with self.assertRaises(FileNotFoundError):
+            BankingApp(os.path.join(self.directory.name, "missing.txt"), history_dir=self.directory.name)
+
+
+class TestStartupBudget(unittest.TestCase):
+    """
+    A full-size accounts file adds (next to) nothing to the time from
+    launch to the first prompt.
+    """
+
+    def test_first_prompt_does_not_scale_with_accounts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = ("--history-dir", directory)
+            small = os.path.join(directory, "small.txt")
+            large = os.path.join(directory, "large.txt")
+            write_accounts(small, 1)
+            write_accounts(large, 99999)
+            base = min(time_to_first_prompt(small, history) for _ in range(3))
+            elapsed = min(time_to_first_prompt(large, history) for _ in range(3))
+        self.assertLess(elapsed - base, STARTUP_BUDGET,
+                        f"first prompt after {elapsed:.3f}s with 99,999 accounts, {base:.3f}s with one; "
+                        f"budget {STARTUP_BUDGET:.3f}s")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+import bankingapp
+from bankingapp import _box_bot, _box_div, _box_row, _box_top
+
+
+class TestCachedFrames(unittest.TestCase):
+    """
+    Cached frames render exactly what the line-by-line helpers printed.
+    """
+
+    def setUp(self):
+        # drop output left buffered by earlier tests that called app methods
+        with redirect_stdout(io.StringIO()):
+            bankingapp._screen.flush()
+
+    def render(self, fn, *args):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            fn(*args)
+            bankingapp._screen.flush()
+        return out.getvalue()
+
+    def test_menu_box(self):
+        expected = "\n".join([
+            _box_top(),
+            _box_row("  Account: 83413"),
+            _box_div(),
+            _box_row("  Main Menu:"),
+            _box_row(""),
+            _box_row("    1.  View Balance"),
+            _box_row("    2.  Deposit"),
+            _box_row("    3.  Withdraw"),
+            _box_row("    4.  Transfer"),
+            _box_row("    5.  Logout"),
+            _box_row("    6.  Exit"),
+            _box_bot(),
+        ]) + "\n"
+        self.assertEqual(self.render(bankingapp._menu_box, "83413"), expected)
+        # second render comes from the cache
+        self.assertEqual(self.render(bankingapp._menu_box, "83413"), expected)
+
+    def test_balance_bar(self):
+        self.assertEqual(self.render(bankingapp._bal, 700),
+                         "  Balance  │████░░░░░░░░░░░░░░░░░░░░░░░░░░│  $700\n")
+        self.assertEqual(self.render(bankingapp._bal, 99000),
+                         "  Balance  │" + "█" * 30 + "│  $99,000\n")
+        self.assertEqual(self.render(bankingapp._bal, -5),
+                         "  Balance  │" + "░" * 30 + "│  $-5\n")
+
+    def test_section(self):
+        self.assertEqual(self.render(bankingapp._section, "Login"),
+                         "┌─ Login ──────────────────────────────────────┐\n")
+
+    def test_output_is_flushed_before_each_prompt(self):
+        out = io.StringIO()
+        seen = []
+
+        def fake_input():
+            seen.append(out.getvalue())
+            return "42"
+
+        with redirect_stdout(out), mock.patch("builtins.input", fake_input):
+            bankingapp._section("Deposit")
+            bankingapp._prompt("Amount ($)  ")
+        self.assertTrue(seen[0].endswith("  ▶  Amount ($)  : \n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
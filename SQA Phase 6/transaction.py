@@ -12,18 +12,34 @@ UML Attributes:
 UML Methods:
     + __init__()
     + format()
+
+Transactions are immutable and use __slots__. The code is interned;
+account numbers are taken from the Account objects and so are shared.
 """
 
+import sys
+
 
 class Transaction:
     """One deposit or withdrawal record written to the .atf file."""
 
+    __slots__ = ("trans_code", "account_number", "amount", "account_target")
+
     def __init__(self, trans_code: str, account_number: str, amount: float, account_target = None) -> None:
-        self.trans_code:     str   = trans_code
-        self.account_number: str   = account_number
-        self.amount:         float = float(amount)
+        init = object.__setattr__
+        init(self, "trans_code",     sys.intern(trans_code))
+        init(self, "account_number", account_number)
+        init(self, "amount",         float(amount))
+        init(self, "account_target", account_target)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Transaction is immutable; cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Transaction is immutable; cannot delete '{name}'")
 
-        self.account_target = account_target
+    def __reduce__(self):
+        return Transaction, (self.trans_code, self.account_number, self.amount, self.account_target)
 
     def format(self) -> str:
         """Return the formatted transaction string for the .atf file."""
@@ -1,51 +1,145 @@
-def write_new_accounts(accounts, file_path):
+import os
+import stat
+import tempfile
+
+MAX_BALANCE = 99999.99
+MAX_BALANCE_V2 = 999999999999.99
+MAX_BALANCES = {1: MAX_BALANCE, 2: MAX_BALANCE_V2}
+ACCOUNT_DIGITS = {1: 5, 2: 10}
+
+# os.umask() can only be read by setting it, which is process-wide and
+# races with threads creating files, so it is read once, at import.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def validate_account(acc, version=1):
+    """
+    Checks one account dict against the Current Bank Accounts File rules
+    of record format *version* (see read.py).
+    Raises ValueError describing the first violation.
+    """
+    # Validate account number
+    if not isinstance(acc['account_number'], str) or not acc['account_number'].isdigit():
+        raise ValueError(f"Account number must be numeric string, got {acc['account_number']}")
+    if len(acc['account_number']) > ACCOUNT_DIGITS[version]:
+        raise ValueError(f"Account number exceeds {ACCOUNT_DIGITS[version]} digits: {acc['account_number']}")
+
+    # Validate name
+    if len(acc['name']) > 20:
+        raise ValueError(f"Account name exceeds 20 characters: {acc['name']}")
+
+    # Validate status
+    if acc['status'] not in ('A', 'D'):
+        raise ValueError(f"Invalid status '{acc['status']}'. Must be 'A' or 'D'")
+
+    # Validate balance
+    if not isinstance(acc['balance'], (int, float)):
+        raise ValueError(f"Balance must be numeric, got {type(acc['balance'])}")
+    if acc['balance'] < 0:
+        raise ValueError(f"Negative balance detected: {acc['balance']}")
+    if acc['balance'] > MAX_BALANCES[version]:
+        raise ValueError(f"Balance exceeds maximum ${MAX_BALANCES[version]:.2f}: {acc['balance']}")
+
+    # Validate pin
+    if 'pin' not in acc:
+        acc['pin'] = '0000'
+    if len(acc['pin']) != 4:
+        raise ValueError(f"Invalid PIN length: {acc['pin']}")
+
+    # Validate plan type
+    plan = acc.get('plan', 'NP')
+    if plan not in ('SP', 'NP'):
+        raise ValueError(f"Invalid plan type '{plan}'. Must be SP or NP")
+
+
+def format_account(acc):
+    """Returns the 45 character record (plus newline) for a validated account."""
+    acc_num = acc['account_number'].zfill(5)
+    name = acc['name'].ljust(20)[:20]
+    status = acc['status']
+    balance = f"{acc['balance']:08.2f}"
+    pin = acc['pin']
+    plan_str = acc.get('plan', 'NP')
+
+    return f"{acc_num} {name} {status} {balance} {pin} {plan_str}\n"
+
+
+def format_account_v2(acc):
+    """Returns the 57 character v2 record (plus newline) for a validated account."""
+    acc_num = acc['account_number'].zfill(10)
+    name = acc['name'].ljust(20)[:20]
+    status = acc['status']
+    balance = f"{acc['balance']:015.2f}"
+    pin = acc['pin']
+    plan_str = acc.get('plan', 'NP')
+
+    return f"{acc_num} {name} {status} {balance} {pin} {plan_str}\n"
+
+
+FORMATTERS = {1: format_account, 2: format_account_v2}
+
+
+def write_new_accounts(accounts, file_path, fsync=False, version=None):
     """
     Writes Current Bank Accounts File with strict validation
-    Format: NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP TTTT TT
-    Total length 45 characters.
+    Format v1: NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP TTTT TT               (45 characters)
+    Format v2: NNNNNNNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPPPPPPPPP TTTT TT   (57 characters)
+
+    Every account is validated before anything is written, so a ValueError
+    leaves any existing file untouched instead of truncated. The records
+    are written as one buffer to a temp file in the same directory, which
+    then replaces file_path atomically: a concurrent reader sees either
+    the old or the new file, never a partial one. With fsync=True the data
+    is flushed to disk before the rename and the rename itself afterwards.
+
+    When file_path is a shard directory (see shards.py), only the shards
+    holding the given accounts are rewritten.
+
+    Records are written in record format *version* (see read.py); by
+    default in the format of the file being replaced, or v1 for a new
+    file. Use convert_accounts.py to move a file to v2.
     """
-    with open(file_path, 'w') as file:
-        for acc in accounts:
-            # Validate account number
-            if not isinstance(acc['account_number'], str) or not acc['account_number'].isdigit():
-                raise ValueError(f"Account number must be numeric string, got {acc['account_number']}")
-            if len(acc['account_number']) > 5:
-                raise ValueError(f"Account number exceeds 5 digits: {acc['account_number']}")
-
-            # Validate name
-            if len(acc['name']) > 20:
-                raise ValueError(f"Account name exceeds 20 characters: {acc['name']}")
-
-            # Validate status
-            if acc['status'] not in ('A', 'D'):
-                raise ValueError(f"Invalid status '{acc['status']}'. Must be 'A' or 'D'")
-
-            # Validate balance
-            if not isinstance(acc['balance'], (int, float)):
-                raise ValueError(f"Balance must be numeric, got {type(acc['balance'])}")
-            if acc['balance'] < 0:
-                raise ValueError(f"Negative balance detected: {acc['balance']}")
-            if acc['balance'] > 99999.99:
-                raise ValueError(f"Balance exceeds maximum $99999.99: {acc['balance']}")
-
-            # Validate pin
-            if 'pin' not in acc:
-                acc['pin'] = '0000'
-            if len(acc['pin']) != 4:
-                raise ValueError(f"Invalid PIN length: {acc['pin']}")
-
-            # Validate plan type
-            plan = acc.get('plan', 'NP')
-            if plan not in ('SP', 'NP'):
-                raise ValueError(f"Invalid plan type '{plan}'. Must be SP or NP")
-
-            # Format fields
-            acc_num = acc['account_number'].zfill(5)
-            name = acc['name'].ljust(20)[:20]
-            status = acc['status']
-            balance = f"{acc['balance']:08.2f}"
-            pin = acc['pin']
-            plan_str = plan
-
-            # Write exactly 45 characters
-            file.write(f"{acc_num} {name} {status} {balance} {pin} {plan_str}\n")
+    if os.path.isdir(file_path):
+        from shards import write_shards
+        write_shards(accounts, file_path, fsync)
+        return
+
+    if version is None:
+        from read import record_format
+        version = record_format(file_path)
+    format_record = FORMATTERS[version]
+    lines = []
+    for acc in accounts:
+        validate_account(acc, version)
+        lines.append(format_record(acc))
+    data = "".join(lines).encode()
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".accounts-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.chmod(temp_path, _file_mode(file_path))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _file_mode(file_path):
+    """Permissions for the replacement: the existing file's, or the umask default."""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK